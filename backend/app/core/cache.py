@@ -5,19 +5,22 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import sqlite3
 import time
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Mapping, Sequence, Tuple
 
 from app.core.config import AppSettings
 
 logger = logging.getLogger(__name__)
 
-try:  # pragma: no cover - optional dependency
-    from redis.asyncio import Redis
-except ImportError:  # pragma: no cover - optional dependency
-    Redis = None  # type: ignore[assignment]
+# Backends without native expiry drop expired keys on read and, at most this
+# often, in one pass on write; short-lived keys that are never read again
+# (rate-limit windows, locks, negative-cache entries) would pile up otherwise.
+_SWEEP_INTERVAL_SECONDS = 60.0
 
 
 class CacheBackend(ABC):
@@ -27,89 +30,349 @@ class CacheBackend(ABC):
     async def get(self, key: str) -> str | None:
         """Return the stored value if present."""
 
+    async def mget(self, keys: Sequence[str]) -> List[str | None]:
+        """Return the values of ``keys`` in order; backends override to batch."""
+        return [await self.get(key) for key in keys]
+
     @abstractmethod
-    async def set(self, key: str, value: str) -> None:
-        """Store a value permanently."""
+    def scan(self, prefix: str, count: int = 500) -> AsyncIterator[List[str]]:
+        """Yield batches of plain (non-hash, non-list) keys starting with ``prefix``."""
 
     @abstractmethod
-    async def incr(self, key: str, ttl: int | None = None) -> int:
-        """Atomically increment a counter and return the new value."""
+    async def mget_with_expiry(
+        self, keys: Sequence[str]
+    ) -> List[Tuple[str, float | None] | None]:
+        """Return ``(value, expires_at)`` per key; ``expires_at`` is a Unix time or None."""
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: int | None = None) -> None:
+        """Store a value, permanently unless ``ttl`` seconds are given."""
+
+    async def mset(self, entries: Sequence[Tuple[str, str, int | None]]) -> None:
+        """Store ``(key, value, ttl)`` entries; backends override to batch."""
+        for key, value, ttl in entries:
+            await self.set(key, value, ttl)
+
+    @abstractmethod
+    async def set_if_absent(self, key: str, value: str, ttl: int) -> bool:
+        """Store ``value`` with ``ttl`` unless the key exists; return whether it was stored.
+
+        An existing key keeps its expiry, so this is safe for short locks that
+        losers retry (unlike :meth:`incr` with a ``ttl``).
+        """
+
+    @abstractmethod
+    async def incr(self, key: str, ttl: int | None = None, amount: int = 1) -> int:
+        """Atomically add ``amount`` to a counter and return the new value.
+
+        ``ttl`` (re)sets the expiry; without it an existing expiry is kept.
+        """
 
     @abstractmethod
     async def delete(self, key: str) -> None:
         """Remove a key from cache."""
 
+    @abstractmethod
+    async def expire(self, key: str, ttl: int) -> None:
+        """(Re)set the expiry of an existing hash or list key.
+
+        The memory and shared backends drop expired hashes and lists in their
+        periodic sweep, so they may stay readable for up to a minute longer.
+        """
+
+    @abstractmethod
+    async def hset(self, key: str, field: str, value: str) -> None:
+        """Store a field inside a hash."""
+
+    async def hset_many(self, key: str, fields: Mapping[str, str]) -> None:
+        """Store several hash fields; backends override to batch."""
+        for field, value in fields.items():
+            await self.hset(key, field, value)
+
+    @abstractmethod
+    async def hget(self, key: str, field: str) -> str | None:
+        """Return a single hash field if present."""
+
+    @abstractmethod
+    async def hgetall(self, key: str) -> Dict[str, str]:
+        """Return every field of a hash (empty when missing)."""
+
+    @abstractmethod
+    def hscan(self, key: str, count: int = 500) -> AsyncIterator[List[Tuple[str, str]]]:
+        """Yield batches of ``(field, value)`` pairs of a hash without loading it whole."""
+
+    @abstractmethod
+    async def hdel(self, key: str, field: str) -> bool:
+        """Remove a field from a hash; True only for the caller that removed it."""
+
+    @abstractmethod
+    async def hincrby(self, key: str, increments: Mapping[str, int]) -> None:
+        """Atomically add each amount to its integer hash field (missing = 0)."""
+
+    @abstractmethod
+    async def lpush(self, key: str, value: str) -> None:
+        """Push a value onto the head of a list."""
+
+    @abstractmethod
+    async def rpop(self, key: str) -> str | None:
+        """Pop the value at the tail of a list (FIFO with :meth:`lpush`)."""
+
+    @abstractmethod
+    async def rpoplpush(self, source: str, destination: str) -> str | None:
+        """Atomically move the tail of ``source`` onto the head of ``destination``."""
+
+    @abstractmethod
+    async def lrem(self, key: str, value: str) -> bool:
+        """Remove one occurrence of ``value`` from a list; True if one was removed."""
+
+    @abstractmethod
+    async def lrange(self, key: str) -> List[str]:
+        """Return a whole list, head first; meant for short lists only."""
+
+    @abstractmethod
+    async def llen(self, key: str) -> int:
+        """Return the length of a list (0 when missing)."""
+
     async def close(self) -> None:
         """Allow graceful shutdown for subclasses."""
 
 
 class InMemoryCacheBackend(CacheBackend):
-    """Simple asyncio-friendly in-memory cache."""
+    """Simple asyncio-friendly in-memory cache.
+
+    Every operation runs to completion without awaiting, so on a single event
+    loop each one is already atomic: reads never wait behind writers and no
+    lock is needed. Keep it that way - any future compound operation that
+    awaits between its read and write must bring its own per-key locking.
+    """
 
     def __init__(self) -> None:
         self._store: Dict[str, Tuple[str, float | None]] = {}
-        self._lock = asyncio.Lock()
+        self._hashes: Dict[str, Dict[str, str]] = {}
+        self._lists: Dict[str, Deque[str]] = {}
+        # Expiry of hash and list keys, enforced by the sweep only.
+        self._container_expiry: Dict[str, float] = {}
+        self._next_sweep = time.monotonic() + _SWEEP_INTERVAL_SECONDS
+
+    def _sweep(self, now: float) -> None:
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + _SWEEP_INTERVAL_SECONDS
+        expired = [
+            key
+            for key, (_, expires_at) in self._store.items()
+            if expires_at is not None and expires_at <= now
+        ]
+        for key in expired:
+            del self._store[key]
+        expired = [key for key, expires_at in self._container_expiry.items() if expires_at <= now]
+        for key in expired:
+            del self._container_expiry[key]
+            self._hashes.pop(key, None)
+            self._lists.pop(key, None)
 
     async def get(self, key: str) -> str | None:
-        async with self._lock:
+        item = self._store.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._store.pop(key, None)
+            return None
+        return value
+
+    async def scan(self, prefix: str, count: int = 500) -> AsyncIterator[List[str]]:
+        keys = [key for key in self._store if key.startswith(prefix)]
+        for start in range(0, len(keys), count):
+            yield keys[start : start + count]
+
+    async def mget_with_expiry(
+        self, keys: Sequence[str]
+    ) -> List[Tuple[str, float | None] | None]:
+        now, wall = time.monotonic(), time.time()
+        result: List[Tuple[str, float | None] | None] = []
+        for key in keys:
             item = self._store.get(key)
-            if item is None:
-                return None
-            value, expires_at = item
-            if expires_at is not None and expires_at <= time.monotonic():
-                del self._store[key]
-                return None
-            return value
-
-    async def set(self, key: str, value: str) -> None:
-        async with self._lock:
-            self._store[key] = (value, None)
+            if item is None or (item[1] is not None and item[1] <= now):
+                result.append(None)
+            else:
+                value, expires_at = item
+                result.append((value, None if expires_at is None else wall + expires_at - now))
+        return result
+
+    async def set(self, key: str, value: str, ttl: int | None = None) -> None:
+        now = time.monotonic()
+        self._sweep(now)
+        expires_at = now + ttl if ttl is not None and ttl > 0 else None
+        self._store[key] = (value, expires_at)
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(
                 "内存缓存写入 - 键: %s, 数据大小: %d 字节",
                 key,
                 len(value)
             )
 
-    async def incr(self, key: str, ttl: int | None = None) -> int:
-        async with self._lock:
-            value, expires_at = self._store.get(key, ("0", None))
-            try:
-                counter = int(value)
-            except ValueError:
-                counter = 0
-            counter += 1
-            expires_at = (
-                time.monotonic() + ttl if ttl is not None and ttl > 0 else expires_at
-            )
-            self._store[key] = (str(counter), expires_at)
-            return counter
+    async def set_if_absent(self, key: str, value: str, ttl: int) -> bool:
+        now = time.monotonic()
+        self._sweep(now)
+        item = self._store.get(key)
+        if item is not None and (item[1] is None or item[1] > now):
+            return False
+        self._store[key] = (value, now + ttl)
+        return True
+
+    async def incr(self, key: str, ttl: int | None = None, amount: int = 1) -> int:
+        now = time.monotonic()
+        self._sweep(now)
+        value, expires_at = self._store.get(key, ("0", None))
+        if expires_at is not None and expires_at <= now:
+            value, expires_at = "0", None
+        try:
+            counter = int(value)
+        except ValueError:
+            counter = 0
+        counter += amount
+        expires_at = now + ttl if ttl is not None and ttl > 0 else expires_at
+        self._store[key] = (str(counter), expires_at)
+        return counter
 
     async def delete(self, key: str) -> None:
-        async with self._lock:
-            self._store.pop(key, None)
+        self._store.pop(key, None)
+        self._hashes.pop(key, None)
+        self._lists.pop(key, None)
+        self._container_expiry.pop(key, None)
+
+    async def expire(self, key: str, ttl: int) -> None:
+        now = time.monotonic()
+        self._sweep(now)
+        if key in self._hashes or key in self._lists:
+            self._container_expiry[key] = now + ttl
+
+    async def hset(self, key: str, field: str, value: str) -> None:
+        self._hashes.setdefault(key, {})[field] = value
+
+    async def hset_many(self, key: str, fields: Mapping[str, str]) -> None:
+        self._hashes.setdefault(key, {}).update(fields)
+
+    async def hget(self, key: str, field: str) -> str | None:
+        fields = self._hashes.get(key)
+        return fields.get(field) if fields is not None else None
+
+    async def hgetall(self, key: str) -> Dict[str, str]:
+        return dict(self._hashes.get(key, {}))
+
+    async def hscan(self, key: str, count: int = 500) -> AsyncIterator[List[Tuple[str, str]]]:
+        fields = list(self._hashes.get(key, {}).items())
+        for start in range(0, len(fields), count):
+            yield fields[start : start + count]
+
+    async def hdel(self, key: str, field: str) -> bool:
+        fields = self._hashes.get(key)
+        return fields is not None and fields.pop(field, None) is not None
+
+    async def hincrby(self, key: str, increments: Mapping[str, int]) -> None:
+        fields = self._hashes.setdefault(key, {})
+        for field, amount in increments.items():
+            fields[field] = str(int(fields.get(field, "0")) + amount)
+
+    async def lpush(self, key: str, value: str) -> None:
+        self._lists.setdefault(key, deque()).appendleft(value)
+
+    async def rpop(self, key: str) -> str | None:
+        items = self._lists.get(key)
+        return items.pop() if items else None
+
+    async def rpoplpush(self, source: str, destination: str) -> str | None:
+        items = self._lists.get(source)
+        if not items:
+            return None
+        value = items.pop()
+        self._lists.setdefault(destination, deque()).appendleft(value)
+        return value
+
+    async def lrem(self, key: str, value: str) -> bool:
+        items = self._lists.get(key)
+        if items is None or value not in items:
+            return False
+        items.remove(value)
+        return True
+
+    async def lrange(self, key: str) -> List[str]:
+        return list(self._lists.get(key, ()))
+
+    async def llen(self, key: str) -> int:
+        return len(self._lists.get(key, ()))
 
 
 class RedisCacheBackend(CacheBackend):
     """Redis-backed cache implementation."""
 
     def __init__(self, url: str) -> None:
-        if Redis is None:
-            raise RuntimeError("redis package not installed")
+        try:  # pragma: no cover - optional dependency, imported only when selected
+            from redis.asyncio import Redis
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("redis package not installed") from exc
         self._client = Redis.from_url(url, decode_responses=True)
 
     async def get(self, key: str) -> str | None:
         return await self._client.get(key)
 
-    async def set(self, key: str, value: str) -> None:
-        await self._client.set(key, value)
+    async def mget(self, keys: Sequence[str]) -> List[str | None]:
+        if not keys:
+            return []
+        return list(await self._client.mget(keys))
+
+    async def scan(self, prefix: str, count: int = 500) -> AsyncIterator[List[str]]:
+        batch: List[str] = []
+        async for key in self._client.scan_iter(match=f"{prefix}*", count=count, _type="string"):
+            batch.append(key)
+            if len(batch) >= count:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def mget_with_expiry(
+        self, keys: Sequence[str]
+    ) -> List[Tuple[str, float | None] | None]:
+        if not keys:
+            return []
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.get(key)
+                pipe.pttl(key)
+            replies = await pipe.execute()
+        now = time.time()
+        result: List[Tuple[str, float | None] | None] = []
+        for value, pttl in zip(replies[::2], replies[1::2]):
+            if value is None:
+                result.append(None)
+            else:
+                # PTTL is -1 for keys without an expiry.
+                result.append((value, now + pttl / 1000 if pttl is not None and pttl >= 0 else None))
+        return result
+
+    async def set(self, key: str, value: str, ttl: int | None = None) -> None:
+        await self._client.set(key, value, ex=ttl if ttl is not None and ttl > 0 else None)
         logger.debug(
             "Redis 缓存写入 - 键: %s, 数据大小: %d 字节",
             key,
             len(value)
         )
 
-    async def incr(self, key: str, ttl: int | None = None) -> int:
-        value = await self._client.incr(key)
+    async def mset(self, entries: Sequence[Tuple[str, str, int | None]]) -> None:
+        if not entries:
+            return
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key, value, ttl in entries:
+                pipe.set(key, value, ex=ttl if ttl is not None and ttl > 0 else None)
+            await pipe.execute()
+
+    async def set_if_absent(self, key: str, value: str, ttl: int) -> bool:
+        return bool(await self._client.set(key, value, ex=ttl, nx=True))
+
+    async def incr(self, key: str, ttl: int | None = None, amount: int = 1) -> int:
+        value = await self._client.incrby(key, amount)
         if ttl is not None and ttl > 0:
             await self._client.expire(key, ttl)
         return int(value)
@@ -117,11 +380,499 @@ class RedisCacheBackend(CacheBackend):
     async def delete(self, key: str) -> None:
         await self._client.delete(key)
 
+    async def expire(self, key: str, ttl: int) -> None:
+        await self._client.expire(key, ttl)
+
+    async def hset(self, key: str, field: str, value: str) -> None:
+        await self._client.hset(key, field, value)
+
+    async def hset_many(self, key: str, fields: Mapping[str, str]) -> None:
+        if fields:
+            await self._client.hset(key, mapping=dict(fields))
+
+    async def hget(self, key: str, field: str) -> str | None:
+        return await self._client.hget(key, field)
+
+    async def hgetall(self, key: str) -> Dict[str, str]:
+        return dict(await self._client.hgetall(key))
+
+    async def hscan(self, key: str, count: int = 500) -> AsyncIterator[List[Tuple[str, str]]]:
+        batch: List[Tuple[str, str]] = []
+        async for field, value in self._client.hscan_iter(key, count=count):
+            batch.append((field, value))
+            if len(batch) >= count:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def hdel(self, key: str, field: str) -> bool:
+        return bool(await self._client.hdel(key, field))
+
+    async def hincrby(self, key: str, increments: Mapping[str, int]) -> None:
+        if not increments:
+            return
+        async with self._client.pipeline(transaction=False) as pipe:
+            for field, amount in increments.items():
+                pipe.hincrby(key, field, amount)
+            await pipe.execute()
+
+    async def lpush(self, key: str, value: str) -> None:
+        await self._client.lpush(key, value)
+
+    async def rpop(self, key: str) -> str | None:
+        return await self._client.rpop(key)
+
+    async def rpoplpush(self, source: str, destination: str) -> str | None:
+        return await self._client.rpoplpush(source, destination)
+
+    async def lrem(self, key: str, value: str) -> bool:
+        return bool(await self._client.lrem(key, 1, value))
+
+    async def lrange(self, key: str) -> List[str]:
+        return list(await self._client.lrange(key, 0, -1))
+
+    async def llen(self, key: str) -> int:
+        return int(await self._client.llen(key))
+
     async def close(self) -> None:
         await self._client.close()
 
 
 
+class SharedCacheBackend(CacheBackend):
+    """SQLite-backed cache shared by every worker process on one host.
+
+    The database lives on tmpfs (``/dev/shm``) by default, so multi-worker
+    deployments share cache hits without running Redis. WAL mode lets one
+    worker read while another writes; calls run on a dedicated thread so a
+    busy lock never stalls the event loop. Expiry uses wall-clock time because
+    it has to agree across processes.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS kv (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            expires_at REAL
+        );
+        CREATE TABLE IF NOT EXISTS hashes (
+            key TEXT NOT NULL,
+            field TEXT NOT NULL,
+            value TEXT NOT NULL,
+            PRIMARY KEY (key, field)
+        );
+        CREATE TABLE IF NOT EXISTS lists (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            key TEXT NOT NULL,
+            value TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS lists_key ON lists (key, id);
+        CREATE INDEX IF NOT EXISTS kv_expires ON kv (expires_at)
+            WHERE expires_at IS NOT NULL;
+        CREATE TABLE IF NOT EXISTS container_expiry (
+            key TEXT PRIMARY KEY,
+            expires_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._conn: sqlite3.Connection | None = None
+        self._next_sweep = time.time() + _SWEEP_INTERVAL_SECONDS
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="shared-cache"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self._path),
+                timeout=5.0,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.executescript(self._SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _sweep_sync(self) -> None:
+        # Every worker sweeps on its own schedule; DELETE is idempotent.
+        now = time.time()
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + _SWEEP_INTERVAL_SECONDS
+        conn = self._connection()
+        conn.execute("DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        expired = conn.execute(
+            "SELECT key FROM container_expiry WHERE expires_at <= ?", (now,)
+        ).fetchall()
+        for (key,) in expired:
+            self._delete_sync(key)
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _get_sync(self, key: str) -> str | None:
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value, expires_at FROM kv WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            conn.execute(
+                "DELETE FROM kv WHERE key = ? AND expires_at <= ?", (key, time.time())
+            )
+            return None
+        return value
+
+    def _mget_sync(self, keys: Sequence[str]) -> List[str | None]:
+        if not keys:
+            return []
+        placeholders = ",".join("?" * len(keys))
+        rows = self._connection().execute(
+            f"SELECT key, value, expires_at FROM kv WHERE key IN ({placeholders})",
+            tuple(keys),
+        ).fetchall()
+        now = time.time()
+        found = {
+            key: value
+            for key, value, expires_at in rows
+            if expires_at is None or expires_at > now
+        }
+        return [found.get(key) for key in keys]
+
+    def _scan_sync(self, prefix: str, after: str, count: int) -> List[str]:
+        # Keyset pagination over the primary key: constant memory and no
+        # full-table scan however large the cache grows.
+        rows = self._connection().execute(
+            "SELECT key FROM kv WHERE key > ? AND key >= ? AND key < ? "
+            "ORDER BY key LIMIT ?",
+            (after, prefix, prefix + "\U0010ffff", count),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def _mget_with_expiry_sync(
+        self, keys: Sequence[str]
+    ) -> List[Tuple[str, float | None] | None]:
+        if not keys:
+            return []
+        placeholders = ",".join("?" * len(keys))
+        rows = self._connection().execute(
+            f"SELECT key, value, expires_at FROM kv WHERE key IN ({placeholders})",
+            tuple(keys),
+        ).fetchall()
+        now = time.time()
+        found = {
+            key: (value, expires_at)
+            for key, value, expires_at in rows
+            if expires_at is None or expires_at > now
+        }
+        return [found.get(key) for key in keys]
+
+    def _mset_sync(self, entries: Sequence[Tuple[str, str, int | None]]) -> None:
+        self._sweep_sync()
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                [
+                    (key, value, now + ttl if ttl is not None and ttl > 0 else None)
+                    for key, value, ttl in entries
+                ],
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _set_sync(self, key: str, value: str, ttl: int | None) -> None:
+        self._sweep_sync()
+        expires_at = time.time() + ttl if ttl is not None and ttl > 0 else None
+        self._connection().execute(
+            "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, expires_at),
+        )
+
+    def _set_if_absent_sync(self, key: str, value: str, ttl: int) -> bool:
+        self._sweep_sync()
+        now = time.time()
+        cursor = self._connection().execute(
+            "INSERT INTO kv (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value, "
+            "expires_at = excluded.expires_at "
+            "WHERE kv.expires_at IS NOT NULL AND kv.expires_at <= ?",
+            (key, value, now + ttl, now),
+        )
+        return cursor.rowcount == 1
+
+    def _incr_sync(self, key: str, ttl: int | None, amount: int) -> int:
+        self._sweep_sync()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = conn.execute(
+                "SELECT value, expires_at FROM kv WHERE key = ?", (key,)
+            ).fetchone()
+            value, expires_at = row if row is not None else ("0", None)
+            if expires_at is not None and expires_at <= now:
+                value, expires_at = "0", None
+            try:
+                counter = int(value)
+            except ValueError:
+                counter = 0
+            counter += amount
+            if ttl is not None and ttl > 0:
+                expires_at = now + ttl
+            conn.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, str(counter), expires_at),
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return counter
+
+    def _delete_sync(self, key: str) -> None:
+        conn = self._connection()
+        conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+        conn.execute("DELETE FROM hashes WHERE key = ?", (key,))
+        conn.execute("DELETE FROM lists WHERE key = ?", (key,))
+        conn.execute("DELETE FROM container_expiry WHERE key = ?", (key,))
+
+    def _expire_sync(self, key: str, ttl: int) -> None:
+        self._sweep_sync()
+        self._connection().execute(
+            "INSERT OR REPLACE INTO container_expiry (key, expires_at) VALUES (?, ?)",
+            (key, time.time() + ttl),
+        )
+
+    def _hset_sync(self, key: str, field: str, value: str) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO hashes (key, field, value) VALUES (?, ?, ?)",
+            (key, field, value),
+        )
+
+    def _hset_many_sync(self, key: str, fields: Mapping[str, str]) -> None:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO hashes (key, field, value) VALUES (?, ?, ?)",
+                [(key, field, value) for field, value in fields.items()],
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _hget_sync(self, key: str, field: str) -> str | None:
+        row = self._connection().execute(
+            "SELECT value FROM hashes WHERE key = ? AND field = ?", (key, field)
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def _hgetall_sync(self, key: str) -> Dict[str, str]:
+        rows = self._connection().execute(
+            "SELECT field, value FROM hashes WHERE key = ?", (key,)
+        ).fetchall()
+        return dict(rows)
+
+    def _hscan_sync(self, key: str, after: str, count: int) -> List[Tuple[str, str]]:
+        # Keyset pagination like _scan_sync, over the (key, field) primary key.
+        rows = self._connection().execute(
+            "SELECT field, value FROM hashes WHERE key = ? AND field > ? "
+            "ORDER BY field LIMIT ?",
+            (key, after, count),
+        ).fetchall()
+        return [(row[0], row[1]) for row in rows]
+
+    def _hdel_sync(self, key: str, field: str) -> bool:
+        cursor = self._connection().execute(
+            "DELETE FROM hashes WHERE key = ? AND field = ?", (key, field)
+        )
+        return cursor.rowcount > 0
+
+    def _hincrby_sync(self, key: str, increments: Mapping[str, int]) -> None:
+        if not increments:
+            return
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO hashes (key, field, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (key, field) DO UPDATE SET "
+                "value = CAST(CAST(value AS INTEGER) + excluded.value AS TEXT)",
+                [(key, field, amount) for field, amount in increments.items()],
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _lpush_sync(self, key: str, value: str) -> None:
+        self._connection().execute(
+            "INSERT INTO lists (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    def _rpop_sync(self, key: str) -> str | None:
+        # The oldest row is the tail; DELETE ... RETURNING claims it atomically
+        # even when several workers pop the same list.
+        row = self._connection().execute(
+            "DELETE FROM lists WHERE id = "
+            "(SELECT id FROM lists WHERE key = ? ORDER BY id LIMIT 1) RETURNING value",
+            (key,),
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def _rpoplpush_sync(self, source: str, destination: str) -> str | None:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "DELETE FROM lists WHERE id = "
+                "(SELECT id FROM lists WHERE key = ? ORDER BY id LIMIT 1) RETURNING value",
+                (source,),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "INSERT INTO lists (key, value) VALUES (?, ?)", (destination, row[0])
+                )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return row[0] if row is not None else None
+
+    def _lrem_sync(self, key: str, value: str) -> bool:
+        cursor = self._connection().execute(
+            "DELETE FROM lists WHERE id = "
+            "(SELECT id FROM lists WHERE key = ? AND value = ? ORDER BY id LIMIT 1)",
+            (key, value),
+        )
+        return cursor.rowcount > 0
+
+    def _lrange_sync(self, key: str) -> List[str]:
+        rows = self._connection().execute(
+            "SELECT value FROM lists WHERE key = ? ORDER BY id DESC", (key,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def _llen_sync(self, key: str) -> int:
+        row = self._connection().execute(
+            "SELECT COUNT(*) FROM lists WHERE key = ?", (key,)
+        ).fetchone()
+        return int(row[0])
+
+    def _close_sync(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def get(self, key: str) -> str | None:
+        return await self._run(self._get_sync, key)
+
+    async def mget(self, keys: Sequence[str]) -> List[str | None]:
+        return await self._run(self._mget_sync, keys)
+
+    async def scan(self, prefix: str, count: int = 500) -> AsyncIterator[List[str]]:
+        after = ""
+        while True:
+            keys = await self._run(self._scan_sync, prefix, after, count)
+            if not keys:
+                return
+            yield keys
+            after = keys[-1]
+
+    async def mget_with_expiry(
+        self, keys: Sequence[str]
+    ) -> List[Tuple[str, float | None] | None]:
+        return await self._run(self._mget_with_expiry_sync, keys)
+
+    async def mset(self, entries: Sequence[Tuple[str, str, int | None]]) -> None:
+        if entries:
+            await self._run(self._mset_sync, list(entries))
+
+    async def set(self, key: str, value: str, ttl: int | None = None) -> None:
+        await self._run(self._set_sync, key, value, ttl)
+        logger.debug(
+            "共享缓存写入 - 键: %s, 数据大小: %d 字节",
+            key,
+            len(value)
+        )
+
+    async def set_if_absent(self, key: str, value: str, ttl: int) -> bool:
+        return await self._run(self._set_if_absent_sync, key, value, ttl)
+
+    async def incr(self, key: str, ttl: int | None = None, amount: int = 1) -> int:
+        return await self._run(self._incr_sync, key, ttl, amount)
+
+    async def delete(self, key: str) -> None:
+        await self._run(self._delete_sync, key)
+
+    async def expire(self, key: str, ttl: int) -> None:
+        await self._run(self._expire_sync, key, ttl)
+
+    async def hset(self, key: str, field: str, value: str) -> None:
+        await self._run(self._hset_sync, key, field, value)
+
+    async def hset_many(self, key: str, fields: Mapping[str, str]) -> None:
+        if fields:
+            await self._run(self._hset_many_sync, key, dict(fields))
+
+    async def hget(self, key: str, field: str) -> str | None:
+        return await self._run(self._hget_sync, key, field)
+
+    async def hgetall(self, key: str) -> Dict[str, str]:
+        return await self._run(self._hgetall_sync, key)
+
+    async def hscan(self, key: str, count: int = 500) -> AsyncIterator[List[Tuple[str, str]]]:
+        after = ""
+        while True:
+            fields = await self._run(self._hscan_sync, key, after, count)
+            if not fields:
+                return
+            yield fields
+            after = fields[-1][0]
+
+    async def hdel(self, key: str, field: str) -> bool:
+        return await self._run(self._hdel_sync, key, field)
+
+    async def hincrby(self, key: str, increments: Mapping[str, int]) -> None:
+        await self._run(self._hincrby_sync, key, dict(increments))
+
+    async def lpush(self, key: str, value: str) -> None:
+        await self._run(self._lpush_sync, key, value)
+
+    async def rpop(self, key: str) -> str | None:
+        return await self._run(self._rpop_sync, key)
+
+    async def rpoplpush(self, source: str, destination: str) -> str | None:
+        return await self._run(self._rpoplpush_sync, source, destination)
+
+    async def lrem(self, key: str, value: str) -> bool:
+        return await self._run(self._lrem_sync, key, value)
+
+    async def lrange(self, key: str) -> List[str]:
+        return await self._run(self._lrange_sync, key)
+
+    async def llen(self, key: str) -> int:
+        return await self._run(self._llen_sync, key)
+
+    async def close(self) -> None:
+        await self._run(self._close_sync)
+        self._executor.shutdown(wait=True)
+
 
 _CACHE_BACKEND: CacheBackend | None = None
 
@@ -129,9 +880,13 @@ _CACHE_BACKEND: CacheBackend | None = None
 async def init_cache_backend(settings: AppSettings) -> CacheBackend:
     """Initialise the cache backend based on settings."""
     global _CACHE_BACKEND
+    backend: CacheBackend
     if settings.cache_backend == "redis" and settings.redis_url:
         backend = RedisCacheBackend(settings.redis_url)
         logger.info("Initialised Redis cache at %s", settings.redis_url)
+    elif settings.cache_backend == "shared":
+        backend = SharedCacheBackend(settings.shared_cache_path)
+        logger.info("Using shared cache at %s", settings.shared_cache_path)
     else:
         backend = InMemoryCacheBackend()
         logger.info("Using in-memory cache backend")
@@ -5,13 +5,12 @@ from __future__ import annotations
 import json
 import logging
 import os
+import tempfile
 from dataclasses import dataclass, field
 from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict
 
-import yaml
-
 logger = logging.getLogger(__name__)
 
 
@@ -37,7 +36,7 @@ class ProviderConfig:
 class RoutingConfig:
     """Routing strategy configuration."""
 
-    strategy: str = "default"  # default | weighted
+    strategy: str = "default"  # default | weighted | consistent_hash
 
 
 @dataclass(frozen=True)
@@ -75,6 +74,17 @@ def _int_env(variable: str, default: int) -> int:
         return default
 
 
+def _float_env(variable: str, default: float) -> float:
+    value = os.getenv(variable)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning("Invalid float for %s: %s - falling back to %s", variable, value, default)
+        return default
+
+
 def _tuple_env(variable: str, default: tuple[str, ...]) -> tuple[str, ...]:
     raw = os.getenv(variable)
     if raw is None:
@@ -90,10 +100,19 @@ def _bool_env(variable: str, default: bool) -> bool:
     return raw.strip().lower() in {"1", "true", "yes", "on"}
 
 
+def _default_shared_cache_path() -> Path:
+    # tmpfs keeps the shared cache in memory on Linux; elsewhere fall back to a temp dir.
+    shm = Path("/dev/shm")
+    base = shm if shm.is_dir() else Path(tempfile.gettempdir())
+    return base / "airecipe-cache.sqlite3"
+
+
 def _load_config_data(path: Path) -> Dict[str, Any]:
     """Load provider configuration data from JSON or YAML files."""
     raw = path.read_text(encoding="utf-8")
     if path.suffix.lower() in {".yaml", ".yml"}:
+        import yaml
+
         data = yaml.safe_load(raw)
     else:
         data = json.loads(raw)
@@ -106,6 +125,12 @@ class AppSettings:
 
     app_env: str = field(default_factory=lambda: os.getenv("APP_ENV", "development"))
     log_level: str = field(default_factory=lambda: os.getenv("LOG_LEVEL", "INFO"))
+    log_format: str = field(
+        default_factory=lambda: os.getenv("LOG_FORMAT", "text").strip().lower()
+    )
+    log_hot_path_sample_rate: float = field(
+        default_factory=lambda: _float_env("LOG_HOT_PATH_SAMPLE_RATE", 0.05)
+    )
     require_api_key: bool = field(
         default_factory=lambda: _bool_env("REQUIRE_API_KEY", True)
     )
@@ -116,11 +141,40 @@ class AppSettings:
             if key.strip()
         )
     )
+    admin_api_keys: frozenset[str] = field(
+        default_factory=lambda: frozenset(
+            key.strip()
+            for key in os.getenv("ADMIN_API_KEYS", "").split(",")
+            if key.strip()
+        )
+    )
+    rate_limit_hits_per_minute: int = field(
+        default_factory=lambda: _int_env("RATE_LIMIT_HITS_PER_MINUTE", 0)
+    )
+    rate_limit_misses_per_minute: int = field(
+        default_factory=lambda: _int_env("RATE_LIMIT_MISSES_PER_MINUTE", 0)
+    )
+    quota_hits_per_day: int = field(
+        default_factory=lambda: _int_env("QUOTA_HITS_PER_DAY", 0)
+    )
+    quota_misses_per_day: int = field(
+        default_factory=lambda: _int_env("QUOTA_MISSES_PER_DAY", 0)
+    )
+    # Reverse proxies whose X-Forwarded-For is trusted to identify callers.
+    trusted_proxies: tuple[str, ...] = field(
+        default_factory=lambda: _tuple_env("TRUSTED_PROXIES", ())
+    )
     llm_config_path: Path = field(
         default_factory=lambda: Path(
             os.getenv("LLM_CONFIG_PATH", "config/llm_providers.yaml")
         )
     )
+    llm_config_watch_seconds: float = field(
+        default_factory=lambda: _float_env("LLM_CONFIG_WATCH_SECONDS", 5.0)
+    )
+    provider_drain_seconds: float = field(
+        default_factory=lambda: _float_env("PROVIDER_DRAIN_SECONDS", 120.0)
+    )
     system_prompt_path: Path = field(
         default_factory=lambda: Path(
             os.getenv("SYSTEM_PROMPT_PATH", "prompt/system_recipe.txt")
@@ -135,6 +189,83 @@ class AppSettings:
         default_factory=lambda: os.getenv("CACHE_BACKEND", "redis")
     )
     redis_url: str | None = field(default_factory=lambda: os.getenv("REDIS_URL"))
+    cache_provider_fallback: bool = field(
+        default_factory=lambda: _bool_env("CACHE_PROVIDER_FALLBACK", False)
+    )
+    shared_cache_path: Path = field(
+        default_factory=lambda: Path(
+            os.getenv("SHARED_CACHE_PATH") or _default_shared_cache_path()
+        )
+    )
+    cache_snapshot_path: Path | None = field(
+        default_factory=lambda: Path(os.environ["CACHE_SNAPSHOT_PATH"])
+        if os.getenv("CACHE_SNAPSHOT_PATH")
+        else None
+    )
+    tracing_enabled: bool = field(
+        default_factory=lambda: _bool_env("TRACING_ENABLED", False)
+    )
+    tracing_service_name: str = field(
+        default_factory=lambda: os.getenv("OTEL_SERVICE_NAME", "airecipe-backend")
+    )
+    otel_exporter_otlp_endpoint: str | None = field(
+        default_factory=lambda: os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT") or None
+    )
+    tracing_file_path: Path = field(
+        default_factory=lambda: Path(os.getenv("OTEL_TRACES_FILE", "logs/traces.jsonl"))
+    )
+    stream_drain_seconds: float = field(
+        default_factory=lambda: _float_env("STREAM_DRAIN_SECONDS", 60.0)
+    )
+    batch_generation_size: int = field(
+        default_factory=lambda: _int_env("BATCH_GENERATION_SIZE", 5)
+    )
+    # Output cap sent as max_tokens (opt-in): 0 sends none, a negative value
+    # derives it from the recipe schema.
+    max_output_tokens: int = field(
+        default_factory=lambda: _int_env("MAX_OUTPUT_TOKENS", 0)
+    )
+    stream_resume_window_seconds: float = field(
+        default_factory=lambda: _float_env("STREAM_RESUME_WINDOW_SECONDS", 120.0)
+    )
+    partial_stream_ttl_seconds: int = field(
+        default_factory=lambda: _int_env("PARTIAL_STREAM_TTL_SECONDS", 86400)
+    )
+    job_worker_concurrency: int = field(
+        default_factory=lambda: _int_env("JOB_WORKER_CONCURRENCY", 2)
+    )
+    job_timeout_seconds: float = field(
+        default_factory=lambda: _float_env("JOB_TIMEOUT_SECONDS", 300.0)
+    )
+    job_max_attempts: int = field(
+        default_factory=lambda: _int_env("JOB_MAX_ATTEMPTS", 3)
+    )
+    job_ttl_seconds: int = field(
+        default_factory=lambda: _int_env("JOB_TTL_SECONDS", 86400)
+    )
+    job_webhook_allowed_hosts: tuple[str, ...] = field(
+        default_factory=lambda: _tuple_env(
+            "JOB_WEBHOOK_ALLOWED_HOSTS", ("localhost", "127.0.0.1", "::1")
+        )
+    )
+    negative_cache_ttl_seconds: int = field(
+        default_factory=lambda: _int_env("NEGATIVE_CACHE_TTL_SECONDS", 30)
+    )
+    negative_cache_max_ttl_seconds: int = field(
+        default_factory=lambda: _int_env("NEGATIVE_CACHE_MAX_TTL_SECONDS", 3600)
+    )
+    popularity_flush_seconds: float = field(
+        default_factory=lambda: _float_env("POPULARITY_FLUSH_SECONDS", 10.0)
+    )
+    popularity_window_days: int = field(
+        default_factory=lambda: _int_env("POPULARITY_WINDOW_DAYS", 2)
+    )
+    revalidate_per_minute: float = field(
+        default_factory=lambda: _float_env("REVALIDATE_PER_MINUTE", 30.0)
+    )
+    recipe_index_refresh_seconds: int = field(
+        default_factory=lambda: _int_env("RECIPE_INDEX_REFRESH_SECONDS", 30)
+    )
     cors_allow_origins: tuple[str, ...] = field(
         default_factory=lambda: _tuple_env("CORS_ALLOW_ORIGINS", ("*",))
     )
@@ -224,7 +355,7 @@ class AppSettings:
                 },
             )
 
-        default_provider = data.get("default_provider")
+        default_provider: str | None = data.get("default_provider")
         if default_provider is None or default_provider not in providers:
             logger.warning(
                 "Default provider missing or unknown in %s, falling back to first provider",
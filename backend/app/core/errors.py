@@ -7,13 +7,16 @@ from typing import Any, Callable, Tuple, Type
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
+from app.core.rate_limit import RateLimitExceeded
 from app.services.recipe_service import (
     RecipeProviderError,
+    RecipeRecentlyFailedError,
     RecipeServiceError,
     RecipeValidationError,
     UnknownProviderError,
     UnsupportedRoutingStrategy,
 )
+from app.services.stream_manager import StreamsDrainingError
 
 ErrorHandler = Callable[[Request, Exception], JSONResponse]
 
@@ -31,6 +34,27 @@ def _handler_factory(status_code: int, code: str) -> ErrorHandler:
     return _handler
 
 
+async def _rate_limit_handler(request: Request, exc: Exception) -> JSONResponse:
+    assert isinstance(exc, RateLimitExceeded)  # registered for this type only
+    payload = _build_payload(request, code="rate_limited", message=str(exc))
+    return JSONResponse(
+        status_code=429,
+        content=payload,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+async def _recently_failed_handler(request: Request, exc: Exception) -> JSONResponse:
+    assert isinstance(exc, RecipeRecentlyFailedError)  # registered for this type only
+    payload = _build_payload(request, code="generation_failed_recently", message=str(exc))
+    payload["error"]["failure"] = exc.failure
+    return JSONResponse(
+        status_code=422,
+        content=payload,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 def register_exception_handlers(app: FastAPI) -> None:
     """Attach application wide exception handlers."""
     mapping: list[Tuple[Type[Exception], int, str]] = [
@@ -39,6 +63,9 @@ def register_exception_handlers(app: FastAPI) -> None:
         (UnsupportedRoutingStrategy, 400, "invalid_routing_strategy"),
         (RecipeProviderError, 502, "provider_error"),
         (RecipeServiceError, 500, "recipe_service_error"),
+        (StreamsDrainingError, 503, "draining"),
     ]
     for exc_type, status_code, code in mapping:
         app.add_exception_handler(exc_type, _handler_factory(status_code, code))
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_handler)
+    app.add_exception_handler(RecipeRecentlyFailedError, _recently_failed_handler)
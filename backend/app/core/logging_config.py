@@ -0,0 +1,120 @@
+"""Non-blocking logging pipeline with JSON output and hot-path sampling.
+
+Log calls on the event loop only build a ``LogRecord`` and put it on an
+in-process queue; formatting and I/O happen on a ``QueueListener`` thread.
+Records logged with ``extra=HOT_PATH`` (per-request chatter such as cache
+hits) are sampled at ``LOG_HOT_PATH_SAMPLE_RATE`` before they are enqueued.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
+
+from app.core.config import AppSettings
+
+HOT_PATH: dict[str, Any] = {"hot_path": True}
+
+# Attributes every LogRecord has; anything else came in through ``extra``.
+_RESERVED_ATTRS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__.keys()
+) | {"message", "asctime", "hot_path", "taskName"}
+
+_listener: QueueListener | None = None
+_queue_handler: QueueHandler | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Render records as single-line JSON including ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class HotPathSampler(logging.Filter):
+    """Keep only a fraction of records flagged with ``extra=HOT_PATH``."""
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self._rate = min(max(rate, 0.0), 1.0)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "hot_path", False) or self._rate >= 1.0:
+            return True
+        return random.random() < self._rate
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Enqueue records untouched so formatting runs on the listener thread.
+
+    The stock ``prepare`` formats the message eagerly to make records
+    picklable, which is exactly the work we want off the event loop. The
+    queue never leaves this process, so that is unnecessary here.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_logging(settings: AppSettings) -> None:
+    """Install the queue-based pipeline on the root logger (idempotent)."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stderr)
+    if settings.log_format == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        # Same output as the logging.basicConfig() setup this replaced.
+        output.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    handler = _DeferredQueueHandler(records)
+    handler.addFilter(HotPathSampler(settings.log_hot_path_sample_rate))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(settings.log_level)
+    _queue_handler = handler
+
+    _listener = QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread.
+
+    Output handlers are re-attached to the root logger directly so anything
+    logged during interpreter teardown is still written.
+    """
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    _listener.stop()
+    root = logging.getLogger()
+    if _queue_handler is not None:
+        root.removeHandler(_queue_handler)
+    for output in _listener.handlers:
+        root.addHandler(output)
+    _listener = None
+    _queue_handler = None
@@ -0,0 +1,192 @@
+"""Prometheus metrics shared across the request hot path.
+
+Each process keeps its own registry. When several workers serve the app
+(``python main.py --production``), set ``PROMETHEUS_MULTIPROC_DIR`` to an
+empty writable directory: every worker then writes its samples there and
+``/metrics`` aggregates all of them, whichever worker answers the scrape.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Literal
+
+try:  # pragma: no cover - optional dependency
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        CollectorRegistry,
+        Counter,
+        Gauge,
+        Histogram,
+        generate_latest,
+        multiprocess,
+    )
+except ImportError:  # pragma: no cover - optional dependency
+    Counter = Gauge = Histogram = None  # type: ignore[assignment,misc]
+    CollectorRegistry = multiprocess = None  # type: ignore[assignment,misc]
+    generate_latest = None  # type: ignore[assignment]
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _NoopMetric:
+    """Stand-in used when prometheus_client is not installed."""
+
+    def labels(self, *_: Any, **__: Any) -> "_NoopMetric":
+        return self
+
+    def inc(self, *_: Any, **__: Any) -> None:
+        return None
+
+    def dec(self, *_: Any, **__: Any) -> None:
+        return None
+
+    def set(self, *_: Any, **__: Any) -> None:
+        return None
+
+    def observe(self, *_: Any, **__: Any) -> None:
+        return None
+
+
+METRICS_ENABLED = Counter is not None
+
+
+def multiprocess_dir() -> str | None:
+    """Directory shared by all workers' samples, if multiprocess mode is on."""
+    if not METRICS_ENABLED:
+        return None
+    return os.getenv("PROMETHEUS_MULTIPROC_DIR") or None
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+_TTFT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 21, 34)
+_TPS_BUCKETS = (1, 5, 10, 20, 30, 50, 75, 100, 150, 200, 400)
+
+
+def _counter(name: str, documentation: str, labels: tuple[str, ...]) -> Any:
+    if Counter is None:
+        return _NoopMetric()
+    return Counter(name, documentation, labels)
+
+
+def _gauge(
+    name: str,
+    documentation: str,
+    labels: tuple[str, ...] = (),
+    *,
+    multiprocess_mode: Literal["livesum", "livemax"] = "livesum",
+) -> Any:
+    # ``multiprocess_mode`` only matters with PROMETHEUS_MULTIPROC_DIR: per-worker
+    # gauges are summed over live workers, shared values take the maximum.
+    if Gauge is None:
+        return _NoopMetric()
+    return Gauge(name, documentation, labels, multiprocess_mode=multiprocess_mode)
+
+
+def _histogram(
+    name: str, documentation: str, labels: tuple[str, ...], buckets: tuple[float, ...]
+) -> Any:
+    if Histogram is None:
+        return _NoopMetric()
+    return Histogram(name, documentation, labels, buckets=buckets)
+
+
+HTTP_REQUEST_DURATION = _histogram(
+    "airecipe_http_request_duration_seconds",
+    "HTTP request latency by route template (streams: time to response headers)",
+    ("method", "route", "status"),
+    _LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = _gauge(
+    "airecipe_http_requests_in_progress",
+    "HTTP requests currently being handled",
+)
+CACHE_LOOKUPS = _counter(
+    "airecipe_cache_lookups_total",
+    "Recipe cache lookups by provider and result (hit, stale_hit, miss, error, fallback_hit, negative_hit)",
+    ("provider", "result"),
+)
+UPSTREAM_DURATION = _histogram(
+    "airecipe_upstream_request_duration_seconds",
+    "Latency of upstream LLM calls from request start to completion",
+    ("provider", "mode"),
+    _LATENCY_BUCKETS,
+)
+UPSTREAM_TTFT = _histogram(
+    "airecipe_upstream_time_to_first_token_seconds",
+    "Time from upstream request start to the first streamed content chunk",
+    ("provider",),
+    _TTFT_BUCKETS,
+)
+UPSTREAM_TOKENS_PER_SECOND = _histogram(
+    "airecipe_upstream_tokens_per_second",
+    "Streamed content chunks per second after the first token (one delta ~ one token)",
+    ("provider",),
+    _TPS_BUCKETS,
+)
+UPSTREAM_RETRIES = _counter(
+    "airecipe_upstream_retries_total",
+    "Upstream LLM request retries after transport or HTTP errors",
+    ("provider", "mode"),
+)
+UPSTREAM_EARLY_STOPS = _counter(
+    "airecipe_upstream_early_stops_total",
+    "Upstream streams closed once the recipe JSON object was complete, before [DONE]",
+    ("provider",),
+)
+UPSTREAM_ERRORS = _counter(
+    "airecipe_upstream_errors_total",
+    "Upstream LLM requests that failed after exhausting retries",
+    ("provider", "mode"),
+)
+SSE_STREAMS_IN_FLIGHT = _gauge(
+    "airecipe_sse_streams_in_flight",
+    "Server-sent event recipe streams currently open",
+)
+RATE_LIMITED = _counter(
+    "airecipe_rate_limited_total",
+    "Requests rejected with 429 by budget (hit, miss) and scope (minute, day)",
+    ("budget", "scope"),
+)
+BATCH_RECIPES = _counter(
+    "airecipe_batch_recipes_total",
+    "Recipes of multi-dish generations by outcome (batched, regenerated, failed)",
+    ("provider", "result"),
+)
+QUEUE_DEPTH = _gauge(
+    "airecipe_queue_depth",
+    "Work items waiting or in progress per queue (upstream:<provider> = pending LLM calls)",
+    ("queue",),
+)
+# Every worker reports the same shared queue, so it must not be summed.
+JOB_QUEUE_DEPTH = _gauge(
+    "airecipe_job_queue_depth",
+    "Generation jobs waiting in the shared job queue",
+    multiprocess_mode="livemax",
+)
+
+
+def render_latest() -> tuple[bytes, str]:
+    """Return the exposition payload and its content type."""
+    if generate_latest is None:
+        return b"# prometheus_client not installed\n", CONTENT_TYPE_LATEST
+    if multiprocess_dir() is None:
+        return generate_latest(), CONTENT_TYPE_LATEST
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def reset_multiprocess_dir() -> None:
+    """Remove samples left by a previous run; call once before starting workers."""
+    directory = multiprocess_dir()
+    if directory is None:
+        return
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.endswith(".db"):
+            os.remove(os.path.join(directory, name))
+
+
+def mark_worker_dead(pid: int) -> None:
+    """Drop the live gauges of an exited worker."""
+    if multiprocess_dir() is not None:
+        multiprocess.mark_process_dead(pid)
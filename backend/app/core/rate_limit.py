@@ -0,0 +1,156 @@
+"""Per-caller rate limits and daily quotas on top of ``CacheBackend.incr``.
+
+Two budgets are tracked separately: ``hit`` is charged for every recipe API
+request (cheap, mostly cache reads) and ``miss`` only when a request starts a
+real upstream generation. Each budget has a per-minute sliding-window limit
+and a per-day quota; ``0`` disables a limit.
+
+The sliding window is the usual two-counter approximation: the previous
+fixed window's count is weighted by how much of it still overlaps the last
+60 seconds. It costs one ``incr`` and one ``get`` per check and works the
+same on every cache backend, so limits are shared across workers whenever
+the cache is. A rejected check gives back the units it charged, so a
+multi-unit request (a batch) either fits entirely or costs nothing.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Literal
+
+from app.core.cache import CacheBackend
+from app.core.config import AppSettings
+from app.core.metrics import RATE_LIMITED
+
+logger = logging.getLogger(__name__)
+
+Budget = Literal["hit", "miss"]
+
+_WINDOW_SECONDS = 60
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when a caller is over a rate limit or daily quota."""
+
+    def __init__(self, message: str, *, retry_after: int, budget: Budget, scope: str) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.budget = budget
+        self.scope = scope
+
+
+class RateLimiter:
+    """Enforce per-minute limits and per-day quotas for each caller."""
+
+    def __init__(
+        self,
+        cache: CacheBackend,
+        *,
+        hits_per_minute: int = 0,
+        misses_per_minute: int = 0,
+        hits_per_day: int = 0,
+        misses_per_day: int = 0,
+    ) -> None:
+        self._cache = cache
+        self._per_minute = {"hit": hits_per_minute, "miss": misses_per_minute}
+        self._per_day = {"hit": hits_per_day, "miss": misses_per_day}
+
+    @classmethod
+    def from_settings(cls, cache: CacheBackend, settings: AppSettings) -> "RateLimiter":
+        return cls(
+            cache,
+            hits_per_minute=settings.rate_limit_hits_per_minute,
+            misses_per_minute=settings.rate_limit_misses_per_minute,
+            hits_per_day=settings.quota_hits_per_day,
+            misses_per_day=settings.quota_misses_per_day,
+        )
+
+    async def check(self, caller: str, budget: Budget, cost: int = 1) -> None:
+        """Charge ``cost`` units of ``budget`` to ``caller`` or raise :class:`RateLimitExceeded`.
+
+        Nothing stays charged when the check fails. Cache errors fail open: an
+        unavailable limiter must not take the API down with it.
+        """
+        if cost <= 0:
+            return
+        subject = hashlib.sha256(caller.encode("utf-8")).hexdigest()[:16]
+        charged: list[str] = []
+        try:
+            await self._check_window(subject, budget, cost, charged)
+            await self._check_quota(subject, budget, cost, charged)
+        except RateLimitExceeded as exc:
+            RATE_LIMITED.labels(budget=budget, scope=exc.scope).inc()
+            logger.info("Rate limited %s budget (%s) for caller %s", budget, exc.scope, subject)
+            await self._refund(charged, cost)
+            raise
+        except Exception:
+            logger.warning("Rate limiter unavailable; allowing request", exc_info=True)
+
+    async def _refund(self, keys: list[str], cost: int) -> None:
+        for key in keys:
+            try:
+                await self._cache.incr(key, amount=-cost)
+            except Exception:
+                logger.warning("Failed to refund rate-limit counter %s", key, exc_info=True)
+
+    async def _check_window(
+        self, subject: str, budget: Budget, cost: int, charged: list[str]
+    ) -> None:
+        limit = self._per_minute[budget]
+        if limit <= 0:
+            return
+        now = time.time()
+        index = int(now // _WINDOW_SECONDS)
+        prefix = f"ratelimit:{budget}:{subject}"
+        key = f"{prefix}:{index}"
+        current = await self._cache.incr(key, ttl=_WINDOW_SECONDS * 2, amount=cost)
+        charged.append(key)
+        previous = int(await self._cache.get(f"{prefix}:{index - 1}") or 0)
+        elapsed = now - index * _WINDOW_SECONDS
+        overlap = 1 - elapsed / _WINDOW_SECONDS
+        if previous * overlap + current <= limit:
+            return
+        if cost > limit:
+            raise RateLimitExceeded(
+                f"request needs {cost} {budget} units but the limit is {limit} per minute",
+                retry_after=_WINDOW_SECONDS,
+                budget=budget,
+                scope="minute",
+            )
+
+        if current > limit or previous <= 0:
+            wait = _WINDOW_SECONDS - elapsed
+        else:
+            # Time until the decaying previous window leaves room again.
+            needed = 1 - (limit - current) / previous
+            wait = needed * _WINDOW_SECONDS - elapsed
+        raise RateLimitExceeded(
+            f"rate limit of {limit} {budget} requests per minute exceeded",
+            retry_after=max(math.ceil(wait), 1),
+            budget=budget,
+            scope="minute",
+        )
+
+    async def _check_quota(
+        self, subject: str, budget: Budget, cost: int, charged: list[str]
+    ) -> None:
+        limit = self._per_day[budget]
+        if limit <= 0:
+            return
+        now = datetime.now(timezone.utc)
+        key = f"quota:{budget}:{subject}:{now:%Y%m%d}"
+        used = await self._cache.incr(key, ttl=2 * 86400, amount=cost)
+        charged.append(key)
+        if used <= limit:
+            return
+        midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        raise RateLimitExceeded(
+            f"daily quota of {limit} {budget} requests exhausted",
+            retry_after=max(math.ceil((midnight - now).total_seconds()), 1),
+            budget=budget,
+            scope="day",
+        )
@@ -0,0 +1,157 @@
+"""Optional OpenTelemetry tracing helpers.
+
+Tracing is disabled unless ``TRACING_ENABLED=true`` and the OpenTelemetry SDK
+is installed; every helper then degrades to a no-op so call sites stay cheap.
+Spans are exported over OTLP when ``OTEL_EXPORTER_OTLP_ENDPOINT`` is set (and
+``opentelemetry-exporter-otlp`` is available), otherwise as JSON lines to
+``OTEL_TRACES_FILE`` so traces can be inspected offline.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+from contextlib import contextmanager
+from typing import IO, Any, Iterator, Mapping
+
+from app.core.config import AppSettings
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_ATTRIBUTE = "airecipe.request_id"
+
+_request_id: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "airecipe_request_id", default=None
+)
+# The OpenTelemetry modules are bound by ``init_tracing`` so that processes
+# with tracing disabled never pay for importing the SDK.
+trace: Any = None
+propagate: Any = None
+_tracer: Any = None
+_provider: Any = None
+_trace_file: IO[str] | None = None
+
+
+def init_tracing(settings: AppSettings) -> bool:
+    """Configure the global tracer provider; return whether tracing is active."""
+    global trace, propagate, _tracer, _provider, _trace_file
+    if not settings.tracing_enabled:
+        return False
+    if _tracer is not None:
+        return True
+    try:  # pragma: no cover - optional dependency
+        from opentelemetry import propagate as otel_propagate
+        from opentelemetry import trace as otel_trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import (
+            BatchSpanProcessor,
+            ConsoleSpanExporter,
+        )
+    except ImportError:  # pragma: no cover - optional dependency
+        logger.warning("TRACING_ENABLED is set but opentelemetry-sdk is not installed")
+        return False
+    trace, propagate = otel_trace, otel_propagate
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.tracing_service_name})
+    )
+    exporter: Any = None
+    if settings.otel_exporter_otlp_endpoint:
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (  # type: ignore[import-not-found]
+                OTLPSpanExporter,
+            )
+        except ImportError:
+            logger.warning(
+                "OTEL_EXPORTER_OTLP_ENDPOINT is set but opentelemetry-exporter-otlp "
+                "is not installed; falling back to file export"
+            )
+        else:
+            exporter = OTLPSpanExporter(endpoint=settings.otel_exporter_otlp_endpoint)
+            logger.info("Exporting traces to %s", settings.otel_exporter_otlp_endpoint)
+    if exporter is None:
+        path = settings.tracing_file_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _trace_file = path.open("a", encoding="utf-8")
+        exporter = ConsoleSpanExporter(
+            out=_trace_file,
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+        logger.info("Writing traces to %s", path)
+
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _provider = provider
+    _tracer = trace.get_tracer("airecipe")
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and release the exporter."""
+    global _tracer, _provider, _trace_file
+    if _provider is not None:
+        _provider.shutdown()
+    if _trace_file is not None:
+        _trace_file.close()
+    _tracer = _provider = _trace_file = None
+
+
+def tracing_active() -> bool:
+    return _tracer is not None
+
+
+def bind_request_id(request_id: str) -> contextvars.Token[str | None]:
+    """Attach the request ID to every span started in the current context."""
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token: contextvars.Token[str | None]) -> None:
+    _request_id.reset(token)
+
+
+@contextmanager
+def span(
+    name: str,
+    attributes: Mapping[str, Any] | None = None,
+    *,
+    current: bool = True,
+    carrier: Mapping[str, str] | None = None,
+) -> Iterator[Any]:
+    """Open a span around a block; yields ``None`` when tracing is off.
+
+    Pass ``current=False`` inside async generators: the span is parented to
+    the active context but not made current, so it does not leak into the
+    consumer between ``yield`` points. ``carrier`` extracts an incoming W3C
+    trace context (e.g. request headers) as the parent.
+    """
+    if _tracer is None:
+        yield None
+        return
+
+    attrs = dict(attributes or {})
+    request_id = _request_id.get()
+    if request_id is not None:
+        attrs.setdefault(REQUEST_ID_ATTRIBUTE, request_id)
+    context = propagate.extract(carrier) if carrier is not None else None
+
+    if current:
+        with _tracer.start_as_current_span(name, context=context, attributes=attrs) as active:
+            yield active
+        return
+
+    detached = _tracer.start_span(name, context=context, attributes=attrs)
+    try:
+        yield detached
+    except BaseException as exc:
+        detached.record_exception(exc)
+        detached.set_status(trace.Status(trace.StatusCode.ERROR, str(exc)))
+        raise
+    finally:
+        detached.end()
+
+
+def add_event(active: Any, name: str, attributes: Mapping[str, Any] | None = None) -> None:
+    """Record an event on a span yielded by :func:`span` (no-op when ``None``)."""
+    if active is not None:
+        active.add_event(name, attributes=dict(attributes or {}))
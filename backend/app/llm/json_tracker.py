@@ -0,0 +1,104 @@
+"""Detect the end of the top-level JSON object in streamed model output.
+
+Models regularly keep generating after the recipe's closing brace (a closing
+explanation, a second code block, trailing reasoning). :class:`JsonObjectTracker`
+follows string, escape and nesting state chunk by chunk so a stream can be
+cut off the moment the object is complete. ``<think>`` blocks before the
+object are skipped, and a balanced candidate only counts once it parses, so a
+stray brace in leading prose never ends a stream early.
+"""
+
+from __future__ import annotations
+
+import json
+
+_THINK_OPEN = "<think>"
+_THINK_CLOSE = "</think>"
+
+
+class JsonObjectTracker:
+    """Incremental brace tracker for the first top-level JSON object."""
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._pos = 0
+        self._start: int | None = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._end: int | None = None
+
+    @property
+    def complete(self) -> bool:
+        return self._end is not None
+
+    def feed(self, chunk: str) -> int | None:
+        """Add ``chunk``; return the offset just past the closing brace once complete.
+
+        The offset is relative to ``chunk``. ``None`` means the object is not
+        complete yet; after completion every further chunk returns ``0``.
+        """
+        if self._end is not None:
+            return 0
+        offset = len(self._text)
+        self._text += chunk
+        end = self._scan()
+        if end is None:
+            return None
+        self._end = end
+        return end - offset
+
+    def _scan(self) -> int | None:
+        text = self._text
+        pos = self._pos
+        while pos < len(text):
+            if self._start is None:
+                think = text.find(_THINK_OPEN, pos)
+                brace = text.find("{", pos)
+                if think >= 0 and (brace < 0 or think < brace):
+                    close = text.find(_THINK_CLOSE, think)
+                    if close < 0:
+                        self._pos = think
+                        return None
+                    pos = close + len(_THINK_CLOSE)
+                    continue
+                if brace < 0:
+                    # Keep enough tail to spot a tag split across chunks.
+                    self._pos = max(pos, len(text) - len(_THINK_OPEN) + 1)
+                    return None
+                self._start = brace
+                self._depth = 0
+                pos = brace
+
+            for index in range(pos, len(text)):
+                char = text[index]
+                if self._in_string:
+                    if self._escaped:
+                        self._escaped = False
+                    elif char == "\\":
+                        self._escaped = True
+                    elif char == '"':
+                        self._in_string = False
+                elif char == '"':
+                    self._in_string = True
+                elif char in "{[":
+                    self._depth += 1
+                elif char in "}]":
+                    self._depth -= 1
+                    if self._depth == 0:
+                        if self._is_object(text[self._start : index + 1]):
+                            return index + 1
+                        self._start = None
+                        pos = index + 1
+                        break
+            else:
+                pos = len(text)
+        self._pos = pos
+        return None
+
+    @staticmethod
+    def _is_object(candidate: str) -> bool:
+        try:
+            return isinstance(json.loads(candidate, strict=False), dict)
+        except ValueError:
+            return False
@@ -139,7 +139,7 @@ class MockLLMProvider(RecipeLLMProvider):
             timeout=timeout,
         )
 
-    async def generate(self, *, prompt: str) -> str:
+    async def generate(self, *, prompt: str, max_tokens: int | None = None) -> str:
         response = await self._client.post(
             self._path,
             json={
@@ -154,7 +154,9 @@ class MockLLMProvider(RecipeLLMProvider):
         data = response.json()
         return data["choices"][0]["message"]["content"]
 
-    async def generate_stream(self, *, prompt: str) -> AsyncIterator[str]:
+    async def generate_stream(
+        self, *, prompt: str, max_tokens: int | None = None
+    ) -> AsyncIterator[str]:
         """Simulate streaming by yielding content in chunks."""
         # Get the full content first
         full_content = await self.generate(prompt=prompt)
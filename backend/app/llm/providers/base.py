@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, AsyncIterator, Dict
+from typing import Any, AsyncIterator, Dict, Mapping
 
 
 @dataclass(frozen=True)
@@ -28,14 +28,41 @@ class RecipeLLMProvider(ABC):
 
     name: str
     model: str
+    # Upstream calls currently running; a retired provider is only closed
+    # once this drops to zero (see ``ProviderRegistry.reload``).
+    in_flight: int = 0
 
     @abstractmethod
-    async def generate(self, *, prompt: str) -> str:
-        """Return the raw model output for the provided prompt."""
+    async def generate(self, *, prompt: str, max_tokens: int | None = None) -> str:
+        """Return the raw model output for the provided prompt.
+
+        ``max_tokens`` caps the output length where the upstream supports it.
+        """
 
     @abstractmethod
-    async def generate_stream(self, *, prompt: str) -> AsyncIterator[str]:
+    async def generate_stream(
+        self, *, prompt: str, max_tokens: int | None = None
+    ) -> AsyncIterator[str]:
         """Return an async iterator yielding the raw model output chunks."""
 
+    @property
+    def batch_enabled(self) -> bool:
+        """Whether offline warm-up may use this provider's batch API."""
+        return False
+
+    async def submit_batch(
+        self, prompts: Mapping[str, str], *, max_tokens: int | None = None
+    ) -> str:
+        """Submit ``custom_id -> prompt`` as one asynchronous batch; return its ID."""
+        raise NotImplementedError(f"provider '{self.name}' has no batch API")
+
+    async def get_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Return the vendor's batch object (``status``, ``output_file_id``, ...)."""
+        raise NotImplementedError(f"provider '{self.name}' has no batch API")
+
+    def batch_results(self, file_id: str) -> AsyncIterator[tuple[str, str | None, str | None]]:
+        """Yield ``(custom_id, content, error)`` for every line of a result file."""
+        raise NotImplementedError(f"provider '{self.name}' has no batch API")
+
     async def aclose(self) -> None:
         """Release any underlying resources."""
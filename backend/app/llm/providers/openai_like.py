@@ -5,12 +5,25 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import time
 from copy import deepcopy
-from typing import Any, AsyncIterator, Dict
+from typing import Any, AsyncIterator, Dict, Mapping
 from urllib.parse import urlparse
+from uuid import uuid4
 
 import httpx
 
+from app.core.metrics import (
+    QUEUE_DEPTH,
+    UPSTREAM_DURATION,
+    UPSTREAM_EARLY_STOPS,
+    UPSTREAM_ERRORS,
+    UPSTREAM_RETRIES,
+    UPSTREAM_TOKENS_PER_SECOND,
+    UPSTREAM_TTFT,
+)
+from app.core.tracing import add_event, span
+from app.llm.json_tracker import JsonObjectTracker
 from app.llm.providers.base import ProviderSettings, RecipeLLMProvider
 
 logger = logging.getLogger(__name__)
@@ -29,12 +42,24 @@ class OpenAILikeLLMProvider(RecipeLLMProvider):
         has_version_suffix = last_segment.startswith("v") and last_segment[1:].isdigit()
         default_path = "/chat/completions" if has_version_suffix else "/v1/chat/completions"
         self._path = settings.metadata.get("path", default_path)
+        # Files and batches live next to chat completions under the API root.
+        self._api_prefix = "" if has_version_suffix else "/v1"
+        self._batch_url = f"{base_path}{self._path}"
+        batch_api = settings.metadata.get("batch_api", False)
+        self._batch_options: Dict[str, Any] = (
+            dict(batch_api) if isinstance(batch_api, dict) else {"enabled": bool(batch_api)}
+        )
         self._max_retries = max(settings.max_retries, 0)
         self._backoff = max(settings.backoff_factor, 0.0)
         self._system_prompt = settings.metadata.get(
             "system_prompt", "You are a helpful recipe assistant."
         )
         self._payload_overrides = deepcopy(settings.metadata.get("payload_overrides", {}))
+        # Newer OpenAI models only accept ``max_completion_tokens``.
+        self._max_tokens_param = settings.metadata.get("max_tokens_param", "max_tokens")
+        # The model's output limit; larger max_tokens values are rejected with a 400.
+        self._max_output_tokens = int(settings.metadata.get("max_output_tokens", 0) or 0)
+        self._stop_after_json = bool(settings.metadata.get("stop_after_json", True))
 
         default_headers = {
             "Authorization": f"Bearer {settings.api_key}",
@@ -49,7 +74,7 @@ class OpenAILikeLLMProvider(RecipeLLMProvider):
             trust_env=False,  # Don't use environment proxy settings
         )
 
-    def _build_payload(self, prompt: str) -> Dict[str, Any]:
+    def _build_payload(self, prompt: str, max_tokens: int | None = None) -> Dict[str, Any]:
         payload: Dict[str, Any] = {
             "model": self.model,
             "messages": [
@@ -57,16 +82,32 @@ class OpenAILikeLLMProvider(RecipeLLMProvider):
                 {"role": "user", "content": prompt},
             ],
         }
+        if max_tokens:
+            if self._max_output_tokens > 0:
+                max_tokens = min(max_tokens, self._max_output_tokens)
+            payload[self._max_tokens_param] = max_tokens
         payload.update(deepcopy(self._payload_overrides))
         return payload
 
 
-    async def generate(self, *, prompt: str) -> str:
+    async def generate(self, *, prompt: str, max_tokens: int | None = None) -> str:
+        pending = QUEUE_DEPTH.labels(queue=f"upstream:{self.name}")
+        pending.inc()
+        self.in_flight += 1
+        try:
+            with span("llm.generate", self._span_attributes()):
+                return await self._generate(prompt, max_tokens)
+        finally:
+            self.in_flight -= 1
+            pending.dec()
+
+    async def _generate(self, prompt: str, max_tokens: int | None = None) -> str:
         last_exc: Exception | None = None
         for attempt in range(self._max_retries + 1):
+            started = time.perf_counter()
             try:
                 response = await self._client.post(
-                    self._path, json=self._build_payload(prompt)
+                    self._path, json=self._build_payload(prompt, max_tokens)
                 )
                 response.raise_for_status()
                 data = response.json()
@@ -84,12 +125,17 @@ class OpenAILikeLLMProvider(RecipeLLMProvider):
                     logger.error("Provider %s returned empty content: %s", self.name, repr(content))
                     raise ValueError("provider response content is empty")
                 logger.debug("Provider %s content length: %d chars", self.name, len(content))
+                UPSTREAM_DURATION.labels(provider=self.name, mode="complete").observe(
+                    time.perf_counter() - started
+                )
                 return content
             except httpx.HTTPError as exc:
                 last_exc = exc
                 if attempt >= self._max_retries:
+                    UPSTREAM_ERRORS.labels(provider=self.name, mode="complete").inc()
                     logger.exception("Provider request failed after retries")
                     raise
+                UPSTREAM_RETRIES.labels(provider=self.name, mode="complete").inc()
                 sleep_for = self._backoff * (2**attempt)
                 if sleep_for > 0:
                     await asyncio.sleep(sleep_for)
@@ -97,15 +143,50 @@ class OpenAILikeLLMProvider(RecipeLLMProvider):
         assert last_exc is not None  # pragma: no cover - defensive
         raise last_exc
 
-    async def generate_stream(self, *, prompt: str) -> AsyncIterator[str]:
-        """Stream raw model output chunks using SSE format."""
-        payload = self._build_payload(prompt)
+    async def generate_stream(
+        self, *, prompt: str, max_tokens: int | None = None
+    ) -> AsyncIterator[str]:
+        """Stream raw model output chunks using SSE format.
+
+        Unless ``stop_after_json`` is disabled for the provider, the upstream
+        connection is closed as soon as the top-level JSON object is complete,
+        so tokens generated after the recipe are neither waited for nor paid.
+        """
+        pending = QUEUE_DEPTH.labels(queue=f"upstream:{self.name}")
+        pending.inc()
+        self.in_flight += 1
+        try:
+            with span("llm.stream", self._span_attributes(), current=False) as active:
+                async for chunk in self._generate_stream(prompt, active, max_tokens):
+                    yield chunk
+        finally:
+            self.in_flight -= 1
+            pending.dec()
+
+    def _span_attributes(self) -> Dict[str, Any]:
+        return {
+            "airecipe.provider": self.name,
+            "llm.model": self.model,
+            "server.address": str(self._client.base_url),
+        }
+
+    async def _generate_stream(
+        self, prompt: str, active: Any = None, max_tokens: int | None = None
+    ) -> AsyncIterator[str]:
+        payload = self._build_payload(prompt, max_tokens)
         payload["stream"] = True
 
         last_exc: Exception | None = None
         for attempt in range(self._max_retries + 1):
+            started = time.perf_counter()
+            first_chunk_at: float | None = None
+            chunk_count = 0
+            tracker = JsonObjectTracker() if self._stop_after_json else None
             try:
                 async with self._client.stream("POST", self._path, json=payload) as response:
+                    if response.is_error:
+                        # Load the error body so callers can classify the failure.
+                        await response.aread()
                     response.raise_for_status()
 
                     # Buffer for incomplete lines
@@ -131,6 +212,7 @@ class OpenAILikeLLMProvider(RecipeLLMProvider):
                                 # Check for [DONE] marker
                                 if data_str == "[DONE]":
                                     logger.debug("Provider %s stream completed", self.name)
+                                    self._observe_stream(started, first_chunk_at, chunk_count, active)
                                     return
 
                                 try:
@@ -143,6 +225,29 @@ class OpenAILikeLLMProvider(RecipeLLMProvider):
                                         content = delta.get("content")
 
                                         if content:
+                                            if first_chunk_at is None:
+                                                first_chunk_at = time.perf_counter()
+                                                UPSTREAM_TTFT.labels(provider=self.name).observe(
+                                                    first_chunk_at - started
+                                                )
+                                                add_event(active, "first_chunk", {"attempt": attempt})
+                                            chunk_count += 1
+                                            end = tracker.feed(content) if tracker else None
+                                            if end is not None:
+                                                # Leaving the ``async with`` closes the
+                                                # upstream response mid-stream.
+                                                if end:
+                                                    yield content[:end]
+                                                logger.debug(
+                                                    "Provider %s recipe JSON complete; closing stream",
+                                                    self.name,
+                                                )
+                                                UPSTREAM_EARLY_STOPS.labels(provider=self.name).inc()
+                                                add_event(active, "json_complete", {"chunks": chunk_count})
+                                                self._observe_stream(
+                                                    started, first_chunk_at, chunk_count, active
+                                                )
+                                                return
                                             # Stream immediately for all models
                                             yield content
 
@@ -155,13 +260,17 @@ class OpenAILikeLLMProvider(RecipeLLMProvider):
                                     )
                                     continue
 
+                self._observe_stream(started, first_chunk_at, chunk_count, active)
                 return  # Successful stream completion
 
             except httpx.HTTPError as exc:
                 last_exc = exc
                 if attempt >= self._max_retries:
+                    UPSTREAM_ERRORS.labels(provider=self.name, mode="stream").inc()
                     logger.exception("Provider stream failed after retries")
                     raise
+                UPSTREAM_RETRIES.labels(provider=self.name, mode="stream").inc()
+                add_event(active, "retry", {"attempt": attempt, "error": type(exc).__name__})
                 sleep_for = self._backoff * (2**attempt)
                 if sleep_for > 0:
                     await asyncio.sleep(sleep_for)
@@ -169,5 +278,111 @@ class OpenAILikeLLMProvider(RecipeLLMProvider):
         assert last_exc is not None  # pragma: no cover - defensive
         raise last_exc
 
+    def _observe_stream(
+        self,
+        started: float,
+        first_chunk_at: float | None,
+        chunk_count: int,
+        active: Any = None,
+    ) -> None:
+        finished = time.perf_counter()
+        add_event(active, "stream_end", {"chunks": chunk_count})
+        UPSTREAM_DURATION.labels(provider=self.name, mode="stream").observe(finished - started)
+        if first_chunk_at is not None and chunk_count > 1 and finished > first_chunk_at:
+            UPSTREAM_TOKENS_PER_SECOND.labels(provider=self.name).observe(
+                (chunk_count - 1) / (finished - first_chunk_at)
+            )
+
+    @property
+    def batch_enabled(self) -> bool:
+        return bool(self._batch_options.get("enabled", True))
+
+    @property
+    def batch_options(self) -> Dict[str, Any]:
+        return dict(self._batch_options)
+
+    async def submit_batch(
+        self, prompts: Mapping[str, str], *, max_tokens: int | None = None
+    ) -> str:
+        """Upload a JSONL request file and create an OpenAI-style batch from it."""
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": self._batch_url,
+                    "body": self._build_payload(prompt, max_tokens),
+                },
+                ensure_ascii=False,
+            )
+            for custom_id, prompt in prompts.items()
+        ]
+        # Encoded by hand: the client's JSON Content-Type default would
+        # otherwise win over httpx's multipart header.
+        boundary = uuid4().hex
+        head = (
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="purpose"\r\n\r\nbatch\r\n'
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="file"; filename="warmup.jsonl"\r\n'
+            "Content-Type: application/jsonl\r\n\r\n"
+        )
+        body = (head + "\n".join(lines) + f"\r\n--{boundary}--\r\n").encode("utf-8")
+        response = await self._client.post(
+            f"{self._api_prefix}/files",
+            content=body,
+            headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+        )
+        response.raise_for_status()
+        file_id = response.json()["id"]
+
+        response = await self._client.post(
+            f"{self._api_prefix}/batches",
+            json={
+                "input_file_id": file_id,
+                "endpoint": self._batch_url,
+                "completion_window": self._batch_options.get("completion_window", "24h"),
+            },
+        )
+        response.raise_for_status()
+        batch_id = response.json()["id"]
+        logger.info("Provider %s submitted batch %s with %d request(s)", self.name, batch_id, len(lines))
+        return batch_id
+
+    async def get_batch(self, batch_id: str) -> Dict[str, Any]:
+        response = await self._client.get(f"{self._api_prefix}/batches/{batch_id}")
+        response.raise_for_status()
+        return response.json()
+
+    async def batch_results(
+        self, file_id: str
+    ) -> AsyncIterator[tuple[str, str | None, str | None]]:
+        async with self._client.stream(
+            "GET", f"{self._api_prefix}/files/{file_id}/content"
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("Provider %s returned an unparsable batch line", self.name)
+                    continue
+                custom_id = str(record.get("custom_id", ""))
+                result = record.get("response") or {}
+                if record.get("error") or result.get("status_code") != 200:
+                    error = record.get("error") or (result.get("body") or {}).get("error")
+                    message = (
+                        json.dumps(error, ensure_ascii=False)
+                        if error
+                        else f"status {result.get('status_code')}"
+                    )
+                    yield custom_id, None, message
+                    continue
+                choices = (result.get("body") or {}).get("choices") or [{}]
+                content = (choices[0].get("message") or {}).get("content")
+                yield custom_id, content, None if content else "empty content"
+
     async def aclose(self) -> None:
         await self._client.aclose()
@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
+import math
 from collections import deque
+from dataclasses import dataclass
 from itertools import cycle
 from typing import Dict, Iterable
 
@@ -20,6 +23,16 @@ class ProviderBuildError(RuntimeError):
     """Raised when a provider cannot be constructed."""
 
 
+@dataclass(frozen=True)
+class ProviderReloadResult:
+    """Outcome of applying a new provider configuration."""
+
+    added: tuple[str, ...]
+    updated: tuple[str, ...]
+    removed: tuple[str, ...]
+    unchanged: tuple[str, ...]
+
+
 class WeightedRoundRobin:
     """Deterministic weighted selection helper."""
 
@@ -48,25 +61,165 @@ class WeightedRoundRobin:
             return next(self._cycle)
 
 
+class WeightedRendezvous:
+    """Map keys to providers with weighted rendezvous (highest random weight) hashing.
+
+    Every provider scores each key with ``-weight / ln(h)``, where ``h`` is a
+    uniform hash of ``provider:key``; the highest score wins. Each provider
+    receives a share of keys proportional to its weight, and adding or
+    removing a provider only moves the keys that it wins or loses.
+    """
+
+    def __init__(self, weights: Dict[str, float]) -> None:
+        self._weights = {name: weight for name, weight in weights.items() if weight > 0}
+
+    @staticmethod
+    def _unit_hash(value: str) -> float:
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+        # Map to the open interval (0, 1) so ln() is always finite and negative.
+        return (int.from_bytes(digest, "big") + 0.5) / 2**64
+
+    def pick(self, key: str) -> str:
+        if not self._weights:
+            raise RuntimeError("No providers configured for consistent-hash routing")
+        return max(
+            self._weights,
+            key=lambda name: -self._weights[name] / math.log(self._unit_hash(f"{name}:{key}")),
+        )
+
+
 class ProviderRegistry:
     """Maintain instantiated providers and routing behaviour."""
 
-    def __init__(self, config: LLMProvidersConfig) -> None:
+    def __init__(self, config: LLMProvidersConfig, *, drain_timeout: float = 120.0) -> None:
         self._config = config
         self._providers: Dict[str, RecipeLLMProvider] = {}
-        self._weighted = WeightedRoundRobin(
+        self._weighted = self._build_weighted(config)
+        self._rendezvous = self._build_rendezvous(config)
+        self._drain_timeout = drain_timeout
+        self._draining: set[asyncio.Task[None]] = set()
+
+    @staticmethod
+    def _build_weighted(config: LLMProvidersConfig) -> WeightedRoundRobin:
+        return WeightedRoundRobin(
             {name: provider.weight for name, provider in config.providers.items()}
         )
 
+    @staticmethod
+    def _build_rendezvous(config: LLMProvidersConfig) -> WeightedRendezvous:
+        # Only enabled providers take part, so toggling ``switch`` moves just
+        # that provider's share of dishes.
+        return WeightedRendezvous(
+            {
+                name: provider.weight
+                for name, provider in config.providers.items()
+                if provider.switch
+            }
+        )
+
+    @property
+    def config(self) -> LLMProvidersConfig:
+        return self._config
+
     async def startup(self) -> None:
-        """Instantiate configured providers."""
+        """Instantiate enabled providers; ``switch: false`` ones are built on first use."""
         for name, provider_config in self._config.providers.items():
-            provider = self._build_provider(provider_config)
-            self._providers[name] = provider
-            logger.info("Registered provider '%s' (%s)", name, provider_config.type)
+            if not provider_config.switch:
+                logger.debug("Deferring disabled provider '%s'", name)
+                continue
+            self._register(provider_config)
+
+    def _register(self, provider_config: ProviderConfig) -> RecipeLLMProvider:
+        provider = self._build_provider(provider_config)
+        self._providers[provider_config.name] = provider
+        logger.info("Registered provider '%s' (%s)", provider_config.name, provider_config.type)
+        return provider
+
+    async def reload(self, config: LLMProvidersConfig) -> ProviderReloadResult:
+        """Swap in a new configuration without interrupting running requests.
+
+        Providers whose configuration is unchanged keep their instance (and
+        connection pool). New or changed enabled providers are built before
+        anything is swapped, so a build error leaves the registry untouched.
+        Replaced and removed instances are closed in the background once their
+        in-flight calls finish or ``drain_timeout`` expires.
+        """
+        current = self._config.providers
+        providers: Dict[str, RecipeLLMProvider] = {}
+        built: list[RecipeLLMProvider] = []
+        retired: list[RecipeLLMProvider] = []
+        added: list[str] = []
+        updated: list[str] = []
+        unchanged: list[str] = []
+
+        try:
+            for name, provider_config in config.providers.items():
+                previous = current.get(name)
+                existing = self._providers.get(name)
+                if previous == provider_config:
+                    unchanged.append(name)
+                    if existing is not None:
+                        providers[name] = existing
+                    continue
+                (added if previous is None else updated).append(name)
+                if existing is not None:
+                    retired.append(existing)
+                if provider_config.switch:
+                    provider = self._build_provider(provider_config)
+                    built.append(provider)
+                    providers[name] = provider
+        except Exception:
+            for provider in built:
+                await provider.aclose()
+            raise
+
+        removed = [name for name in current if name not in config.providers]
+        retired.extend(self._providers[name] for name in removed if name in self._providers)
+
+        # No awaits between these assignments: requests see either the old
+        # or the new state, never a mix.
+        self._config = config
+        self._providers = providers
+        self._weighted = self._build_weighted(config)
+        self._rendezvous = self._build_rendezvous(config)
+
+        for provider in retired:
+            task = asyncio.create_task(self._drain(provider))
+            self._draining.add(task)
+            task.add_done_callback(self._draining.discard)
+
+        return ProviderReloadResult(
+            added=tuple(added),
+            updated=tuple(updated),
+            removed=tuple(removed),
+            unchanged=tuple(unchanged),
+        )
+
+    async def _drain(self, provider: RecipeLLMProvider) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._drain_timeout
+        try:
+            while provider.in_flight and loop.time() < deadline:
+                await asyncio.sleep(0.2)
+            if provider.in_flight:
+                logger.warning(
+                    "Closing retired provider '%s' with %d calls still in flight",
+                    provider.name,
+                    provider.in_flight,
+                )
+        finally:
+            try:
+                await provider.aclose()
+            except Exception:  # pragma: no cover - defensive
+                logger.exception("Failed to close provider %s", provider.name)
+            logger.info("Retired provider '%s' closed", provider.name)
 
     async def shutdown(self) -> None:
         """Release provider resources."""
+        for task in list(self._draining):
+            task.cancel()
+        if self._draining:
+            await asyncio.gather(*self._draining, return_exceptions=True)
         for provider in self._providers.values():
             try:
                 await provider.aclose()
@@ -74,17 +227,30 @@ class ProviderRegistry:
                 logger.exception("Failed to close provider %s", provider.name)
 
     def get(self, name: str) -> RecipeLLMProvider:
-        try:
-            return self._providers[name]
-        except KeyError as exc:
-            raise KeyError(f"provider '{name}' is not registered") from exc
+        provider = self._providers.get(name)
+        if provider is not None:
+            return provider
+        provider_config = self._config.providers.get(name)
+        if provider_config is None:
+            raise KeyError(f"provider '{name}' is not registered")
+        return self._register(provider_config)
 
     @property
     def default_strategy(self) -> str:
         return self._config.routing.strategy
 
-    async def resolve(self, *, requested: str | None = None, strategy: str | None = None) -> RecipeLLMProvider:
-        """Resolve a provider based on request parameters and routing config."""
+    async def resolve(
+        self,
+        *,
+        requested: str | None = None,
+        strategy: str | None = None,
+        dish_name: str | None = None,
+    ) -> RecipeLLMProvider:
+        """Resolve a provider based on request parameters and routing config.
+
+        ``consistent_hash`` pins each normalised dish name to one provider so
+        repeat requests land on the same cache key.
+        """
         if requested:
             return self.get(requested)
 
@@ -92,6 +258,14 @@ class ProviderRegistry:
         if resolved_strategy == "weighted":
             name = await self._weighted.next()
             return self.get(name)
+        if resolved_strategy == "consistent_hash":
+            if not dish_name:
+                return self.get(self._config.default_provider)
+            try:
+                name = self._rendezvous.pick(dish_name.strip().lower())
+            except RuntimeError:
+                name = self._config.default_provider
+            return self.get(name)
         if resolved_strategy == "default":
             return self.get(self._config.default_provider)
 
@@ -0,0 +1,98 @@
+"""Hot reload of the provider configuration file."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Tuple
+
+from app.core.config import AppSettings, get_llm_providers
+from app.llm.registry import ProviderRegistry, ProviderReloadResult
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderReloadError(RuntimeError):
+    """Raised when a new provider configuration cannot be applied."""
+
+
+class ProviderConfigReloader:
+    """Apply changes to ``LLM_CONFIG_PATH`` to a live :class:`ProviderRegistry`.
+
+    ``reload()`` can be triggered explicitly (admin endpoint) and ``start()``
+    polls the file's mtime every ``LLM_CONFIG_WATCH_SECONDS``. Every worker
+    process runs its own watcher, so editing the file reaches all of them
+    while the admin endpoint only reloads the worker that served it.
+    """
+
+    def __init__(self, registry: ProviderRegistry, settings: AppSettings) -> None:
+        self._registry = registry
+        self._settings = settings
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self._signature = self._stat()
+
+    @property
+    def registry(self) -> ProviderRegistry:
+        return self._registry
+
+    def _stat(self) -> Tuple[int, int] | None:
+        try:
+            info = self._settings.llm_config_path.stat()
+        except OSError:
+            return None
+        return (info.st_mtime_ns, info.st_size)
+
+    async def reload(self) -> ProviderReloadResult:
+        async with self._lock:
+            signature = self._stat()
+            try:
+                config = self._settings.load_llm_providers()
+            except Exception as exc:
+                raise ProviderReloadError(f"failed to load provider config: {exc}") from exc
+            if not config.providers:
+                raise ProviderReloadError("refusing to apply a configuration without providers")
+            try:
+                result = await self._registry.reload(config)
+            except Exception as exc:
+                raise ProviderReloadError(f"failed to build providers: {exc}") from exc
+            self._signature = signature
+            # Readers of the cached config (e.g. GET /providers) see the new file too.
+            get_llm_providers.cache_clear()
+            logger.info(
+                "Provider config reloaded - added: %s, updated: %s, removed: %s, unchanged: %s",
+                list(result.added),
+                list(result.updated),
+                list(result.removed),
+                list(result.unchanged),
+            )
+            return result
+
+    def start(self) -> None:
+        interval = self._settings.llm_config_watch_seconds
+        if interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._watch(interval))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _watch(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            signature = self._stat()
+            if signature is None or signature == self._signature:
+                continue
+            try:
+                await self.reload()
+            except ProviderReloadError as exc:
+                # Remember the broken revision so it is not retried every tick.
+                self._signature = signature
+                logger.error("Ignoring provider config change: %s", exc)
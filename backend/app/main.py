@@ -2,30 +2,68 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.core.cache import get_cache_backend, init_cache_backend
+from app.core.cache import InMemoryCacheBackend, get_cache_backend, init_cache_backend
 from app.core.config import get_llm_providers, get_settings
 from app.core.errors import register_exception_handlers
+from app.core.logging_config import configure_logging, shutdown_logging
+from app.core.rate_limit import RateLimiter
+from app.core.tracing import init_tracing, shutdown_tracing
 from app.llm.registry import ProviderRegistry
+from app.llm.reloader import ProviderConfigReloader
 from app.middleware import (
+    MetricsMiddleware,
     RequestIDMiddleware,
     StructuredLoggingMiddleware,
+    TracingMiddleware,
 )
-from app.routers import recipes
-from app.services import RecipeService
+from app.routers import admin, jobs, metrics, recipes
+from app.schemas.recipe import _get_compiled_recipe_check
+from app.services import (
+    CacheRevalidator,
+    DishSuggester,
+    JobQueue,
+    JobWorkerPool,
+    PopularityTracker,
+    RecipeIndex,
+    RecipeService,
+    StreamManager,
+)
+from app.services.cache_snapshot import SnapshotFormatError, import_snapshot_from_file
+from app.services.dish_suggester import preload_pinyin
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
 
+def _warm_caches() -> None:
+    """Slow one-off initialisation that does not have to block readiness."""
+    _get_compiled_recipe_check()
+    preload_pinyin()
+
+
+async def _warm_up(recipe_index: RecipeIndex) -> None:
+    started = time.perf_counter()
+    try:
+        # Imports and schema compilation release the GIL often enough that
+        # the loop keeps serving requests while this thread works.
+        await asyncio.to_thread(_warm_caches)
+        await recipe_index.refresh(force=True)
+    except Exception:  # pragma: no cover - defensive
+        logger.exception("Background warm-up failed")
+        return
+    logger.info("Background warm-up finished in %.1f ms", (time.perf_counter() - started) * 1000)
+
+
 def create_app() -> FastAPI:
     settings = get_settings()
-    logging.basicConfig(level=settings.log_level)
 
     app = FastAPI(
         title="AIRecipe API",
@@ -36,7 +74,9 @@ def create_app() -> FastAPI:
 
     register_exception_handlers(app)
 
+    app.add_middleware(MetricsMiddleware)
     app.add_middleware(StructuredLoggingMiddleware)
+    app.add_middleware(TracingMiddleware)
     app.add_middleware(RequestIDMiddleware)
     app.add_middleware(
         CORSMiddleware,
@@ -48,36 +88,139 @@ def create_app() -> FastAPI:
 
     @app.on_event("startup")
     async def startup_event() -> None:
+        # Started here rather than at import so preforked workers each get
+        # their own listener / exporter threads.
+        configure_logging(settings)
+        init_tracing(settings)
         logger.info("Starting AIRecipe application")
+        started = time.perf_counter()
         await init_cache_backend(settings)
         cache_backend = get_cache_backend()
+        snapshot = settings.cache_snapshot_path
+        if snapshot is not None and isinstance(cache_backend, InMemoryCacheBackend):
+            # Shared backends already survive restarts; reloading the snapshot
+            # there would overwrite newer entries on every worker start.
+            if snapshot.is_file():
+                try:
+                    await import_snapshot_from_file(cache_backend, snapshot)
+                except SnapshotFormatError:
+                    logger.exception("Ignoring unreadable cache snapshot %s", snapshot)
+            else:
+                logger.warning("CACHE_SNAPSHOT_PATH %s does not exist; starting empty", snapshot)
+        cache_ready = time.perf_counter()
 
         providers_config = get_llm_providers()
-        registry = ProviderRegistry(providers_config)
+        registry = ProviderRegistry(
+            providers_config, drain_timeout=settings.provider_drain_seconds
+        )
         await registry.startup()
+        provider_reloader = ProviderConfigReloader(registry, settings)
+        provider_reloader.start()
+        providers_ready = time.perf_counter()
+
+        recipe_index = RecipeIndex(
+            cache_backend,
+            refresh_interval=settings.recipe_index_refresh_seconds,
+        )
+        dish_suggester = DishSuggester()
+        recipe_index.subscribe(dish_suggester.add, dish_suggester.discard)
+        # Filling the suggester needs pypinyin; do it after the worker is ready.
+        app.state.warmup_task = asyncio.create_task(_warm_up(recipe_index))
 
         app.state.cache_backend = cache_backend
+        app.state.rate_limiter = RateLimiter.from_settings(cache_backend, settings)
         app.state.provider_registry = registry
+        app.state.provider_reloader = provider_reloader
+        stream_manager = StreamManager(
+            resume_window=settings.stream_resume_window_seconds
+        )
+        app.state.recipe_index = recipe_index
+        app.state.stream_manager = stream_manager
+        revalidator = CacheRevalidator(
+            cache_backend, per_minute=settings.revalidate_per_minute
+        )
+        revalidator.start()
+        app.state.revalidator = revalidator
+        popularity = PopularityTracker(
+            cache_backend,
+            flush_interval=settings.popularity_flush_seconds,
+            window_days=settings.popularity_window_days,
+        )
+        popularity.start()
+        app.state.popularity = popularity
         app.state.recipe_service = RecipeService(
             registry=registry,
             cache=cache_backend,
+            index=recipe_index,
+            suggester=dish_suggester,
+            streams=stream_manager,
+            revalidator=revalidator,
+            popularity=popularity,
+        )
+        job_queue = JobQueue(
+            cache_backend,
+            ttl=settings.job_ttl_seconds,
+            webhook_allowed_hosts=settings.job_webhook_allowed_hosts,
+        )
+        # JOB_WORKER_CONCURRENCY=0 leaves consumption to `python main.py --jobs-worker`.
+        job_workers = JobWorkerPool(
+            job_queue,
+            app.state.recipe_service,
+            concurrency=settings.job_worker_concurrency,
+            job_timeout=settings.job_timeout_seconds,
+            max_attempts=settings.job_max_attempts,
+        )
+        job_workers.start()
+        app.state.job_queue = job_queue
+        app.state.job_workers = job_workers
+        finished = time.perf_counter()
+        logger.info(
+            "Startup complete in %.1f ms (cache %.1f ms, providers %.1f ms)",
+            (finished - started) * 1000,
+            (cache_ready - started) * 1000,
+            (providers_ready - cache_ready) * 1000,
         )
 
     @app.on_event("shutdown")
     async def shutdown_event() -> None:
         logger.info("Shutting down AIRecipe application")
+        warmup_task = getattr(app.state, "warmup_task", None)
+        if warmup_task is not None and not warmup_task.done():
+            warmup_task.cancel()
+        provider_reloader = getattr(app.state, "provider_reloader", None)
+        if provider_reloader is not None:
+            await provider_reloader.stop()
+        job_workers = getattr(app.state, "job_workers", None)
+        if job_workers is not None:
+            await job_workers.stop()
+        revalidator = getattr(app.state, "revalidator", None)
+        if revalidator is not None:
+            await revalidator.stop()
+        popularity = getattr(app.state, "popularity", None)
+        if popularity is not None:
+            await popularity.stop()
+        # Streams still need their provider clients and the cache, so drain
+        # them before either is closed.
+        stream_manager = getattr(app.state, "stream_manager", None)
+        if stream_manager is not None:
+            await stream_manager.drain(settings.stream_drain_seconds)
         registry = getattr(app.state, "provider_registry", None)
         if registry is not None:
             await registry.shutdown()
         cache_backend = getattr(app.state, "cache_backend", None)
         if cache_backend is not None:
             await cache_backend.close()
+        shutdown_tracing()
+        shutdown_logging()
 
     @app.get("/", tags=["meta"])
     async def root() -> dict[str, str]:
         return {"message": "AIRecipe service is running."}
 
     app.include_router(recipes.router)
+    app.include_router(jobs.router)
+    app.include_router(metrics.router)
+    app.include_router(admin.router)
 
     return app
 
@@ -1,4 +1,11 @@
 """Application middleware exports."""
+from app.middleware.metrics import MetricsMiddleware
 from app.middleware.request_id import RequestIDMiddleware
 from app.middleware.structured_logging import StructuredLoggingMiddleware
-__all__ = ["RequestIDMiddleware", "StructuredLoggingMiddleware"]
+from app.middleware.tracing import TracingMiddleware
+__all__ = [
+    "MetricsMiddleware",
+    "RequestIDMiddleware",
+    "StructuredLoggingMiddleware",
+    "TracingMiddleware",
+]
@@ -0,0 +1,37 @@
+"""Record per-route request latency for the Prometheus endpoint."""
+
+from __future__ import annotations
+
+import time
+
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+
+from app.core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_PROGRESS
+
+
+def _route_template(request: Request) -> str:
+    """Use the matched route template so dish names don't explode cardinality."""
+    route = request.scope.get("route")
+    path = getattr(route, "path", None)
+    return path or "unmatched"
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """Observe request duration by method, route template and status code."""
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint):
+        start = time.perf_counter()
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            HTTP_REQUEST_DURATION.labels(
+                method=request.method,
+                route=_route_template(request),
+                status=str(status_code),
+            ).observe(time.perf_counter() - start)
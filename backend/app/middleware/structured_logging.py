@@ -41,5 +41,8 @@ class StructuredLoggingMiddleware(BaseHTTPMiddleware):
                 "request_id": getattr(request.state, "request_id", None),
             }
         )
+        # Successful requests are the bulk of traffic; sample them like other
+        # hot-path records while always keeping client and server errors.
+        context["hot_path"] = response.status_code < 400
         self._logger.info("request completed", extra=context)
         return response
@@ -0,0 +1,39 @@
+"""Open a server span per request and bind the request ID to it."""
+
+from __future__ import annotations
+
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+
+from app.core import tracing
+
+
+class TracingMiddleware(BaseHTTPMiddleware):
+    """Wrap each request in a span carrying ``X-Request-ID``.
+
+    Must run inside :class:`RequestIDMiddleware` so the identifier is already
+    on ``request.state``. Incoming W3C ``traceparent`` headers are honoured.
+    """
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint):
+        if not tracing.tracing_active():
+            return await call_next(request)
+
+        request_id = getattr(request.state, "request_id", None)
+        token = tracing.bind_request_id(request_id) if request_id else None
+        try:
+            with tracing.span(
+                f"{request.method} {request.url.path}",
+                {"http.method": request.method, "http.target": request.url.path},
+                carrier=dict(request.headers),
+            ) as active:
+                response = await call_next(request)
+                route = getattr(request.scope.get("route"), "path", None)
+                if route:
+                    active.update_name(f"{request.method} {route}")
+                    active.set_attribute("http.route", route)
+                active.set_attribute("http.status_code", response.status_code)
+                return response
+        finally:
+            if token is not None:
+                tracing.reset_request_id(token)
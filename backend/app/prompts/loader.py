@@ -6,6 +6,7 @@ import asyncio
 from pathlib import Path
 
 from app.core.cache import get_cache_backend
+from app.core.tracing import span
 
 _PROMPT_LOCK = asyncio.Lock()
 _LOCAL_CACHE: dict[str, str] = {}
@@ -13,11 +14,17 @@ _LOCAL_CACHE: dict[str, str] = {}
 
 async def load_prompt(path: str | Path) -> str:
     """Load a prompt file and cache the result."""
-    target = Path(path)
+    with span("load_prompt", {"airecipe.prompt_path": str(path)}):
+        return await _load_prompt(Path(path))
+
+
+async def _load_prompt(target: Path) -> str:
     if not target.exists():
         raise FileNotFoundError(f"prompt file not found: {target}")
 
-    cache_key = f"prompt:{target.resolve()}"
+    # The mtime is part of the key so an edited prompt takes effect on restart
+    # instead of being shadowed by the copy in a persistent shared cache.
+    cache_key = f"prompt:{target.resolve()}:{target.stat().st_mtime_ns}"
     try:
         backend = get_cache_backend()
     except RuntimeError:
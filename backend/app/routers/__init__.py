@@ -1,6 +1,8 @@
 """API routers package."""
 
+from app.routers.admin import router as admin_router
+from app.routers.jobs import router as jobs_router
+from app.routers.metrics import router as metrics_router
 from app.routers.recipes import router as recipes_router
 
-__all__ = ["recipes_router"]
-
+__all__ = ["admin_router", "jobs_router", "metrics_router", "recipes_router"]
@@ -0,0 +1,143 @@
+"""Operational endpoints guarded by ``ADMIN_API_KEYS``."""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+
+from app.core.cache import CacheBackend
+from app.core.config import get_settings
+from app.llm.reloader import ProviderConfigReloader, ProviderReloadError
+from app.schemas.admin import CacheImportResponse, ProviderReloadResponse, StreamDrainResponse
+from app.services import StreamManager
+from app.services.cache_snapshot import SnapshotFormatError, export_snapshot, import_snapshot
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
+
+
+async def verify_admin_key(
+    api_key: Annotated[str | None, Header(alias="X-Admin-Key")] = None
+) -> None:
+    settings = get_settings()
+    if not settings.admin_api_keys:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin API is disabled"
+        )
+    if api_key is None or api_key not in settings.admin_api_keys:
+        logger.warning("Invalid admin key attempt")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid admin key"
+        )
+
+
+async def get_provider_reloader(request: Request) -> ProviderConfigReloader:
+    try:
+        return request.app.state.provider_reloader
+    except AttributeError as exc:  # pragma: no cover - defensive branch
+        raise RuntimeError("provider reloader not initialised") from exc
+
+
+async def get_stream_manager(request: Request) -> StreamManager:
+    try:
+        return request.app.state.stream_manager
+    except AttributeError as exc:  # pragma: no cover - defensive branch
+        raise RuntimeError("stream manager not initialised") from exc
+
+
+async def get_cache(request: Request) -> CacheBackend:
+    try:
+        return request.app.state.cache_backend
+    except AttributeError as exc:  # pragma: no cover - defensive branch
+        raise RuntimeError("cache backend not initialised") from exc
+
+
+@router.post(
+    "/providers/reload",
+    response_model=ProviderReloadResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def reload_providers(
+    _: None = Depends(verify_admin_key),
+    reloader: ProviderConfigReloader = Depends(get_provider_reloader),
+) -> ProviderReloadResponse:
+    try:
+        result = await reloader.reload()
+    except ProviderReloadError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+        ) from exc
+    return ProviderReloadResponse(
+        default_provider=reloader.registry.config.default_provider,
+        added=list(result.added),
+        updated=list(result.updated),
+        removed=list(result.removed),
+        unchanged=list(result.unchanged),
+    )
+
+
+@router.post(
+    "/streams/drain",
+    response_model=StreamDrainResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def drain_streams(
+    _: None = Depends(verify_admin_key),
+    streams: StreamManager = Depends(get_stream_manager),
+) -> StreamDrainResponse:
+    """Stop accepting new streams on this worker (e.g. from a pre-stop hook).
+
+    Running streams continue; the worker keeps serving everything else until
+    it is terminated, at which point shutdown waits for the remaining streams.
+    """
+    streams.begin_drain()
+    return StreamDrainResponse(draining=True, active_streams=streams.active_count)
+
+
+@router.get("/cache/export", status_code=status.HTTP_200_OK)
+async def export_cache(
+    _: None = Depends(verify_admin_key),
+    cache: CacheBackend = Depends(get_cache),
+) -> StreamingResponse:
+    """Stream every cached recipe as a gzip-compressed NDJSON snapshot."""
+    filename = f"airecipe-cache-{time.strftime('%Y%m%d-%H%M%S')}.ndjson.gz"
+    return StreamingResponse(
+        export_snapshot(cache),
+        media_type="application/gzip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post(
+    "/cache/import",
+    response_model=CacheImportResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def import_cache(
+    request: Request,
+    _: None = Depends(verify_admin_key),
+    cache: CacheBackend = Depends(get_cache),
+) -> CacheImportResponse:
+    """Restore a snapshot sent as the raw request body.
+
+    Entries are written in batches as the body arrives; existing keys are
+    overwritten. Other workers pick up the index within
+    ``RECIPE_INDEX_REFRESH_SECONDS``.
+    """
+    try:
+        result = await import_snapshot(cache, request.stream())
+    except SnapshotFormatError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+        ) from exc
+    return CacheImportResponse(
+        imported=result.imported,
+        index_entries=result.index_entries,
+        expired=result.expired,
+        skipped=result.skipped,
+    )
@@ -0,0 +1,102 @@
+"""Asynchronous recipe generation job routes."""
+
+from __future__ import annotations
+
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+
+from app.core.rate_limit import RateLimiter
+from app.routers.recipes import (
+    enforce_request_budget,
+    get_rate_limiter,
+    get_recipe_service,
+)
+from app.schemas.job import RecipeJobRequest, RecipeJobResponse
+from app.schemas.recipe import RecipeGenerationRequest, RecipeGenerationResponse
+from app.services.job_queue import (
+    JobNotFoundError,
+    JobQueue,
+    RecipeJob,
+    WebhookNotAllowedError,
+)
+from app.services.recipe_service import RecipeService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/jobs", tags=["jobs"])
+
+
+async def get_job_queue(request: Request) -> JobQueue:
+    try:
+        return request.app.state.job_queue
+    except AttributeError as exc:  # pragma: no cover - defensive branch
+        raise RuntimeError("job queue not initialised") from exc
+
+
+def _to_response(job: RecipeJob) -> RecipeJobResponse:
+    return RecipeJobResponse(
+        job_id=job.job_id,
+        status=job.status,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+        attempts=job.attempts,
+        result=(
+            RecipeGenerationResponse.model_validate(job.result)
+            if job.result is not None
+            else None
+        ),
+        error=job.error,
+    )
+
+
+@router.post(
+    "",
+    response_model=RecipeJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def submit_job(
+    payload: RecipeJobRequest,
+    response: Response,
+    caller: str = Depends(enforce_request_budget),
+    queue: JobQueue = Depends(get_job_queue),
+    service: RecipeService = Depends(get_recipe_service),
+    limiter: RateLimiter | None = Depends(get_rate_limiter),
+) -> RecipeJobResponse:
+    """Queue a recipe generation and return immediately.
+
+    Poll ``GET /api/v1/jobs/{job_id}`` (also sent as ``Location``) or pass
+    ``webhook_url`` to be notified once the recipe is validated and cached.
+    Submissions for dishes that are not cached yet are charged to the
+    caller's ``miss`` budget.
+    """
+    request = RecipeGenerationRequest(**payload.model_dump(exclude={"webhook_url"}))
+    if limiter is not None:
+        plan = await service.plan_stream(request)
+        if not plan.cache_hit:
+            await limiter.check(caller, "miss")
+    try:
+        job = await queue.submit(request, webhook_url=payload.webhook_url)
+    except WebhookNotAllowedError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+    response.headers["Location"] = f"{router.prefix}/{job.job_id}"
+    return _to_response(job)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=RecipeJobResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_job(
+    job_id: str,
+    _: str = Depends(enforce_request_budget),
+    queue: JobQueue = Depends(get_job_queue),
+) -> RecipeJobResponse:
+    try:
+        job = await queue.get(job_id)
+    except JobNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    return _to_response(job)
@@ -0,0 +1,15 @@
+"""Prometheus scrape endpoint."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Response
+
+from app.core.metrics import render_latest
+
+router = APIRouter(tags=["meta"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    payload, content_type = render_latest()
+    return Response(content=payload, media_type=content_type)
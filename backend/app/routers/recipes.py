@@ -3,26 +3,41 @@
 from __future__ import annotations
 
 import logging
+from datetime import datetime, timezone
 from typing import Annotated, AsyncIterator
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
 from fastapi.responses import StreamingResponse
 
 from app.core.config import get_llm_providers, get_settings
+from app.core.metrics import SSE_STREAMS_IN_FLIGHT
+from app.core.rate_limit import RateLimiter
+from app.core.tracing import span
 from app.schemas.recipe import (
+    DishSuggestionItem,
+    DishSuggestionsResponse,
+    PopularDishesResponse,
+    PopularDishItem,
+    RecipeBatchItem,
+    RecipeBatchRequest,
+    RecipeBatchResponse,
     RecipeCacheRequest,
     RecipeGenerationRequest,
     RecipeGenerationResponse,
+    RecipeIndexItem,
+    RecipeIndexResponse,
     RecipeProviderInfo,
     RecipeProvidersResponse,
     RequireApiKeyResponse,
 )
 from app.services import (
     RecipeCacheMissError,
+    RecipeRecentlyFailedError,
     RecipeService,
     RecipeServiceError,
     RecipeValidationError,
 )
+from app.services.popularity import bind_caller
 
 logger = logging.getLogger(__name__)
 
@@ -41,17 +56,60 @@ async def verify_api_key(
 ) -> None:
     settings = get_settings()
 
-    # 检查是否需要 API Key 验证
-    if not settings.require_api_key:
-        logger.info("API Key 验证已禁用（REQUIRE_API_KEY=false）")
-        return
+    with span("verify_api_key", {"airecipe.require_api_key": settings.require_api_key}):
+        # 检查是否需要 API Key 验证
+        if not settings.require_api_key:
+            logger.debug("API Key 验证已禁用（REQUIRE_API_KEY=false）")
+            return
 
-    # 验证 API Key
-    if api_key is None or api_key not in settings.api_keys:
-        logger.warning("Invalid API key attempt")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key"
-        )
+        # 验证 API Key
+        if api_key is None or api_key not in settings.api_keys:
+            logger.warning("Invalid API key attempt")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key"
+            )
+
+
+async def get_rate_limiter(request: Request) -> RateLimiter | None:
+    return getattr(request.app.state, "rate_limiter", None)
+
+
+def client_address(request: Request, trusted_proxies: tuple[str, ...]) -> str:
+    """The caller's address, looking through ``X-Forwarded-For`` set by trusted proxies.
+
+    The header is read right to left and the first hop that is not a trusted
+    proxy wins, so a client cannot pick its identity by sending the header.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if peer not in trusted_proxies:
+        return peer
+    forwarded = request.headers.get("x-forwarded-for", "")
+    for hop in reversed([part.strip() for part in forwarded.split(",") if part.strip()]):
+        if hop not in trusted_proxies:
+            return hop
+    return peer
+
+
+async def enforce_request_budget(
+    request: Request,
+    api_key: Annotated[str | None, Header(alias="X-API-Key")] = None,
+    _: None = Depends(verify_api_key),
+    limiter: RateLimiter | None = Depends(get_rate_limiter),
+) -> str:
+    """Charge the caller's ``hit`` budget and return its rate-limit identity.
+
+    Callers are identified by API key when keys are enforced, otherwise by
+    client address (unverified keys would make the limit trivial to dodge).
+    """
+    settings = get_settings()
+    if settings.require_api_key and api_key:
+        caller = f"key:{api_key}"
+    else:
+        caller = f"ip:{client_address(request, settings.trusted_proxies)}"
+    if limiter is not None:
+        await limiter.check(caller, "hit")
+    bind_caller(caller)
+    return caller
 
 
 @router.post(
@@ -61,7 +119,7 @@ async def verify_api_key(
 )
 async def generate_recipe(
     payload: RecipeGenerationRequest,
-    _: None = Depends(verify_api_key),
+    _: str = Depends(enforce_request_budget),
     service: RecipeService = Depends(get_recipe_service),
 ) -> RecipeGenerationResponse:
     try:
@@ -80,7 +138,7 @@ async def generate_recipe(
 )
 async def cache_recipe_result(
     payload: RecipeCacheRequest,
-    _: None = Depends(verify_api_key),
+    _: str = Depends(enforce_request_budget),
     service: RecipeService = Depends(get_recipe_service),
 ) -> RecipeGenerationResponse:
     try:
@@ -105,21 +163,61 @@ async def cache_recipe_result(
 )
 async def generate_recipe_stream(
     payload: RecipeGenerationRequest,
-    _: None = Depends(verify_api_key),
+    caller: str = Depends(enforce_request_budget),
     service: RecipeService = Depends(get_recipe_service),
+    limiter: RateLimiter | None = Depends(get_rate_limiter),
+    last_event_id: Annotated[str | None, Header(alias="Last-Event-ID")] = None,
 ) -> StreamingResponse:
     """Generate recipe with streaming output via SSE.
 
     Returns Server-Sent Events (SSE) stream with recipe content.
     Each event contains a chunk of the generated recipe JSON.
     The stream ends with a 'data: [DONE]' message.
+
+    Generated chunks carry an ``id:`` field. Re-posting the same request with
+    ``Last-Event-ID`` resumes the buffered generation after that event;
+    ``X-Stream-Resumed: false`` means it had expired and a fresh stream
+    follows, so the client must discard what it received before.
+
+    A dish whose recent generations failed (invalid JSON, schema errors,
+    provider 4xx) is answered with 422 ``generation_failed_recently`` and a
+    ``Retry-After`` header until its negative cache entry expires.
+
+    A cache miss is also charged to the caller's ``miss`` budget and answered
+    with 429 before any upstream call when that budget is spent.
     """
+    resume = service.find_resume_point(payload, last_event_id)
+    if resume is None and not service.accepting_streams:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is shutting down; retry on another instance",
+            headers={"Retry-After": "5"},
+        )
+
+    plan = None
+    if resume is None:
+        try:
+            plan = await service.plan_stream(payload)
+        except RecipeRecentlyFailedError:
+            raise
+        except RecipeServiceError:
+            # Reported as an error event by the stream itself, as before.
+            plan = None
+        if plan is not None and not plan.cache_hit and limiter is not None:
+            await limiter.check(caller, "miss")
+
     async def event_generator() -> AsyncIterator[str]:
         """Generate SSE-formatted events from the recipe stream."""
+        SSE_STREAMS_IN_FLIGHT.inc()
         try:
-            async for chunk in service.generate_recipe_stream(payload):
-                # SSE format: data: {content}\n\n
-                yield f"data: {chunk}\n\n"
+            async for event_id, chunk in service.stream_recipe_events(
+                payload, resume=resume, plan=plan
+            ):
+                # SSE format: [id: <stream>-<seq>\n]data: {content}\n\n
+                if event_id is None:
+                    yield f"data: {chunk}\n\n"
+                else:
+                    yield f"id: {event_id}\ndata: {chunk}\n\n"
             # Send completion signal
             yield "data: [DONE]\n\n"
         except Exception as exc:
@@ -127,25 +225,73 @@ async def generate_recipe_stream(
             # Send error event
             error_msg = str(exc)
             yield f"data: {{\"error\": \"{error_msg}\"}}\n\n"
+        finally:
+            SSE_STREAMS_IN_FLIGHT.dec()
 
+    headers = {
+        "Cache-Control": "no-cache",
+        "Connection": "keep-alive",
+        "X-Accel-Buffering": "no",  # Disable proxy buffering
+    }
+    if last_event_id:
+        headers["X-Stream-Resumed"] = "true" if resume is not None else "false"
     return StreamingResponse(
         event_generator(),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",  # Disable proxy buffering
-        },
+        headers=headers,
     )
 
 
+@router.post(
+    "/generate/batch",
+    response_model=RecipeBatchResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def generate_recipe_batch(
+    payload: RecipeBatchRequest,
+    caller: str = Depends(enforce_request_budget),
+    service: RecipeService = Depends(get_recipe_service),
+    limiter: RateLimiter | None = Depends(get_rate_limiter),
+) -> RecipeBatchResponse:
+    """批量获取菜谱：命中缓存的直接返回，其余每 BATCH_GENERATION_SIZE 道菜合并为一次上游请求生成。
+
+    每道未命中的菜计入一次 ``miss`` 额度，整批一次性扣除：额度不足时整批返回 429，不扣任何额度；
+    单道菜失败不影响其他菜，失败原因见 ``error``。
+    """
+    plan = await service.plan_batch(payload)
+    if limiter is not None:
+        await limiter.check(caller, "miss", cost=plan.miss_count)
+    outcomes = await service.run_batch(plan)
+    items = []
+    for outcome in outcomes:
+        if outcome.response is not None:
+            items.append(
+                RecipeBatchItem(
+                    dish_name=outcome.dish_name,
+                    provider=outcome.response.provider,
+                    status="cached" if outcome.response.cached else "generated",
+                    recipe=outcome.response.recipe,
+                )
+            )
+        else:
+            items.append(
+                RecipeBatchItem(
+                    dish_name=outcome.dish_name,
+                    provider=outcome.provider,
+                    status="failed",
+                    error=str(outcome.error) if outcome.error else "not generated",
+                )
+            )
+    return RecipeBatchResponse(items=items)
+
+
 @router.get(
     "/providers",
     response_model=RecipeProvidersResponse,
     status_code=status.HTTP_200_OK,
 )
 async def list_recipe_providers(
-    _: None = Depends(verify_api_key),
+    _: str = Depends(enforce_request_budget),
 ) -> RecipeProvidersResponse:
     config = get_llm_providers()
     providers = [
@@ -164,6 +310,98 @@ async def list_recipe_providers(
     )
 
 
+@router.get(
+    "/meta/cached",
+    response_model=RecipeIndexResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def list_cached_recipes(
+    prefix: Annotated[str | None, Query(max_length=64)] = None,
+    tag: Annotated[str | None, Query(max_length=64)] = None,
+    provider: Annotated[str | None, Query(max_length=64)] = None,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    _: str = Depends(enforce_request_budget),
+    service: RecipeService = Depends(get_recipe_service),
+) -> RecipeIndexResponse:
+    """分页浏览已缓存的菜谱，支持菜名前缀、标签与提供商过滤。"""
+    page = await service.search_cached_recipes(
+        prefix=prefix,
+        tag=tag,
+        provider=provider,
+        offset=offset,
+        limit=limit,
+    )
+    return RecipeIndexResponse(
+        total=page.total,
+        offset=page.offset,
+        limit=page.limit,
+        items=[
+            RecipeIndexItem(
+                dish_name=entry.dish_name,
+                provider=entry.provider,
+                title=entry.title,
+                tags=list(entry.tags),
+                difficulty=entry.difficulty,
+                created_at=datetime.fromtimestamp(entry.created_at, tz=timezone.utc),
+                updated_at=datetime.fromtimestamp(entry.updated_at, tz=timezone.utc),
+            )
+            for entry in page.entries
+        ],
+    )
+
+
+@router.get(
+    "/meta/suggest",
+    response_model=DishSuggestionsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def suggest_dishes(
+    q: Annotated[str, Query(min_length=1, max_length=64)],
+    limit: Annotated[int, Query(ge=1, le=20)] = 10,
+    _: None = Depends(verify_api_key),
+    service: RecipeService = Depends(get_recipe_service),
+) -> DishSuggestionsResponse:
+    """根据输入前缀（菜名、拼音或拼音首字母）推荐已缓存的菜名。
+
+    前端每次按键都会调用，因此不计入 ``hit`` 额度。
+    """
+    suggestions = await service.suggest_dishes(q, limit=limit)
+    return DishSuggestionsResponse(
+        query=q,
+        suggestions=[
+            DishSuggestionItem(dish_name=item.dish_name, providers=list(item.providers))
+            for item in suggestions
+        ],
+    )
+
+
+@router.get(
+    "/meta/popular",
+    response_model=PopularDishesResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def list_popular_dishes(
+    provider: Annotated[str | None, Query(max_length=64)] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    _: str = Depends(enforce_request_budget),
+    service: RecipeService = Depends(get_recipe_service),
+) -> PopularDishesResponse:
+    """近期请求最多的菜名（近似统计，各 worker 每隔 POPULARITY_FLUSH_SECONDS 汇总一次）。"""
+    dishes = await service.popular_dishes(limit=limit, provider=provider)
+    return PopularDishesResponse(
+        items=[
+            PopularDishItem(
+                dish_name=item.dish_name,
+                provider=item.provider,
+                requests=item.requests,
+                unique_users=item.unique_users,
+            )
+            for item in dishes
+        ]
+    )
+
+
 @router.get(
     "/config/require-api-key",
     response_model=RequireApiKeyResponse,
@@ -175,7 +413,7 @@ async def get_require_api_key_config() -> RequireApiKeyResponse:
     此端点不需要 API Key 验证，用于前端查询是否需要输入 API Key。
     """
     settings = get_settings()
-    logger.info(f"配置查询: require_api_key={settings.require_api_key}")
+    logger.debug("配置查询: require_api_key=%s", settings.require_api_key)
     return RequireApiKeyResponse(requireApiKey=settings.require_api_key)
 
 
@@ -187,7 +425,7 @@ async def get_require_api_key_config() -> RequireApiKeyResponse:
 async def get_recipe_by_name(
     dish_name: str,
     provider: str | None = None,
-    _: None = Depends(verify_api_key),
+    _: str = Depends(enforce_request_budget),
     service: RecipeService = Depends(get_recipe_service),
 ) -> RecipeGenerationResponse:
     """根据菜名从缓存中获取菜谱。
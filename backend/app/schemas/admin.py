@@ -0,0 +1,33 @@
+"""Request/response models for the admin API."""
+
+from __future__ import annotations
+
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class ProviderReloadResponse(BaseModel):
+    """Result of reloading the provider configuration."""
+
+    default_provider: str
+    added: List[str] = Field(default_factory=list)
+    updated: List[str] = Field(default_factory=list)
+    removed: List[str] = Field(default_factory=list)
+    unchanged: List[str] = Field(default_factory=list)
+
+
+class CacheImportResponse(BaseModel):
+    """Counts of a cache snapshot import."""
+
+    imported: int
+    index_entries: int
+    expired: int
+    skipped: int
+
+
+class StreamDrainResponse(BaseModel):
+    """State of this worker after entering drain mode."""
+
+    draining: bool
+    active_streams: int
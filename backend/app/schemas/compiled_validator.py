@@ -0,0 +1,280 @@
+"""Ahead-of-time compiled JSON schema checks for hot validation paths.
+
+``jsonschema`` interprets the schema on every call and collects *all* errors
+even though callers only report the first one. This module compiles the
+subset of Draft 7 used by ``schemas/recipe_output.json`` into nested closures
+once and stops at the first failure.
+
+The error it returns is the one ``sorted(iter_errors(...), key=path)[0]``
+would produce: a node's own keywords are checked in schema order before any
+child, and children are visited in sorted key (or index) order. Messages
+mirror jsonschema's wording. Schemas using any other assertion keyword raise
+:class:`UnsupportedSchemaError` so callers can fall back to jsonschema.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Sequence
+
+Path = tuple[str | int, ...]
+SchemaError = tuple[Path, str]
+Check = Callable[[Any], "SchemaError | None"]
+OwnCheck = Callable[[Any], "str | None"]
+
+# Keywords that carry no assertion under Draft 7 without a format checker.
+_ANNOTATIONS = frozenset(
+    {
+        "$schema",
+        "$id",
+        "$comment",
+        "title",
+        "description",
+        "default",
+        "examples",
+        "format",
+        "readOnly",
+        "writeOnly",
+    }
+)
+
+
+class UnsupportedSchemaError(ValueError):
+    """Raised when a schema uses keywords the compiler does not handle."""
+
+
+def _is_integer(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return True
+    return isinstance(value, float) and value.is_integer()
+
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "integer": _is_integer,
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+}
+
+
+def _json_equal(one: Any, two: Any) -> bool:
+    """Equality that, like jsonschema, keeps ``True`` distinct from ``1``."""
+    if isinstance(one, bool) or isinstance(two, bool):
+        return isinstance(one, bool) and isinstance(two, bool) and one == two
+    if isinstance(one, list) and isinstance(two, list):
+        return len(one) == len(two) and all(map(_json_equal, one, two))
+    if isinstance(one, dict) and isinstance(two, dict):
+        return one.keys() == two.keys() and all(
+            _json_equal(one[key], two[key]) for key in one
+        )
+    return one == two
+
+
+def _type_check(types: str | Sequence[str]) -> OwnCheck:
+    names = [types] if isinstance(types, str) else list(types)
+    try:
+        checks = [_TYPE_CHECKS[name] for name in names]
+    except KeyError as exc:
+        raise UnsupportedSchemaError(f"unknown type {exc.args[0]!r}") from exc
+    reprs = ", ".join(repr(name) for name in names)
+
+    def check(instance: Any) -> str | None:
+        for matches in checks:
+            if matches(instance):
+                return None
+        return f"{instance!r} is not of type {reprs}"
+
+    return check
+
+
+def _required_check(required: Sequence[str]) -> OwnCheck:
+    names = tuple(required)
+
+    def check(instance: Any) -> str | None:
+        if not isinstance(instance, dict):
+            return None
+        for name in names:
+            if name not in instance:
+                return f"{name!r} is a required property"
+        return None
+
+    return check
+
+
+def _min_length_check(limit: int) -> OwnCheck:
+    message = "should be non-empty" if limit == 1 else "is too short"
+
+    def check(instance: Any) -> str | None:
+        if isinstance(instance, str) and len(instance) < limit:
+            return f"{instance!r} {message}"
+        return None
+
+    return check
+
+
+def _max_length_check(limit: int) -> OwnCheck:
+    message = "is expected to be empty" if limit == 0 else "is too long"
+
+    def check(instance: Any) -> str | None:
+        if isinstance(instance, str) and len(instance) > limit:
+            return f"{instance!r} {message}"
+        return None
+
+    return check
+
+
+def _min_items_check(limit: int) -> OwnCheck:
+    message = "should be non-empty" if limit == 1 else "is too short"
+
+    def check(instance: Any) -> str | None:
+        if isinstance(instance, list) and len(instance) < limit:
+            return f"{instance!r} {message}"
+        return None
+
+    return check
+
+
+def _max_items_check(limit: int) -> OwnCheck:
+    message = "is expected to be empty" if limit == 0 else "is too long"
+
+    def check(instance: Any) -> str | None:
+        if isinstance(instance, list) and len(instance) > limit:
+            return f"{instance!r} {message}"
+        return None
+
+    return check
+
+
+def _enum_check(options: Sequence[Any]) -> OwnCheck:
+    values = list(options)
+
+    def check(instance: Any) -> str | None:
+        for option in values:
+            if _json_equal(option, instance):
+                return None
+        return f"{instance!r} is not one of {values!r}"
+
+    return check
+
+
+def _no_additional_check(known: frozenset[str]) -> OwnCheck:
+    def check(instance: Any) -> str | None:
+        if not isinstance(instance, dict):
+            return None
+        extras = sorted((key for key in instance if key not in known), key=str)
+        if not extras:
+            return None
+        verb = "was" if len(extras) == 1 else "were"
+        joined = ", ".join(repr(extra) for extra in extras)
+        return f"Additional properties are not allowed ({joined} {verb} unexpected)"
+
+    return check
+
+
+def _always_valid(_: Any) -> SchemaError | None:
+    return None
+
+
+def compile_schema(schema: Dict[str, Any] | bool) -> Check:
+    """Compile a (sub)schema into a callable returning the first error."""
+    if schema is True or schema == {}:
+        return _always_valid
+    if schema is False:
+        return lambda instance: ((), f"False schema does not allow {instance!r}")
+    if not isinstance(schema, dict):
+        raise UnsupportedSchemaError(f"invalid schema: {schema!r}")
+
+    own: list[OwnCheck] = []
+    properties: Dict[str, Check] = {}
+    additional: Check | None = None
+    items: Check | None = None
+
+    for keyword, value in schema.items():
+        if keyword in _ANNOTATIONS:
+            continue
+        if keyword == "type":
+            own.append(_type_check(value))
+        elif keyword == "required":
+            own.append(_required_check(value))
+        elif keyword == "minLength":
+            own.append(_min_length_check(value))
+        elif keyword == "maxLength":
+            own.append(_max_length_check(value))
+        elif keyword == "minItems":
+            own.append(_min_items_check(value))
+        elif keyword == "maxItems":
+            own.append(_max_items_check(value))
+        elif keyword == "enum":
+            own.append(_enum_check(value))
+        elif keyword == "properties":
+            properties = {name: compile_schema(sub) for name, sub in value.items()}
+        elif keyword == "additionalProperties":
+            if value is False:
+                own.append(_no_additional_check(frozenset(schema.get("properties", {}))))
+            elif value is not True:
+                compiled = compile_schema(value)
+                if compiled is not _always_valid:
+                    additional = compiled
+        elif keyword == "items":
+            if not isinstance(value, dict):
+                raise UnsupportedSchemaError("only single-schema 'items' is supported")
+            compiled = compile_schema(value)
+            if compiled is not _always_valid:
+                items = compiled
+        else:
+            raise UnsupportedSchemaError(f"unsupported keyword {keyword!r}")
+
+    declared = frozenset(properties)
+    properties = {
+        name: check for name, check in properties.items() if check is not _always_valid
+    }
+    own_checks = tuple(own)
+    property_order = tuple(sorted(properties.items()))
+    # Only consulted when ``additional`` is set; typed non-optional for the closure.
+    fallback: Check = additional or _always_valid
+
+    def check(instance: Any) -> SchemaError | None:
+        for own_check in own_checks:
+            message = own_check(instance)
+            if message is not None:
+                return (), message
+
+        if isinstance(instance, dict):
+            if additional is None:
+                for name, child in property_order:
+                    if name in instance:
+                        error = child(instance[name])
+                        if error is not None:
+                            return (name, *error[0]), error[1]
+            else:
+                for name in sorted(instance):
+                    if name in properties:
+                        child = properties[name]
+                    elif name in declared:
+                        continue
+                    else:
+                        child = fallback
+                    error = child(instance[name])
+                    if error is not None:
+                        return (name, *error[0]), error[1]
+        elif items is not None and isinstance(instance, list):
+            for index, value in enumerate(instance):
+                error = items(value)
+                if error is not None:
+                    return (index, *error[0]), error[1]
+        return None
+
+    if not own_checks and not property_order and additional is None and items is None:
+        return _always_valid
+    return check
+
+
+def format_error(error: SchemaError) -> str:
+    """Render an error as ``dotted.path: message`` (``root`` for the top level)."""
+    path, message = error
+    dotted = ".".join(str(item) for item in path)
+    return f"{dotted or 'root'}: {message}"
@@ -0,0 +1,31 @@
+"""Request/response models for asynchronous generation jobs."""
+
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from app.schemas.recipe import RecipeGenerationRequest, RecipeGenerationResponse
+
+
+class RecipeJobRequest(RecipeGenerationRequest):
+    """A generation request plus an optional completion webhook."""
+
+    webhook_url: str | None = Field(
+        default=None,
+        max_length=2048,
+        description="完成后 POST 任务结果的地址（主机需在 JOB_WEBHOOK_ALLOWED_HOSTS 中）",
+    )
+
+
+class RecipeJobResponse(BaseModel):
+    """Current state of a generation job."""
+
+    job_id: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    created_at: float
+    updated_at: float
+    attempts: int = 0
+    result: RecipeGenerationResponse | None = None
+    error: str | None = None
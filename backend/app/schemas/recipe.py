@@ -3,21 +3,38 @@
 from __future__ import annotations
 
 import json
+import logging
+from datetime import datetime
 from functools import lru_cache
-from typing import Any, Dict, Literal
+from typing import Annotated, Any, Dict, Literal
 
-from jsonschema import Draft7Validator
-from jsonschema.exceptions import ValidationError
 from pydantic import BaseModel, Field
 
 from app.core.config import get_settings
+from app.schemas.compiled_validator import (
+    Check,
+    UnsupportedSchemaError,
+    compile_schema,
+    format_error,
+)
+from app.schemas.token_budget import estimate_output_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class RecipeSchemaError(ValueError):
+    """Raised when a recipe payload does not match the output schema.
+
+    A local type rather than ``jsonschema``'s ``ValidationError`` so the
+    precompiled fast path never has to import ``jsonschema``.
+    """
 
 
 class RecipeGenerationRequest(BaseModel):
     """Incoming payload for generating a recipe."""
 
     dish_name: str = Field(..., min_length=1, max_length=64)
-    servings: int = Field(2, ge=1, le=12)
+    servings: int = Field(default=2, ge=1, le=12)
     dietary_preferences: list[str] = Field(default_factory=list)
     ingredients: list[str] = Field(default_factory=list)
     language: str = Field(default="zh")
@@ -25,11 +42,35 @@ class RecipeGenerationRequest(BaseModel):
     provider: str | None = Field(
         default=None, min_length=1, max_length=64, description="指定使用的模型提供商"
     )
-    routing_strategy: Literal["default", "weighted"] | None = Field(
+    routing_strategy: Literal["default", "weighted", "consistent_hash"] | None = Field(
         default=None, description="覆盖默认的模型路由策略"
     )
 
 
+class RecipeBatchRequest(BaseModel):
+    """Several dishes generated with the same options."""
+
+    dish_names: list[Annotated[str, Field(min_length=1, max_length=64)]] = Field(
+        ..., min_length=1, max_length=20, description="菜名列表（重复项只生成一次）"
+    )
+    servings: int = Field(default=2, ge=1, le=12)
+    dietary_preferences: list[str] = Field(default_factory=list)
+    ingredients: list[str] = Field(default_factory=list)
+    language: str = Field(default="zh")
+    extra_instructions: str | None = Field(default=None, max_length=500)
+    provider: str | None = Field(
+        default=None, min_length=1, max_length=64, description="指定使用的模型提供商"
+    )
+    routing_strategy: Literal["default", "weighted", "consistent_hash"] | None = Field(
+        default=None, description="覆盖默认的模型路由策略"
+    )
+
+    def item(self, dish_name: str) -> RecipeGenerationRequest:
+        return RecipeGenerationRequest(
+            dish_name=dish_name, **self.model_dump(exclude={"dish_names"})
+        )
+
+
 class RecipeGenerationResponse(BaseModel):
     """API response after generating a recipe."""
 
@@ -37,6 +78,26 @@ class RecipeGenerationResponse(BaseModel):
     provider: str
     recipe: Dict[str, Any]
     cached: bool = Field(default=False, description="Whether the recipe was served from cache")
+    fallback_from: str | None = Field(
+        default=None,
+        description="路由选中的提供商；缓存回退命中其他提供商的菜谱时设置，此时 provider 为菜谱来源",
+    )
+
+
+class RecipeBatchItem(BaseModel):
+    """Outcome for one dish of a batch request."""
+
+    dish_name: str
+    provider: str
+    status: Literal["cached", "generated", "failed"]
+    recipe: Dict[str, Any] | None = None
+    error: str | None = None
+
+
+class RecipeBatchResponse(BaseModel):
+    """Per-dish outcomes of a batch request, in request order."""
+
+    items: list[RecipeBatchItem] = Field(default_factory=list)
 
 
 class RecipeCacheRequest(BaseModel):
@@ -65,6 +126,56 @@ class RecipeProvidersResponse(BaseModel):
     )
 
 
+class RecipeIndexItem(BaseModel):
+    """Summary of a cached recipe taken from the secondary index."""
+
+    dish_name: str = Field(..., description="请求中的菜名")
+    provider: str = Field(..., description="生成该菜谱的模型提供商")
+    title: str | None = Field(None, description="菜谱中的菜名字段")
+    tags: list[str] = Field(default_factory=list, description="菜谱标签")
+    difficulty: str | None = Field(None, description="难度")
+    created_at: datetime = Field(..., description="首次缓存时间")
+    updated_at: datetime = Field(..., description="最近一次写入时间")
+
+
+class RecipeIndexResponse(BaseModel):
+    """Paginated listing of cached recipes."""
+
+    total: int = Field(..., description="Number of matching recipes")
+    offset: int = Field(..., description="Offset of the first returned item")
+    limit: int = Field(..., description="Maximum number of returned items")
+    items: list[RecipeIndexItem] = Field(default_factory=list)
+
+
+class DishSuggestionItem(BaseModel):
+    """A cached dish offered as an autocomplete suggestion."""
+
+    dish_name: str = Field(..., description="已缓存的菜名")
+    providers: list[str] = Field(default_factory=list, description="已缓存该菜的提供商")
+
+
+class DishSuggestionsResponse(BaseModel):
+    """Autocomplete suggestions for a typed prefix."""
+
+    query: str = Field(..., description="用户输入的前缀")
+    suggestions: list[DishSuggestionItem] = Field(default_factory=list)
+
+
+class PopularDishItem(BaseModel):
+    """Approximate request statistics of one dish."""
+
+    dish_name: str = Field(..., description="菜名")
+    provider: str = Field(..., description="请求路由到的提供商")
+    requests: int = Field(..., description="统计窗口内的请求次数（估算，只会偏高）")
+    unique_users: int = Field(..., description="统计窗口内的独立调用方数量（估算）")
+
+
+class PopularDishesResponse(BaseModel):
+    """Most requested dishes over the popularity window."""
+
+    items: list[PopularDishItem] = Field(default_factory=list)
+
+
 class RequireApiKeyResponse(BaseModel):
     """Configuration response for API key requirement."""
 
@@ -79,17 +190,49 @@ def _load_recipe_schema() -> Dict[str, Any]:
 
 
 @lru_cache(maxsize=1)
-def _get_recipe_validator() -> Draft7Validator:
+def recipe_output_token_budget() -> int:
+    """``max_tokens`` for one recipe, estimated from the output schema."""
+    return estimate_output_tokens(_load_recipe_schema())
+
+
+@lru_cache(maxsize=1)
+def _get_recipe_validator() -> Any:
+    from jsonschema import Draft7Validator
+
     schema = _load_recipe_schema()
     return Draft7Validator(schema)
 
 
-def validate_recipe_output(payload: Dict[str, Any]) -> None:
-    """Validate the model output against the recipe JSON schema."""
+@lru_cache(maxsize=1)
+def _get_compiled_recipe_check() -> Check | None:
+    try:
+        return compile_schema(_load_recipe_schema())
+    except UnsupportedSchemaError as exc:
+        logger.warning("Recipe schema cannot be precompiled (%s); using jsonschema", exc)
+        return None
+
+
+def validate_recipe_output_reference(payload: Dict[str, Any]) -> None:
+    """Validate with jsonschema, reporting the first error by path.
+
+    Kept as the fallback for schemas the compiler does not support and as the
+    baseline for ``benchmarks/validation.py``.
+    """
     validator = _get_recipe_validator()
     errors = sorted(validator.iter_errors(payload), key=lambda err: err.path)
     if errors:
         first = errors[0]
         path = ".".join(str(item) for item in first.path)
         message = f"{path or 'root'}: {first.message}"
-        raise ValidationError(message)
+        raise RecipeSchemaError(message)
+
+
+def validate_recipe_output(payload: Dict[str, Any]) -> None:
+    """Validate the model output against the recipe JSON schema."""
+    check = _get_compiled_recipe_check()
+    if check is None:
+        validate_recipe_output_reference(payload)
+        return
+    error = check(payload)
+    if error is not None:
+        raise RecipeSchemaError(format_error(error))
@@ -0,0 +1,71 @@
+"""Output token budgets derived from a JSON schema.
+
+Generations are capped with ``max_tokens`` so a model that never stops (or
+keeps talking after the recipe) is cut off by the provider instead of running
+to its context limit. The budget is an estimate of the largest document the
+schema plausibly describes: bounded keywords (``maxLength``, ``maxItems``,
+``enum``) are honoured, unbounded strings and collections get fixed
+allowances, and the total is scaled by ``headroom``. Characters are counted
+as one token each, which over-counts English and roughly matches CJK text.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict
+
+# Braces, quotes, colons and commas around one member.
+_MEMBER_OVERHEAD = 4
+_SCALAR_TOKENS = {"number": 8, "integer": 8, "boolean": 5, "null": 4}
+
+
+def estimate_output_tokens(
+    schema: Dict[str, Any] | bool,
+    *,
+    string_tokens: int = 48,
+    collection_items: int = 8,
+    key_tokens: int = 8,
+    headroom: float = 1.5,
+) -> int:
+    """Return a ``max_tokens`` budget for one document matching ``schema``."""
+    size = _estimate(schema, string_tokens, collection_items, key_tokens)
+    return max(int(size * headroom), 1)
+
+
+def _estimate(
+    schema: Dict[str, Any] | bool, string_tokens: int, collection_items: int, key_tokens: int
+) -> int:
+    if not isinstance(schema, dict):
+        return string_tokens
+    if "enum" in schema:
+        return max((len(str(value)) + 2 for value in schema["enum"]), default=string_tokens)
+
+    declared = schema.get("type")
+    types = declared if isinstance(declared, list) else [declared]
+    estimates = []
+    for kind in types:
+        if kind == "object" or (kind is None and ("properties" in schema or "additionalProperties" in schema)):
+            estimates.append(_estimate_object(schema, string_tokens, collection_items, key_tokens))
+        elif kind == "array":
+            count = schema.get("maxItems", max(collection_items, schema.get("minItems", 0)))
+            item = _estimate(schema.get("items", {}), string_tokens, collection_items, key_tokens)
+            estimates.append(2 + count * (item + 1))
+        elif kind in _SCALAR_TOKENS:
+            estimates.append(_SCALAR_TOKENS[kind])
+        else:
+            estimates.append(schema.get("maxLength", max(string_tokens, schema.get("minLength", 0))) + 2)
+    return max(estimates)
+
+
+def _estimate_object(
+    schema: Dict[str, Any], string_tokens: int, collection_items: int, key_tokens: int
+) -> int:
+    total = 2
+    for name, sub in schema.get("properties", {}).items():
+        total += len(name) + _MEMBER_OVERHEAD + _estimate(sub, string_tokens, collection_items, key_tokens)
+    additional = schema.get("additionalProperties", True)
+    # Objects that declare their members are assumed to stick to them; open
+    # maps (ingredients, tips) get ``collection_items`` extra entries.
+    if additional is not False and not schema.get("properties"):
+        value = _estimate(additional, string_tokens, collection_items, key_tokens)
+        total += collection_items * (key_tokens + _MEMBER_OVERHEAD + value)
+    return total
@@ -0,0 +1,191 @@
+"""Production launcher: pre-forked workers with uvloop and httptools.
+
+With gunicorn installed the app is imported once in the master and forked
+into ``workers`` processes (``preload_app``), so warmed read-only state such
+as the compiled recipe schema and the system prompt is shared copy-on-write.
+Without gunicorn we fall back to uvicorn's own multi-process mode, which
+imports the app separately in every worker.
+
+Anything that owns threads, sockets or file handles (logging listener,
+tracing exporter, cache connections, provider clients) is created in the
+FastAPI startup hook, i.e. after the fork, never at import time.
+
+On SIGTERM a worker stops accepting new streams at once and gives running
+ones ``STREAM_DRAIN_SECONDS``; streams still running then are cut off and
+their partial output is recorded, which ends their SSE responses. uvicorn
+only reaches the lifespan shutdown once every connection is closed, so the
+drain starts from the signal handler and the connection wait is bounded
+(a few seconds past the drain deadline) as a backstop.
+
+With ``PROMETHEUS_MULTIPROC_DIR`` set, samples left by the previous run are
+removed before the workers start and the live gauges of every exited worker
+are dropped (gunicorn only; see :mod:`app.core.metrics`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import sys
+from types import FrameType
+from typing import Any, Dict
+
+from uvicorn import Config, Server
+
+logger = logging.getLogger(__name__)
+
+try:  # pragma: no cover - optional dependency
+    from gunicorn.app.base import BaseApplication  # type: ignore[import-untyped]
+    from gunicorn.arbiter import Arbiter  # type: ignore[import-untyped]
+    from uvicorn.workers import UvicornWorker
+except ImportError:  # pragma: no cover - optional dependency
+    BaseApplication = None  # type: ignore[assignment,misc]
+    UvicornWorker = None  # type: ignore[assignment,misc]
+
+APP_PATH = "app.main:app"
+
+
+def default_worker_count() -> int:
+    return int(os.getenv("AIRECIPE_WORKERS") or os.cpu_count() or 1)
+
+
+# Time after the drain deadline for interrupted responses to end before
+# uvicorn cancels the connections still open.
+_CONNECTION_GRACE_SECONDS = 5
+
+
+def _connection_timeout() -> int:
+    """How long uvicorn waits for open connections after SIGTERM."""
+    from app.core.config import get_settings
+
+    return math.ceil(get_settings().stream_drain_seconds) + _CONNECTION_GRACE_SECONDS
+
+
+def _graceful_timeout() -> int:
+    """Seconds a worker gets to exit before gunicorn kills it.
+
+    Covers the drain and the connection wait, both measured from the signal,
+    plus headroom for the lifespan shutdown (closing clients and the cache).
+    """
+    configured = os.getenv("AIRECIPE_GRACEFUL_TIMEOUT")
+    if configured:
+        return int(configured)
+    return _connection_timeout() + 15
+
+
+def _begin_stream_drain() -> None:
+    from app.core.config import get_settings
+    from app.main import app
+
+    streams = getattr(app.state, "stream_manager", None)
+    if streams is not None:
+        streams.start_drain(get_settings().stream_drain_seconds)
+
+
+class _DrainingServer(Server):
+    """uvicorn server that refuses new streams as soon as it is told to exit."""
+
+    def handle_exit(self, sig: int, frame: FrameType | None) -> None:
+        super().handle_exit(sig, frame)
+        _begin_stream_drain()
+
+
+def warm_process_caches() -> None:
+    """Populate per-process caches before forking so workers inherit them."""
+    from app.core.config import get_llm_providers, get_settings
+    from app.prompts.loader import load_prompt
+    from app.schemas.recipe import _get_compiled_recipe_check
+
+    settings = get_settings()
+    get_llm_providers()
+    _get_compiled_recipe_check()
+    try:
+        asyncio.run(load_prompt(settings.system_prompt_path))
+    except FileNotFoundError:
+        logger.warning("System prompt %s not found; skipping warm-up", settings.system_prompt_path)
+
+
+if UvicornWorker is not None:
+
+    class ProductionUvicornWorker(UvicornWorker):
+        CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            self.CONFIG_KWARGS = {
+                **self.CONFIG_KWARGS,
+                "timeout_graceful_shutdown": _connection_timeout(),
+            }
+            super().__init__(*args, **kwargs)
+
+        async def _serve(self) -> None:
+            # UvicornWorker._serve with the draining server.
+            self.config.app = self.wsgi
+            server = _DrainingServer(config=self.config)
+            self._install_sigquit_handler()
+            await server.serve(sockets=self.sockets)
+            if not server.started:
+                sys.exit(Arbiter.WORKER_BOOT_ERROR)
+
+    class _PreloadedApplication(BaseApplication):
+        def __init__(self, options: Dict[str, Any]) -> None:
+            self._options = options
+            super().__init__()
+
+        def load_config(self) -> None:
+            for key, value in self._options.items():
+                self.cfg.set(key, value)
+
+        def load(self) -> Any:
+            from app.main import app
+
+            warm_process_caches()
+            return app
+
+
+def _child_exit(_server: Any, worker: Any) -> None:
+    from app.core.metrics import mark_worker_dead
+
+    mark_worker_dead(worker.pid)
+
+
+def run_production(host: str, port: int, workers: int | None = None) -> None:
+    """Serve the app with one worker per core (or ``AIRECIPE_WORKERS``)."""
+    from app.core.metrics import reset_multiprocess_dir
+
+    workers = workers or default_worker_count()
+    reset_multiprocess_dir()
+    if BaseApplication is None:
+        from uvicorn.supervisors import Multiprocess
+
+        logger.warning("gunicorn not installed; starting uvicorn workers without preload")
+        config = Config(
+            APP_PATH,
+            host=host,
+            port=port,
+            workers=workers,
+            loop="uvloop",
+            http="httptools",
+            proxy_headers=True,
+            timeout_graceful_shutdown=_connection_timeout(),
+        )
+        # uvicorn.run() with the draining server.
+        server = _DrainingServer(config=config)
+        if workers > 1:
+            Multiprocess(config, target=server.run, sockets=[config.bind_socket()]).run()
+        else:
+            server.run()
+        return
+
+    _PreloadedApplication(
+        {
+            "bind": f"{host}:{port}",
+            "workers": workers,
+            "worker_class": f"{__name__}.ProductionUvicornWorker",
+            "preload_app": True,
+            "graceful_timeout": _graceful_timeout(),
+            "keepalive": 5,
+            "child_exit": _child_exit,
+        }
+    ).run()
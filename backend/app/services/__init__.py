@@ -1,21 +1,61 @@
 """Domain service layer for AIRecipe."""
 
+from app.services.batch_warmup import BatchWarmup, BatchWarmupError, WarmupReport
+from app.services.dish_suggester import DishSuggester, DishSuggestion
+from app.services.job_queue import (
+    JobNotFoundError,
+    JobQueue,
+    JobWorkerPool,
+    RecipeJob,
+    WebhookNotAllowedError,
+)
+from app.services.popularity import PopularDish, PopularityTracker
+from app.services.recipe_index import RecipeIndex, RecipeIndexEntry, RecipeIndexPage
 from app.services.recipe_service import (
+    BatchOutcome,
+    BatchPlan,
     RecipeCacheMissError,
     RecipeProviderError,
+    RecipeRecentlyFailedError,
     RecipeService,
     RecipeServiceError,
     RecipeValidationError,
+    StreamPlan,
     UnknownProviderError,
     UnsupportedRoutingStrategy,
 )
+from app.services.revalidator import CacheRevalidator
+from app.services.stream_manager import ActiveStream, StreamManager, StreamsDrainingError
 
 __all__ = [
+    "ActiveStream",
+    "BatchOutcome",
+    "BatchPlan",
+    "BatchWarmup",
+    "BatchWarmupError",
+    "CacheRevalidator",
+    "DishSuggester",
+    "DishSuggestion",
+    "JobNotFoundError",
+    "JobQueue",
+    "JobWorkerPool",
+    "PopularDish",
+    "PopularityTracker",
+    "RecipeJob",
+    "RecipeIndex",
+    "RecipeIndexEntry",
+    "RecipeIndexPage",
     "RecipeService",
     "RecipeServiceError",
     "RecipeProviderError",
+    "RecipeRecentlyFailedError",
     "RecipeValidationError",
     "UnknownProviderError",
     "UnsupportedRoutingStrategy",
     "RecipeCacheMissError",
+    "StreamManager",
+    "StreamPlan",
+    "StreamsDrainingError",
+    "WarmupReport",
+    "WebhookNotAllowedError",
 ]
@@ -0,0 +1,271 @@
+"""Offline cache warm-up through vendor batch APIs.
+
+Uncached dishes are turned into single-dish prompts (the same
+``RecipeService`` prompt a live request would send), submitted as one
+asynchronous batch per ``max_requests`` dishes, polled until the vendor
+finishes and then validated and cached one result at a time. Batch APIs are
+typically half price with separate throughput limits, which suits bulk
+warm-up that nobody is waiting on.
+
+Submitted batches are recorded in the ``warmup:batches`` hash until their
+results are ingested, so an interrupted warm-up resumes polling instead of
+paying for the same dishes twice. Transient polling errors are retried; a
+batch that still cannot be polled or downloaded stays recorded while the
+other batches finish, and the run then fails with :class:`BatchWarmupError`.
+A provider opts in with ``batch_api`` in the provider configuration.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Sequence
+
+import httpx
+
+from app.core.cache import CacheBackend
+from app.llm.base import RecipeLLMProvider
+from app.llm.registry import ProviderRegistry
+from app.schemas.recipe import RecipeGenerationRequest
+from app.services.recipe_service import RecipeService, RecipeValidationError
+
+logger = logging.getLogger(__name__)
+
+_BATCHES_KEY = "warmup:batches"
+_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchWarmupError(RuntimeError):
+    """Raised when no batch-capable provider is available or a batch cannot be used."""
+
+
+@dataclass
+class WarmupBatch:
+    """A submitted vendor batch and the dish behind each request."""
+
+    batch_id: str
+    provider: str
+    dishes: Dict[str, str]
+    submitted_at: float = field(default_factory=time.time)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "WarmupBatch":
+        return cls(**json.loads(raw))
+
+
+@dataclass
+class WarmupReport:
+    """Totals over every batch handled by one warm-up run."""
+
+    submitted: int = 0
+    cached: int = 0
+    invalid: int = 0
+    failed: int = 0
+    batches: list[str] = field(default_factory=list)
+
+
+class BatchWarmup:
+    """Submit, poll and ingest warm-up batches for one cache."""
+
+    def __init__(
+        self,
+        service: RecipeService,
+        registry: ProviderRegistry,
+        cache: CacheBackend,
+    ) -> None:
+        self._service = service
+        self._registry = registry
+        self._cache = cache
+
+    def select_provider(self, name: str | None = None) -> RecipeLLMProvider:
+        """The named provider, or the first enabled one with ``batch_api`` configured."""
+        if name is not None:
+            try:
+                provider = self._registry.get(name)
+            except KeyError as exc:
+                raise BatchWarmupError(str(exc)) from exc
+            if not provider.batch_enabled:
+                raise BatchWarmupError(f"provider '{name}' has no batch_api configured")
+            return provider
+        for provider_config in self._registry.config.providers.values():
+            if not provider_config.switch:
+                continue
+            provider = self._registry.get(provider_config.name)
+            if provider.batch_enabled:
+                return provider
+        raise BatchWarmupError("no enabled provider has batch_api configured")
+
+    async def pending(self, provider_name: str | None = None) -> list[WarmupBatch]:
+        batches = []
+        for batch_id, raw in (await self._cache.hgetall(_BATCHES_KEY)).items():
+            try:
+                batch = WarmupBatch.from_json(raw)
+            except (ValueError, TypeError):
+                logger.warning("Dropping malformed warm-up batch record %s", batch_id)
+                await self._cache.hdel(_BATCHES_KEY, batch_id)
+                continue
+            if provider_name is None or batch.provider == provider_name:
+                batches.append(batch)
+        return batches
+
+    async def submit(
+        self, dish_names: Sequence[str], provider: RecipeLLMProvider
+    ) -> list[WarmupBatch]:
+        """Submit every dish not yet cached, in batches of ``max_requests``."""
+        in_flight = {
+            dish.strip().lower()
+            for batch in await self.pending(provider.name)
+            for dish in batch.dishes.values()
+        }
+        missing = [
+            dish
+            for dish in await self._service.missing_dishes(provider.name, dish_names)
+            if dish.lower() not in in_flight
+        ]
+        options: Dict[str, Any] = getattr(provider, "batch_options", {})
+        size = max(int(options.get("max_requests", 1000)), 1)
+
+        batches = []
+        for start in range(0, len(missing), size):
+            chunk = missing[start : start + size]
+            dishes = {f"dish-{start + index}": dish for index, dish in enumerate(chunk)}
+            prompts = {
+                custom_id: await self._service.build_generation_prompt(
+                    RecipeGenerationRequest(dish_name=dish, provider=provider.name)
+                )
+                for custom_id, dish in dishes.items()
+            }
+            batch_id = await provider.submit_batch(
+                prompts, max_tokens=self._service.output_token_budget()
+            )
+            batch = WarmupBatch(batch_id=batch_id, provider=provider.name, dishes=dishes)
+            await self._cache.hset(_BATCHES_KEY, batch_id, batch.to_json())
+            batches.append(batch)
+        logger.info(
+            "Warm-up via %s: %d dish(es) requested, %d submitted in %d batch(es)",
+            provider.name,
+            len(dish_names),
+            len(missing),
+            len(batches),
+        )
+        return batches
+
+    async def complete(self, batch: WarmupBatch, report: WarmupReport) -> None:
+        """Poll ``batch`` until the vendor is done, then ingest its results.
+
+        Raises :class:`BatchWarmupError` after ``max_poll_errors`` consecutive
+        failed polls or a failed download; the batch stays recorded.
+        """
+        try:
+            provider = self._registry.get(batch.provider)
+        except KeyError:
+            logger.warning(
+                "Provider %s of warm-up batch %s is gone; leaving it pending",
+                batch.provider,
+                batch.batch_id,
+            )
+            return
+        options: Dict[str, Any] = getattr(provider, "batch_options", {})
+        poll_interval = float(options.get("poll_interval", 30))
+        max_errors = max(int(options.get("max_poll_errors", 10)), 1)
+        errors = 0
+        while True:
+            try:
+                info = await provider.get_batch(batch.batch_id)
+            except httpx.HTTPError as exc:
+                errors += 1
+                if errors >= max_errors:
+                    raise BatchWarmupError(
+                        f"polling warm-up batch {batch.batch_id} failed {errors} times: {exc}"
+                    ) from exc
+                logger.warning(
+                    "Polling warm-up batch %s failed (%d/%d): %s",
+                    batch.batch_id,
+                    errors,
+                    max_errors,
+                    exc,
+                )
+                await asyncio.sleep(poll_interval)
+                continue
+            errors = 0
+            status = info.get("status")
+            if status in _TERMINAL_STATUSES:
+                break
+            logger.info(
+                "Warm-up batch %s is %s (%s)", batch.batch_id, status, info.get("request_counts")
+            )
+            await asyncio.sleep(poll_interval)
+
+        if status != "completed":
+            logger.warning("Warm-up batch %s ended as %s", batch.batch_id, status)
+        for file_key in ("output_file_id", "error_file_id"):
+            file_id = info.get(file_key)
+            if file_id:
+                try:
+                    await self._ingest(provider, batch, file_id, report)
+                except httpx.HTTPError as exc:
+                    raise BatchWarmupError(
+                        f"downloading results of warm-up batch {batch.batch_id} failed: {exc}"
+                    ) from exc
+        await self._cache.hdel(_BATCHES_KEY, batch.batch_id)
+        report.batches.append(batch.batch_id)
+
+    async def _ingest(
+        self,
+        provider: RecipeLLMProvider,
+        batch: WarmupBatch,
+        file_id: str,
+        report: WarmupReport,
+    ) -> None:
+        async for custom_id, content, error in provider.batch_results(file_id):
+            dish_name = batch.dishes.get(custom_id)
+            if dish_name is None:
+                continue
+            if content is None:
+                report.failed += 1
+                logger.warning("Warm-up of '%s' failed at the vendor: %s", dish_name, error)
+                continue
+            request = RecipeGenerationRequest(dish_name=dish_name, provider=provider.name)
+            try:
+                await self._service.ingest_generation(provider.name, request, content)
+            except RecipeValidationError as exc:
+                report.invalid += 1
+                logger.warning("Warm-up recipe for '%s' is invalid: %s", dish_name, exc)
+                continue
+            report.cached += 1
+
+    async def run(
+        self, dish_names: Sequence[str], provider_name: str | None = None
+    ) -> WarmupReport:
+        """Finish batches left by earlier runs, then warm ``dish_names``."""
+        provider = self.select_provider(provider_name)
+        report = WarmupReport()
+        batches = await self.pending(provider.name)
+        if batches:
+            logger.info("Resuming %d pending warm-up batch(es)", len(batches))
+        try:
+            submitted = await self.submit(dish_names, provider)
+        except httpx.HTTPError as exc:
+            raise BatchWarmupError(f"failed to submit warm-up batch: {exc}") from exc
+        report.submitted = sum(len(batch.dishes) for batch in submitted)
+        outcomes = await asyncio.gather(
+            *(self.complete(batch, report) for batch in [*batches, *submitted]),
+            return_exceptions=True,
+        )
+        errors = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+        for error in errors:
+            if not isinstance(error, BatchWarmupError):
+                raise error
+            logger.error("%s", error)
+        if errors:
+            raise BatchWarmupError(
+                f"{len(errors)} warm-up batch(es) did not finish "
+                f"({report.cached} recipe(s) cached); run again to resume them"
+            )
+        return report
@@ -0,0 +1,200 @@
+"""Streaming export and import of cached recipes.
+
+A snapshot is gzip-compressed newline-delimited JSON. The first line is a
+header; each following line is either a cached recipe
+(``{"k": key, "v": value, "x": expires_at}``, where ``expires_at`` is a Unix
+time or null) or one field of the recipe index hash
+(``{"k": key, "f": field, "v": value}``). Expiry is stored as an absolute
+time so time spent between export and import counts against the TTL, and
+entries that expired meanwhile are skipped.
+
+Both directions work on fixed-size batches (``CacheBackend.scan`` /
+``mget_with_expiry`` / ``hscan`` out, ``mset`` / ``hset_many`` in), and
+decompression is capped per step, so memory use does not grow with the size
+of the cache or with the compression ratio of an uploaded snapshot.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from app.core.cache import CacheBackend
+from app.services.recipe_index import INDEX_KEY, RECIPE_PREFIX
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = "airecipe-cache-snapshot"
+SNAPSHOT_VERSION = 1
+
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+_READ_SIZE = 64 * 1024
+_MAX_LINE = 16 * 1024 * 1024
+
+
+class SnapshotFormatError(ValueError):
+    """Raised when an import stream is not a valid cache snapshot."""
+
+
+@dataclass
+class SnapshotImportResult:
+    """Counts reported after an import."""
+
+    imported: int = 0
+    index_entries: int = 0
+    expired: int = 0
+    skipped: int = 0
+
+
+def _line(record: Dict[str, Any]) -> bytes:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+async def export_snapshot(cache: CacheBackend, *, batch_size: int = 500) -> AsyncIterator[bytes]:
+    """Yield the gzip-compressed snapshot of every cached recipe."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, _GZIP_WBITS)
+    header = {"format": SNAPSHOT_FORMAT, "version": SNAPSHOT_VERSION, "created_at": time.time()}
+    yield compressor.compress(_line(header))
+
+    exported = 0
+    async for keys in cache.scan(RECIPE_PREFIX, batch_size):
+        lines = []
+        for key, item in zip(keys, await cache.mget_with_expiry(keys)):
+            if item is None:
+                continue
+            value, expires_at = item
+            lines.append(_line({"k": key, "v": value, "x": expires_at}))
+        exported += len(lines)
+        chunk = compressor.compress(b"".join(lines))
+        if chunk:
+            yield chunk
+
+    index_entries = 0
+    async for fields in cache.hscan(INDEX_KEY, batch_size):
+        index_entries += len(fields)
+        chunk = compressor.compress(
+            b"".join(_line({"k": INDEX_KEY, "f": field, "v": value}) for field, value in fields)
+        )
+        if chunk:
+            yield chunk
+    yield compressor.flush()
+    logger.info("Exported %d cached recipe(s) and %d index entries", exported, index_entries)
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    decompressor = zlib.decompressobj(_GZIP_WBITS)
+    buffer = b""
+    try:
+        async for chunk in chunks:
+            # Inflate at most _READ_SIZE bytes per step so a small, highly
+            # compressed upload cannot expand into memory all at once.
+            while chunk:
+                buffer += decompressor.decompress(chunk, _READ_SIZE)
+                chunk = decompressor.unconsumed_tail
+                *lines, buffer = buffer.split(b"\n")
+                if len(buffer) > _MAX_LINE:
+                    raise SnapshotFormatError("snapshot line exceeds the size limit")
+                for line in lines:
+                    yield line
+        buffer += decompressor.flush()
+    except zlib.error as exc:
+        raise SnapshotFormatError(f"snapshot is not valid gzip data: {exc}") from exc
+    if buffer.strip():
+        yield buffer
+
+
+async def import_snapshot(
+    cache: CacheBackend, chunks: AsyncIterator[bytes], *, batch_size: int = 500
+) -> SnapshotImportResult:
+    """Restore a snapshot produced by :func:`export_snapshot`."""
+    result = SnapshotImportResult()
+    entries: List[Tuple[str, str, int | None]] = []
+    index_fields: Dict[str, str] = {}
+    header_seen = False
+
+    async for raw in _iter_lines(chunks):
+        if not raw.strip():
+            continue
+        try:
+            record = json.loads(raw)
+        except ValueError as exc:
+            if not header_seen:
+                raise SnapshotFormatError("snapshot header is not JSON") from exc
+            result.skipped += 1
+            continue
+        if not header_seen:
+            if not isinstance(record, dict) or record.get("format") != SNAPSHOT_FORMAT:
+                raise SnapshotFormatError("not an AIRecipe cache snapshot")
+            if record.get("version") != SNAPSHOT_VERSION:
+                raise SnapshotFormatError(
+                    f"unsupported snapshot version {record.get('version')!r}"
+                )
+            header_seen = True
+            continue
+
+        key, value = record.get("k"), record.get("v")
+        if not isinstance(key, str) or not isinstance(value, str):
+            result.skipped += 1
+        elif "f" in record:
+            if key != INDEX_KEY or not isinstance(record["f"], str):
+                result.skipped += 1
+                continue
+            index_fields[record["f"]] = value
+            result.index_entries += 1
+            if len(index_fields) >= batch_size:
+                await cache.hset_many(INDEX_KEY, index_fields)
+                index_fields = {}
+        elif not key.startswith(RECIPE_PREFIX):
+            result.skipped += 1
+        else:
+            expires_at = record.get("x")
+            ttl = None
+            if isinstance(expires_at, (int, float)):
+                ttl = math.ceil(expires_at - time.time())
+                if ttl <= 0:
+                    result.expired += 1
+                    continue
+            entries.append((key, value, ttl))
+            result.imported += 1
+            if len(entries) >= batch_size:
+                await cache.mset(entries)
+                entries = []
+
+    if not header_seen:
+        raise SnapshotFormatError("snapshot is empty")
+    await cache.mset(entries)
+    await cache.hset_many(INDEX_KEY, index_fields)
+    logger.info(
+        "Imported %d cached recipe(s) and %d index entries (%d expired, %d skipped)",
+        result.imported,
+        result.index_entries,
+        result.expired,
+        result.skipped,
+    )
+    return result
+
+
+async def read_file_chunks(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as handle:
+        while chunk := await asyncio.to_thread(handle.read, _READ_SIZE):
+            yield chunk
+
+
+async def export_snapshot_to_file(cache: CacheBackend, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".tmp")
+    with partial.open("wb") as handle:
+        async for chunk in export_snapshot(cache):
+            await asyncio.to_thread(handle.write, chunk)
+    partial.replace(path)
+
+
+async def import_snapshot_from_file(cache: CacheBackend, path: Path) -> SnapshotImportResult:
+    return await import_snapshot(cache, read_file_chunks(path))
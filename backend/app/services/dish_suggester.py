@@ -0,0 +1,190 @@
+"""In-process prefix trie for dish-name autocompletion."""
+
+from __future__ import annotations
+
+from bisect import insort
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict
+
+from app.services.recipe_index import RecipeIndexEntry, normalize_dish_name
+
+
+@dataclass(frozen=True)
+class DishSuggestion:
+    """A cached dish matching the typed prefix."""
+
+    dish_name: str
+    providers: tuple[str, ...]
+
+
+# Number of best completions cached on every trie node.
+MAX_SUGGESTIONS = 20
+
+
+def _rank(name: str) -> tuple[int, str]:
+    """Shorter dish names rank first, then lexical order."""
+    return (len(name), name)
+
+
+class _TrieNode:
+    __slots__ = ("children", "names", "top", "stale")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _TrieNode] = {}
+        self.names: set[str] = set()
+        # Best MAX_SUGGESTIONS names reachable from this node, ordered by rank.
+        self.top: list[tuple[int, str]] = []
+        self.stale = False
+
+    def offer(self, name: str) -> None:
+        rank = _rank(name)
+        if rank in self.top:
+            return
+        if len(self.top) >= MAX_SUGGESTIONS and rank >= self.top[-1]:
+            return
+        insort(self.top, rank)
+        del self.top[MAX_SUGGESTIONS:]
+
+    def rebuild(self) -> None:
+        """Recompute the cached completions after a removal."""
+        best: set[tuple[int, str]] = set()
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            best.update(_rank(name) for name in node.names)
+            stack.extend(node.children.values())
+        self.top = sorted(best)[:MAX_SUGGESTIONS]
+        self.stale = False
+
+
+@lru_cache(maxsize=1)
+def _pinyin_converter() -> tuple[Callable[..., list[str]], Any] | None:
+    """Import ``pypinyin`` on first use; its phrase tables take ~0.4s to load."""
+    try:  # pragma: no cover - optional dependency
+        from pypinyin import Style, lazy_pinyin
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return lazy_pinyin, Style
+
+
+def preload_pinyin() -> bool:
+    """Load the pinyin tables ahead of time (e.g. from a worker thread)."""
+    return _pinyin_converter() is not None
+
+
+def _search_keys(normalized_name: str) -> set[str]:
+    """Return every key a dish should be reachable by.
+
+    Besides the dish name itself, pinyin spellings ("fanqiechaodan") and
+    pinyin initials ("fqcd") are indexed when ``pypinyin`` is installed.
+    """
+    keys = {normalized_name.replace(" ", "")}
+    converter = _pinyin_converter()
+    if converter is not None:
+        lazy_pinyin, Style = converter
+        syllables = lazy_pinyin(normalized_name)
+        initials = lazy_pinyin(normalized_name, style=Style.FIRST_LETTER)
+        keys.add("".join(syllables).replace(" ", ""))
+        keys.add("".join(initials).replace(" ", ""))
+    keys.discard("")
+    return keys
+
+
+class DishSuggester:
+    """Prefix trie over cached dish names, maintained incrementally.
+
+    Subscribe it to a :class:`~app.services.recipe_index.RecipeIndex` and it
+    follows every stored or evicted recipe without a rebuild. Every node
+    caches its best :data:`MAX_SUGGESTIONS` completions (shortest names
+    first), so a lookup only walks ``len(prefix)`` nodes. Removals mark the
+    affected nodes stale and they are recomputed lazily on the next hit.
+    """
+
+    def __init__(self) -> None:
+        self._root = _TrieNode()
+        # normalized name -> {cache_key: provider}
+        self._providers: Dict[str, Dict[str, str]] = {}
+        self._display: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._providers)
+
+    def add(self, entry: RecipeIndexEntry) -> None:
+        name = entry.normalized_name
+        if not name:
+            return
+        providers = self._providers.get(name)
+        if providers is None:
+            providers = self._providers[name] = {}
+            self._display[name] = entry.dish_name
+            for key in _search_keys(name):
+                self._insert(key, name)
+        providers[entry.cache_key] = entry.provider
+
+    def discard(self, entry: RecipeIndexEntry) -> None:
+        name = entry.normalized_name
+        providers = self._providers.get(name)
+        if providers is None:
+            return
+        providers.pop(entry.cache_key, None)
+        if providers:
+            return
+        del self._providers[name]
+        self._display.pop(name, None)
+        for key in _search_keys(name):
+            self._delete(key, name)
+
+    def suggest(self, prefix: str, *, limit: int = 10) -> list[DishSuggestion]:
+        query = normalize_dish_name(prefix).replace(" ", "")
+        if not query or limit <= 0:
+            return []
+        node = self._root
+        for char in query:
+            child = node.children.get(char)
+            if child is None:
+                return []
+            node = child
+
+        if node.stale:
+            node.rebuild()
+
+        found = [name for _, name in node.top[:limit]]
+        return [
+            DishSuggestion(
+                dish_name=self._display.get(name, name),
+                providers=tuple(sorted(set(self._providers.get(name, {}).values()))),
+            )
+            for name in found
+        ]
+
+    def _insert(self, key: str, name: str) -> None:
+        node = self._root
+        node.offer(name)
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+            node.offer(name)
+        node.names.add(name)
+
+    def _delete(self, key: str, name: str) -> None:
+        path: list[tuple[_TrieNode, str]] = []
+        node = self._root
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                return
+            path.append((node, char))
+            node = child
+        node.names.discard(name)
+        rank = _rank(name)
+        for parent, _ in path:
+            if rank in parent.top:
+                parent.stale = True
+        if rank in node.top:
+            node.stale = True
+        # Prune branches that no longer lead to any dish.
+        for parent, char in reversed(path):
+            child = parent.children[char]
+            if child.names or child.children:
+                break
+            del parent.children[char]
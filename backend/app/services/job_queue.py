@@ -0,0 +1,333 @@
+"""Asynchronous recipe generation jobs.
+
+A submitted job is stored as ``job:<id>`` and its ID pushed onto the
+``jobs:queue`` list of the :class:`CacheBackend`, so with the Redis or shared
+backend the queue survives restarts and is consumed by every worker process.
+:class:`JobWorkerPool` pops jobs, runs :meth:`RecipeService.generate_and_store`
+and, on completion, optionally POSTs the job to a webhook.
+
+Claiming moves the ID atomically from ``jobs:queue`` to the
+``jobs:processing`` list, so a worker that dies at any point leaves the job
+in one of the two lists. The claim time is kept in the ``jobs:running``
+hash; a claim older than the job timeout belongs to a worker that died and
+is put back on the queue. Whoever removes a job's ``jobs:running`` field -
+its worker on release or a reaper - is the only one that requeues it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Literal
+from urllib.parse import urlsplit
+from uuid import uuid4
+
+import httpx
+
+from app.core.cache import CacheBackend
+from app.core.metrics import JOB_QUEUE_DEPTH
+from app.schemas.recipe import RecipeGenerationRequest
+from app.services.recipe_service import (
+    RecipeProviderError,
+    RecipeService,
+    RecipeServiceError,
+)
+
+logger = logging.getLogger(__name__)
+
+JobStatus = Literal["queued", "running", "succeeded", "failed"]
+
+_QUEUE_KEY = "jobs:queue"
+_PROCESSING_KEY = "jobs:processing"
+_RUNNING_KEY = "jobs:running"
+
+
+class JobError(RuntimeError):
+    """Base exception for job API errors."""
+
+
+class JobNotFoundError(JobError):
+    """Raised when a job ID is unknown or has expired."""
+
+
+class WebhookNotAllowedError(JobError):
+    """Raised when a webhook URL points outside the configured allowlist."""
+
+
+@dataclass
+class RecipeJob:
+    """Persisted state of one generation job."""
+
+    job_id: str
+    request: Dict[str, Any]
+    status: JobStatus = "queued"
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    attempts: int = 0
+    webhook_url: str | None = None
+    result: Dict[str, Any] | None = None
+    error: str | None = None
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "RecipeJob":
+        return cls(**json.loads(raw))
+
+
+def validate_webhook_url(url: str, allowed_hosts: tuple[str, ...]) -> None:
+    """Reject webhook URLs that are not http(s) or not on an allowed host."""
+    parts = urlsplit(url)
+    if parts.scheme not in {"http", "https"} or not parts.hostname:
+        raise WebhookNotAllowedError(f"invalid webhook url '{url}'")
+    if parts.hostname not in allowed_hosts:
+        raise WebhookNotAllowedError(
+            f"webhook host '{parts.hostname}' is not in JOB_WEBHOOK_ALLOWED_HOSTS"
+        )
+
+
+class JobQueue:
+    """Job records and the pending-job list on top of a cache backend."""
+
+    def __init__(
+        self,
+        cache: CacheBackend,
+        *,
+        ttl: int = 86400,
+        webhook_allowed_hosts: tuple[str, ...] = (),
+    ) -> None:
+        self._cache = cache
+        self._ttl = ttl
+        self._webhook_allowed_hosts = webhook_allowed_hosts
+
+    async def submit(
+        self, request: RecipeGenerationRequest, *, webhook_url: str | None = None
+    ) -> RecipeJob:
+        if webhook_url is not None:
+            validate_webhook_url(webhook_url, self._webhook_allowed_hosts)
+        job = RecipeJob(
+            job_id=uuid4().hex,
+            request=request.model_dump(),
+            webhook_url=webhook_url,
+        )
+        await self.save(job)
+        await self._cache.lpush(_QUEUE_KEY, job.job_id)
+        await self.report_depth()
+        logger.info("Queued job %s for dish '%s'", job.job_id, request.dish_name)
+        return job
+
+    async def get(self, job_id: str) -> RecipeJob:
+        raw = await self._cache.get(f"job:{job_id}")
+        if raw is None:
+            raise JobNotFoundError(f"job '{job_id}' not found")
+        return RecipeJob.from_json(raw)
+
+    async def save(self, job: RecipeJob) -> None:
+        job.updated_at = time.time()
+        await self._cache.set(f"job:{job.job_id}", job.to_json(), ttl=self._ttl)
+
+    async def claim(self) -> RecipeJob | None:
+        """Move the oldest queued job to processing and mark it running, or return None."""
+        while True:
+            job_id = await self._cache.rpoplpush(_QUEUE_KEY, _PROCESSING_KEY)
+            if job_id is None:
+                return None
+            try:
+                job = await self.get(job_id)
+            except JobNotFoundError:
+                logger.warning("Dropping expired job %s from the queue", job_id)
+                await self._cache.lrem(_PROCESSING_KEY, job_id)
+                continue
+            if job.status != "queued":
+                # A duplicate left by a crash between requeue steps; the job
+                # is already running or done elsewhere.
+                await self._cache.lrem(_PROCESSING_KEY, job_id)
+                continue
+            job.status = "running"
+            job.attempts += 1
+            await self._cache.hset(_RUNNING_KEY, job_id, str(time.time()))
+            await self.save(job)
+            return job
+
+    async def release(self, job: RecipeJob, *, requeue: bool) -> None:
+        """Drop the running claim on ``job``, optionally queueing it again."""
+        if not await self._cache.hdel(_RUNNING_KEY, job.job_id):
+            # A reaper took the claim back and has requeued the job itself.
+            return
+        await self._finish_claim(job, requeue=requeue)
+
+    async def _finish_claim(self, job: RecipeJob, *, requeue: bool) -> None:
+        # Queue again before dropping the processing entry, so a crash in
+        # between leaves a duplicate for claim() to skip, never a lost job.
+        if requeue:
+            job.status = "queued"
+            await self.save(job)
+            await self._cache.lpush(_QUEUE_KEY, job.job_id)
+        await self._cache.lrem(_PROCESSING_KEY, job.job_id)
+
+    async def requeue_stale(self, older_than: float) -> int:
+        """Put back jobs whose claim is older than ``older_than`` seconds."""
+        now = time.time()
+        cutoff = now - older_than
+        requeued = 0
+        running = await self._cache.hgetall(_RUNNING_KEY)
+        for job_id in await self._cache.lrange(_PROCESSING_KEY):
+            if job_id not in running:
+                # Moved to processing but never stamped (its worker is just
+                # about to, or died in between): start its clock now.
+                await self._cache.hset(_RUNNING_KEY, job_id, str(now))
+        for job_id, claimed_at in running.items():
+            try:
+                stale = float(claimed_at) < cutoff
+            except ValueError:
+                stale = True
+            if not stale:
+                continue
+            if not await self._cache.hdel(_RUNNING_KEY, job_id):
+                continue  # released by its worker or taken by another reaper
+            try:
+                job = await self.get(job_id)
+            except JobNotFoundError:
+                await self._cache.lrem(_PROCESSING_KEY, job_id)
+                continue
+            requeue = job.status in {"queued", "running"}
+            await self._finish_claim(job, requeue=requeue)
+            if requeue:
+                requeued += 1
+        if requeued:
+            logger.warning("Requeued %d job(s) abandoned by a dead worker", requeued)
+        return requeued
+
+    async def depth(self) -> int:
+        return await self._cache.llen(_QUEUE_KEY)
+
+    async def report_depth(self) -> None:
+        try:
+            JOB_QUEUE_DEPTH.set(await self.depth())
+        except Exception:  # pragma: no cover - metrics must never fail a job
+            logger.debug("Failed to read job queue depth", exc_info=True)
+
+
+class JobWorkerPool:
+    """Consume :class:`JobQueue` with a fixed number of concurrent workers."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        service: RecipeService,
+        *,
+        concurrency: int = 2,
+        job_timeout: float = 300.0,
+        max_attempts: int = 3,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self._queue = queue
+        self._service = service
+        self._concurrency = concurrency
+        self._job_timeout = job_timeout
+        self._max_attempts = max(max_attempts, 1)
+        self._poll_interval = poll_interval
+        self._workers: list[asyncio.Task[None]] = []
+        self._reaper: asyncio.Task[None] | None = None
+        self._http: httpx.AsyncClient | None = None
+
+    def start(self) -> None:
+        if self._workers or self._concurrency <= 0:
+            return
+        self._http = httpx.AsyncClient(timeout=10.0, trust_env=False)
+        self._workers = [
+            asyncio.create_task(self._work(index)) for index in range(self._concurrency)
+        ]
+        self._reaper = asyncio.create_task(self._reap())
+        logger.info("Started %d job worker(s)", self._concurrency)
+
+    async def stop(self) -> None:
+        """Cancel the workers; a job cut off mid-generation goes back on the queue."""
+        tasks = [*self._workers, *([self._reaper] if self._reaper else [])]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._reaper = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def _reap(self) -> None:
+        # A claim outlives the job timeout only if its worker died.
+        while True:
+            try:
+                await self._queue.requeue_stale(self._job_timeout + 30)
+            except Exception:
+                logger.exception("Failed to requeue stale jobs")
+            await asyncio.sleep(max(self._job_timeout / 2, 5))
+
+    async def _work(self, index: int) -> None:
+        idle = self._poll_interval
+        while True:
+            try:
+                job = await self._queue.claim()
+            except Exception:
+                logger.exception("Job worker %d failed to claim a job", index)
+                job = None
+            if job is None:
+                await asyncio.sleep(idle)
+                idle = min(idle * 2, self._poll_interval * 8)
+                continue
+            idle = self._poll_interval
+            await self._queue.report_depth()
+            await self._run(job)
+
+    async def _run(self, job: RecipeJob) -> None:
+        try:
+            request = RecipeGenerationRequest.model_validate(job.request)
+            response = await asyncio.wait_for(
+                self._service.generate_and_store(request), self._job_timeout
+            )
+        except asyncio.CancelledError:
+            await asyncio.shield(self._queue.release(job, requeue=True))
+            raise
+        except (RecipeProviderError, asyncio.TimeoutError) as exc:
+            if job.attempts < self._max_attempts:
+                logger.warning(
+                    "Job %s attempt %d failed, retrying: %s", job.job_id, job.attempts, exc
+                )
+                await self._queue.release(job, requeue=True)
+                return
+            await self._finish(job, error=str(exc) or type(exc).__name__)
+        except RecipeServiceError as exc:
+            await self._finish(job, error=str(exc))
+        except Exception as exc:
+            logger.exception("Job %s failed unexpectedly", job.job_id)
+            await self._finish(job, error=str(exc))
+        else:
+            await self._finish(job, result=response.model_dump())
+
+    async def _finish(
+        self,
+        job: RecipeJob,
+        *,
+        result: Dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> None:
+        job.status = "failed" if error is not None else "succeeded"
+        job.result = result
+        job.error = error
+        await self._queue.save(job)
+        await self._queue.release(job, requeue=False)
+        logger.info("Job %s %s after %d attempt(s)", job.job_id, job.status, job.attempts)
+        if job.webhook_url:
+            await self._notify(job)
+
+    async def _notify(self, job: RecipeJob) -> None:
+        if self._http is None or job.webhook_url is None:
+            return
+        try:
+            response = await self._http.post(job.webhook_url, json=asdict(job))
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            logger.warning("Webhook for job %s failed: %s", job.job_id, exc)
@@ -0,0 +1,119 @@
+"""Extract the recipe JSON object from raw model output.
+
+Mirrors the cleaning steps of the frontend's ``json-cleaner.ts`` so recipes
+can be cached server-side when no client is left to post them back.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict
+
+_THINK_RE = re.compile(r"<think>.*?</think>", re.IGNORECASE | re.DOTALL)
+_FENCED_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+_CONTROL_RE = re.compile("[\u0000-\u0008\u000b\u000c\u000e-\u001f\u200b-\u200d\ufeff]")
+
+
+def clean_llm_json_output(raw: str) -> str:
+    """Drop ``<think>`` blocks, markdown fences and invisible characters."""
+    content = _THINK_RE.sub("", raw)
+    fenced = _FENCED_RE.search(content)
+    if fenced is not None:
+        content = fenced.group(1)
+    else:
+        content = re.sub(r"^\s*```(?:json)?\s*", "", content, flags=re.IGNORECASE)
+        content = re.sub(r"```\s*$", "", content)
+    return _CONTROL_RE.sub("", content).strip()
+
+
+def extract_recipe_json(raw: str) -> Dict[str, Any] | None:
+    """Return the first JSON object in ``raw`` after cleaning, or ``None``."""
+    content = clean_llm_json_output(raw)
+    start = content.find("{")
+    if start < 0:
+        return None
+    try:
+        payload, _ = json.JSONDecoder().raw_decode(content, start)
+    except json.JSONDecodeError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+class KeyedObjectSplitter:
+    """Split a streamed ``{"key": {...}, ...}`` object into its members.
+
+    Used for multi-dish generations: :meth:`feed` returns every top-level
+    member completed by the new chunk, so each recipe can be validated and
+    cached while the rest are still being generated. Text before the opening
+    brace (``<think>`` blocks, a markdown fence) is skipped; members that are
+    not valid JSON are reported with a ``None`` value.
+    """
+
+    def __init__(self) -> None:
+        self._preamble = ""
+        self._started = False
+        self._finished = False
+        self._member: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        if self._finished:
+            return []
+        if not self._started:
+            self._preamble += chunk
+            text = _THINK_RE.sub("", self._preamble)
+            if "<think>" in text.lower():
+                return []
+            start = text.find("{")
+            if start < 0:
+                return []
+            self._started = True
+            self._depth = 1
+            chunk = text[start + 1 :]
+
+        members: list[tuple[str, Any]] = []
+        begin = 0
+        for index, char in enumerate(chunk):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._member.append(chunk[begin:index])
+                    members.extend(self._flush_member())
+                    self._finished = True
+                    return members
+            elif char == "," and self._depth == 1:
+                self._member.append(chunk[begin:index])
+                members.extend(self._flush_member())
+                begin = index + 1
+        self._member.append(chunk[begin:])
+        return members
+
+    def _flush_member(self) -> list[tuple[str, Any]]:
+        text = "".join(self._member).strip()
+        self._member = []
+        if not text:
+            return []
+        try:
+            parsed = json.loads("{" + _CONTROL_RE.sub("", text) + "}")
+        except json.JSONDecodeError:
+            key, _, _ = text.partition(":")
+            return [(key.strip().strip('"'), None)]
+        return list(parsed.items())
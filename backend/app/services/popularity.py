@@ -0,0 +1,298 @@
+"""Approximate dish popularity from the recipe lookup paths.
+
+Every lookup is recorded in a process-local count-min sketch keyed by
+``<provider>:<dish>`` and, when the caller is known, in a per-dish
+HyperLogLog of unique callers. Both cost a hash and a few array updates, so
+recording stays on the hot path. :class:`PopularityTracker` periodically adds
+the local sketch to ``popularity:cms:<day>`` with one batched
+:meth:`CacheBackend.hincrby`, merges the HyperLogLogs into
+``popularity:users:<day>`` and remembers the dishes it saw in a bounded
+``popularity:top:<day>`` candidate hash, from which the top-K list is read.
+Keys are per UTC day, expire a day after they leave the window, and only the
+last ``window_days`` days are counted. HyperLogLogs are merged with a
+read-modify-write, so a short ``popularity:lock:<day>`` lock taken through
+``CacheBackend.set_if_absent`` serialises that step across workers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import contextvars
+import hashlib
+import logging
+import math
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Mapping
+
+from app.core.cache import CacheBackend
+
+logger = logging.getLogger(__name__)
+
+_caller: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "airecipe_caller", default=None
+)
+
+
+def bind_caller(caller: str) -> None:
+    """Identify the caller of the current request for unique-user counting."""
+    _caller.set(caller)
+
+
+def _hash64(value: str, salt: bytes = b"") -> int:
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8, salt=salt).digest()
+    return int.from_bytes(digest, "big")
+
+
+class CountMinSketch:
+    """Fixed-size frequency sketch; estimates never undercount."""
+
+    def __init__(self, width: int = 1024, depth: int = 4) -> None:
+        self.width = width
+        self.depth = depth
+        self._rows = [array("q", bytes(8 * width)) for _ in range(depth)]
+
+    def _columns(self, item: str) -> list[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=4 * self.depth).digest()
+        return [
+            int.from_bytes(digest[4 * row : 4 * row + 4], "big") % self.width
+            for row in range(self.depth)
+        ]
+
+    def add(self, item: str, count: int = 1) -> None:
+        for row, column in enumerate(self._columns(item)):
+            self._rows[row][column] += count
+
+    def estimate(self, item: str) -> int:
+        return min(self._rows[row][column] for row, column in enumerate(self._columns(item)))
+
+    def cells(self) -> Dict[str, int]:
+        """Non-zero counters as ``"<row>:<column>" -> count``."""
+        return {
+            f"{row}:{column}": count
+            for row, counters in enumerate(self._rows)
+            for column, count in enumerate(counters)
+            if count
+        }
+
+    def add_cells(self, cells: Mapping[str, str | int]) -> None:
+        for cell, count in cells.items():
+            row, _, column = cell.partition(":")
+            try:
+                self._rows[int(row)][int(column)] += int(count)
+            except (ValueError, IndexError):
+                continue
+
+
+class HyperLogLog:
+    """Cardinality estimator with ``2**precision`` one-byte registers."""
+
+    def __init__(self, precision: int = 10, registers: bytes | None = None) -> None:
+        self.precision = precision
+        self._size = 1 << precision
+        self._registers = bytearray(registers or bytes(self._size))
+
+    def add(self, value: str) -> None:
+        hashed = _hash64(value)
+        index = hashed >> (64 - self.precision)
+        remaining = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        self._registers = bytearray(map(max, self._registers, other._registers))
+
+    def count(self) -> int:
+        size = self._size
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0 ** -register for register in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            # Linear counting is far more accurate for small cardinalities.
+            estimate = size * math.log(size / zeros)
+        return round(estimate)
+
+    def dumps(self) -> str:
+        return base64.b64encode(bytes(self._registers)).decode("ascii")
+
+    @classmethod
+    def loads(cls, raw: str, precision: int = 10) -> "HyperLogLog":
+        registers = base64.b64decode(raw.encode("ascii"))
+        if len(registers) != 1 << precision:
+            raise ValueError("HyperLogLog register count does not match precision")
+        return cls(precision, registers)
+
+
+@dataclass(frozen=True)
+class PopularDish:
+    """One entry of the top-K list."""
+
+    provider: str
+    dish_name: str
+    requests: int
+    unique_users: int
+
+
+class PopularityTracker:
+    """Record lookups locally and periodically merge them into the cache."""
+
+    def __init__(
+        self,
+        cache: CacheBackend,
+        *,
+        flush_interval: float = 10.0,
+        window_days: int = 2,
+        max_candidates: int = 500,
+        width: int = 1024,
+        depth: int = 4,
+    ) -> None:
+        self._cache = cache
+        self._flush_interval = flush_interval
+        self._window_days = max(window_days, 1)
+        self._max_candidates = max_candidates
+        self._width = width
+        self._depth = depth
+        self._pending = CountMinSketch(width, depth)
+        self._touched: set[str] = set()
+        self._users: Dict[str, HyperLogLog] = {}
+        # Merged counts of the whole window as of the last flush.
+        self._merged = CountMinSketch(width, depth)
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._flush_interval > 0
+
+    def record(self, provider_name: str, dish_name: str) -> None:
+        if not self.enabled:
+            return
+        item = f"{provider_name}:{dish_name}"
+        self._pending.add(item)
+        self._touched.add(item)
+        caller = _caller.get()
+        if caller is not None and (
+            dish_name in self._users or len(self._users) < self._max_candidates * 4
+        ):
+            self._users.setdefault(dish_name, HyperLogLog()).add(caller)
+
+    def estimate(self, provider_name: str, dish_name: str) -> int:
+        item = f"{provider_name}:{dish_name}"
+        return self._merged.estimate(item) + self._pending.estimate(item)
+
+    def start(self) -> None:
+        if self._task is None and self.enabled:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.warning("Final popularity flush failed", exc_info=True)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.warning("Failed to flush popularity counters", exc_info=True)
+
+    def _days(self) -> list[str]:
+        today = datetime.now(timezone.utc)
+        return [f"{today - timedelta(days=offset):%Y%m%d}" for offset in range(self._window_days)]
+
+    async def flush(self) -> None:
+        """Merge local counters into the cache and refresh the merged view."""
+        async with self._lock:
+            days = self._days()
+            today = days[0]
+            ttl = (self._window_days + 1) * 86400
+
+            pending, self._pending = self._pending, CountMinSketch(self._width, self._depth)
+            touched, self._touched = self._touched, set()
+            users, self._users = self._users, {}
+            await self._cache.hincrby(f"popularity:cms:{today}", pending.cells())
+            await self._cache.expire(f"popularity:cms:{today}", ttl)
+            if users and not await self._merge_users(f"popularity:users:{today}", users, ttl):
+                # Another worker holds the lock; keep the sketches for next time.
+                for dish_name, sketch in users.items():
+                    self._users.setdefault(dish_name, HyperLogLog()).merge(sketch)
+
+            merged = CountMinSketch(self._width, self._depth)
+            for day in days:
+                merged.add_cells(await self._cache.hgetall(f"popularity:cms:{day}"))
+            self._merged = merged
+            await self._update_candidates(f"popularity:top:{today}", touched)
+            await self._cache.expire(f"popularity:top:{today}", ttl)
+
+    async def _merge_users(self, key: str, users: Mapping[str, HyperLogLog], ttl: int) -> bool:
+        """Merge ``users`` into ``key`` under the cross-worker lock; False if it is taken."""
+        lock = f"popularity:lock:{key.rpartition(':')[2]}"
+        if not await self._cache.set_if_absent(lock, "1", ttl=max(int(self._flush_interval), 30)):
+            return False
+        try:
+            for dish_name, sketch in users.items():
+                raw = await self._cache.hget(key, dish_name)
+                if raw is not None:
+                    try:
+                        sketch.merge(HyperLogLog.loads(raw))
+                    except ValueError:
+                        pass
+                await self._cache.hset(key, dish_name, sketch.dumps())
+            await self._cache.expire(key, ttl)
+        finally:
+            await self._cache.delete(lock)
+        return True
+
+    async def _update_candidates(self, key: str, touched: Iterable[str]) -> None:
+        for item in touched:
+            await self._cache.hset(key, item, str(self._merged.estimate(item)))
+        candidates = await self._cache.hgetall(key)
+        if len(candidates) <= self._max_candidates * 2:
+            return
+        ranked = sorted(candidates, key=lambda item: self._merged.estimate(item), reverse=True)
+        for item in ranked[self._max_candidates :]:
+            await self._cache.hdel(key, item)
+
+    async def top(self, limit: int = 20, *, provider: str | None = None) -> list[PopularDish]:
+        """Most requested ``(provider, dish)`` pairs over the window."""
+        days = self._days()
+        items: set[str] = set()
+        for day in days:
+            items.update(await self._cache.hgetall(f"popularity:top:{day}"))
+        ranked = []
+        for item in items:
+            provider_name, _, dish_name = item.partition(":")
+            if provider is not None and provider_name != provider:
+                continue
+            ranked.append((self.estimate(provider_name, dish_name), provider_name, dish_name))
+        ranked.sort(reverse=True)
+
+        result = []
+        for requests, provider_name, dish_name in ranked[:limit]:
+            users = HyperLogLog()
+            for day in days:
+                raw = await self._cache.hget(f"popularity:users:{day}", dish_name)
+                if raw is not None:
+                    try:
+                        users.merge(HyperLogLog.loads(raw))
+                    except ValueError:
+                        continue
+            result.append(
+                PopularDish(
+                    provider=provider_name,
+                    dish_name=dish_name,
+                    requests=requests,
+                    unique_users=users.count(),
+                )
+            )
+        return result
@@ -0,0 +1,278 @@
+"""Secondary index over cached recipes for browsing and search."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from bisect import bisect_left
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable
+
+from app.core.cache import CacheBackend
+
+logger = logging.getLogger(__name__)
+
+INDEX_KEY = "index:recipes"
+RECIPE_PREFIX = "recipe:"
+
+IndexListener = Callable[["RecipeIndexEntry"], None]
+
+
+def normalize_dish_name(dish_name: str) -> str:
+    """Normalise a dish name the same way cache keys do."""
+    return dish_name.strip().lower()
+
+
+@dataclass(frozen=True)
+class RecipeIndexEntry:
+    """Metadata describing a single cached recipe."""
+
+    cache_key: str
+    dish_name: str
+    provider: str
+    title: str | None = None
+    tags: tuple[str, ...] = ()
+    difficulty: str | None = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+    @property
+    def normalized_name(self) -> str:
+        return normalize_dish_name(self.dish_name)
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["tags"] = list(self.tags)
+        return json.dumps(data, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "RecipeIndexEntry":
+        data = json.loads(raw)
+        return cls(
+            cache_key=data["cache_key"],
+            dish_name=data["dish_name"],
+            provider=data["provider"],
+            title=data.get("title"),
+            tags=tuple(data.get("tags") or ()),
+            difficulty=data.get("difficulty"),
+            created_at=float(data.get("created_at", 0.0)),
+            updated_at=float(data.get("updated_at", 0.0)),
+        )
+
+
+@dataclass(frozen=True)
+class RecipeIndexPage:
+    """A page of index search results."""
+
+    total: int
+    offset: int
+    limit: int
+    entries: list[RecipeIndexEntry] = field(default_factory=list)
+
+
+class RecipeIndex:
+    """Maintain a searchable index of cached recipes.
+
+    The authoritative copy lives in a single cache hash (``index:recipes``)
+    keyed by recipe cache key, so every worker sees the same entries without
+    scanning the keyspace. Each process keeps a local mirror that is
+    refreshed at most every ``refresh_interval`` seconds; lookups never touch
+    the LLM path. Each refresh also drops rows whose recipe is no longer
+    cached (evicted or deleted as corrupt), so the index cannot outgrow the
+    cache.
+    """
+
+    def __init__(self, cache: CacheBackend, *, refresh_interval: float = 30.0) -> None:
+        self._cache = cache
+        self._refresh_interval = max(refresh_interval, 0.0)
+        self._entries: Dict[str, RecipeIndexEntry] = {}
+        self._by_tag: Dict[str, set[str]] = {}
+        self._sorted_names: list[tuple[str, str]] = []
+        self._dirty = False
+        self._loaded_at: float | None = None
+        self._lock = asyncio.Lock()
+        self._upsert_listeners: list[IndexListener] = []
+        self._remove_listeners: list[IndexListener] = []
+
+    def subscribe(
+        self,
+        on_upsert: IndexListener,
+        on_remove: IndexListener | None = None,
+    ) -> None:
+        """Register callbacks invoked as local entries are added or dropped.
+
+        Existing entries are replayed to ``on_upsert`` immediately so derived
+        structures can be built incrementally from this point on.
+        """
+        self._upsert_listeners.append(on_upsert)
+        if on_remove is not None:
+            self._remove_listeners.append(on_remove)
+        for entry in self._entries.values():
+            on_upsert(entry)
+
+    async def record(
+        self,
+        *,
+        cache_key: str,
+        dish_name: str,
+        provider_name: str,
+        payload: Dict[str, Any],
+    ) -> RecipeIndexEntry:
+        """Insert or update the entry for a freshly cached recipe."""
+        now = time.time()
+        created_at = now
+        existing = await self._cache.hget(INDEX_KEY, cache_key)
+        if existing is not None:
+            try:
+                created_at = RecipeIndexEntry.from_json(existing).created_at or now
+            except (ValueError, KeyError):
+                logger.warning("Discarding malformed index entry for %s", cache_key)
+
+        raw_tags = payload.get("标签")
+        tags = tuple(
+            str(tag) for tag in raw_tags if isinstance(tag, str) and tag
+        ) if isinstance(raw_tags, list) else ()
+        title = payload.get("菜名")
+        difficulty = payload.get("难度")
+        entry = RecipeIndexEntry(
+            cache_key=cache_key,
+            dish_name=dish_name.strip(),
+            provider=provider_name,
+            title=title if isinstance(title, str) else None,
+            tags=tags,
+            difficulty=difficulty if isinstance(difficulty, str) else None,
+            created_at=created_at,
+            updated_at=now,
+        )
+        await self._cache.hset(INDEX_KEY, cache_key, entry.to_json())
+        async with self._lock:
+            self._upsert_local(entry)
+        return entry
+
+    async def remove(self, cache_key: str) -> None:
+        """Drop an entry, e.g. when the cached recipe was deleted."""
+        await self._cache.hdel(INDEX_KEY, cache_key)
+        async with self._lock:
+            self._remove_local(cache_key)
+
+    async def search(
+        self,
+        *,
+        prefix: str | None = None,
+        tag: str | None = None,
+        provider: str | None = None,
+        offset: int = 0,
+        limit: int = 20,
+    ) -> RecipeIndexPage:
+        """Return entries matching the filters, most recently updated first."""
+        await self.refresh()
+
+        if prefix:
+            candidates: Iterable[RecipeIndexEntry] = self._prefix_matches(
+                normalize_dish_name(prefix)
+            )
+        else:
+            candidates = self._entries.values()
+        if tag:
+            tagged = self._by_tag.get(tag, set())
+            candidates = (item for item in candidates if item.cache_key in tagged)
+        if provider:
+            candidates = (item for item in candidates if item.provider == provider)
+
+        matches = sorted(candidates, key=lambda item: item.updated_at, reverse=True)
+        offset = max(offset, 0)
+        limit = max(limit, 0)
+        return RecipeIndexPage(
+            total=len(matches),
+            offset=offset,
+            limit=limit,
+            entries=matches[offset : offset + limit],
+        )
+
+    async def refresh(self, *, force: bool = False) -> None:
+        """Reload the local mirror from the shared hash when it is stale."""
+        now = time.monotonic()
+        if (
+            not force
+            and self._loaded_at is not None
+            and now - self._loaded_at < self._refresh_interval
+        ):
+            return
+        async with self._lock:
+            if (
+                not force
+                and self._loaded_at is not None
+                and time.monotonic() - self._loaded_at < self._refresh_interval
+            ):
+                return
+            raw_entries = await self._cache.hgetall(INDEX_KEY)
+            # Recipes are written before their index row, so every row read
+            # above whose key the scan misses has really lost its recipe.
+            live: set[str] = set()
+            async for keys in self._cache.scan(RECIPE_PREFIX):
+                live.update(keys)
+            entries: Dict[str, RecipeIndexEntry] = {}
+            for cache_key, raw in raw_entries.items():
+                if cache_key not in live:
+                    await self._cache.hdel(INDEX_KEY, cache_key)
+                    continue
+                try:
+                    entries[cache_key] = RecipeIndexEntry.from_json(raw)
+                except (ValueError, KeyError):
+                    logger.warning("Skipping malformed index entry for %s", cache_key)
+            for cache_key in self._entries.keys() - entries.keys():
+                self._remove_local(cache_key)
+            for cache_key, entry in entries.items():
+                if self._entries.get(cache_key) != entry:
+                    self._upsert_local(entry)
+            self._loaded_at = time.monotonic()
+            logger.debug(
+                "Recipe index refreshed with %d entries (%d orphaned rows dropped)",
+                len(entries),
+                len(raw_entries) - len(live.intersection(raw_entries)),
+            )
+
+    def _prefix_matches(self, prefix: str) -> Iterable[RecipeIndexEntry]:
+        if self._dirty:
+            self._sorted_names = sorted(
+                (entry.normalized_name, key) for key, entry in self._entries.items()
+            )
+            self._dirty = False
+        start = bisect_left(self._sorted_names, (prefix, ""))
+        for name, cache_key in self._sorted_names[start:]:
+            if not name.startswith(prefix):
+                break
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                yield entry
+
+    def _upsert_local(self, entry: RecipeIndexEntry) -> None:
+        self._remove_local(entry.cache_key)
+        self._entries[entry.cache_key] = entry
+        for tag in entry.tags:
+            self._by_tag.setdefault(tag, set()).add(entry.cache_key)
+        self._dirty = True
+        self._notify(self._upsert_listeners, entry)
+
+    def _remove_local(self, cache_key: str) -> None:
+        previous = self._entries.pop(cache_key, None)
+        if previous is None:
+            return
+        for tag in previous.tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(cache_key)
+                if not keys:
+                    del self._by_tag[tag]
+        self._dirty = True
+        self._notify(self._remove_listeners, previous)
+
+    @staticmethod
+    def _notify(listeners: list[IndexListener], entry: RecipeIndexEntry) -> None:
+        for listener in listeners:
+            try:
+                listener(entry)
+            except Exception:  # pragma: no cover - defensive
+                logger.exception("Recipe index listener failed for %s", entry.cache_key)
@@ -5,20 +5,36 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
-from typing import Any, AsyncIterator, Dict
+import math
+import time
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Sequence
 from uuid import uuid4
 
 import httpx
-from jsonschema.exceptions import ValidationError as SchemaValidationError
 
 from app.core.cache import CacheBackend, get_cache_backend
 from app.core.config import get_settings
+from app.core.logging_config import HOT_PATH
+from app.core.metrics import BATCH_RECIPES, CACHE_LOOKUPS
+from app.core.tracing import span
 from app.llm.base import RecipeLLMProvider
 from app.llm.registry import ProviderRegistry
 from app.prompts.loader import load_prompt
+from app.services.dish_suggester import DishSuggester, DishSuggestion
+from app.services.output_parser import KeyedObjectSplitter, extract_recipe_json
+from app.services.popularity import PopularDish, PopularityTracker
+from app.services.recipe_index import RecipeIndex, RecipeIndexPage
+from app.services.revalidator import CacheRevalidator
+from app.services.stream_manager import ActiveStream, StreamManager
 from app.schemas.recipe import (
+    RecipeBatchRequest,
     RecipeGenerationRequest,
     RecipeGenerationResponse,
+    RecipeSchemaError,
+    _load_recipe_schema,
+    recipe_output_token_budget,
     validate_recipe_output,
 )
 
@@ -30,12 +46,33 @@ class RecipeServiceError(RuntimeError):
 
 
 class RecipeProviderError(RecipeServiceError):
-    """Raised when communicating with the provider fails."""
+    """Raised when communicating with the provider fails.
+
+    ``failure`` is set for errors worth negative-caching (the provider refused
+    the content, see :func:`_provider_failure`); transient errors leave it None.
+    """
+
+    def __init__(self, message: str, *, failure: str | None = None) -> None:
+        super().__init__(message)
+        self.failure = failure
 
 
 class RecipeValidationError(RecipeServiceError):
     """Raised when parsing or validating the provider output fails."""
 
+    def __init__(self, message: str, *, failure: str = "schema") -> None:
+        super().__init__(message)
+        self.failure = failure
+
+
+class RecipeRecentlyFailedError(RecipeServiceError):
+    """Raised instead of regenerating a recipe whose last attempts failed."""
+
+    def __init__(self, message: str, *, failure: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.failure = failure
+        self.retry_after = retry_after
+
 
 class UnknownProviderError(RecipeServiceError):
     """Raised when a requested provider cannot be found."""
@@ -49,6 +86,87 @@ class RecipeCacheMissError(RecipeServiceError):
     """Raised when a requested recipe is not yet cached."""
 
 
+@dataclass(frozen=True)
+class StreamPlan:
+    """Provider and cache lookup result for one streaming request."""
+
+    provider: RecipeLLMProvider
+    cache_key: str
+    cached_payload: Dict[str, Any] | None
+    # Provider the cached recipe was generated by; differs from ``provider``
+    # after a cross-provider fallback hit.
+    cached_provider: str | None = None
+
+    @property
+    def cache_hit(self) -> bool:
+        return self.cached_payload is not None
+
+
+@dataclass(frozen=True)
+class _CacheEntry:
+    """A decoded cache entry."""
+
+    recipe: Dict[str, Any]
+    # Written for an older prompt/schema version.
+    stale: bool
+    # Bare recipe stored before entries were versioned.
+    legacy: bool
+
+
+# Error codes/types providers use when they refuse the content itself.
+_CONTENT_REFUSALS = ("content_filter", "content_policy", "safety")
+
+
+def _provider_failure(exc: BaseException) -> str | None:
+    """Classify provider errors that will not go away by retrying the same dish.
+
+    Only content refusals qualify. Other 4xx responses (a bad ``max_tokens``,
+    an unknown model, an invalid parameter) come from the request or the
+    provider configuration, affect every dish alike and are fixed without
+    touching the cache, so they are left transient.
+    """
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return None
+    response = exc.response
+    if not 400 <= response.status_code < 500 or response.status_code == 429:
+        return None
+    try:
+        body = response.json()
+    except (httpx.ResponseNotRead, ValueError):
+        return None
+    error = body.get("error") if isinstance(body, dict) else None
+    if not isinstance(error, dict):
+        return None
+    markers = " ".join(str(error.get(field) or "") for field in ("code", "type")).lower()
+    if any(marker in markers for marker in _CONTENT_REFUSALS):
+        return "provider_content_filter"
+    return None
+
+
+@dataclass
+class BatchOutcome:
+    """Result for one dish of a batch; exactly one of response/error is set once run."""
+
+    dish_name: str
+    provider: str
+    response: RecipeGenerationResponse | None = None
+    error: RecipeServiceError | None = None
+
+
+@dataclass
+class BatchPlan:
+    """Cache lookups of a batch request and the dishes still to generate."""
+
+    outcomes: list[BatchOutcome]
+    misses: list[tuple[BatchOutcome, RecipeLLMProvider, RecipeGenerationRequest]] = field(
+        default_factory=list
+    )
+
+    @property
+    def miss_count(self) -> int:
+        return len(self.misses)
+
+
 class RecipeService:
     """Generate structured recipes using configured providers."""
 
@@ -58,66 +176,486 @@ class RecipeService:
         *,
         registry: ProviderRegistry | None = None,
         cache: CacheBackend | None = None,
+        index: RecipeIndex | None = None,
+        suggester: DishSuggester | None = None,
+        streams: StreamManager | None = None,
+        revalidator: CacheRevalidator | None = None,
+        popularity: PopularityTracker | None = None,
     ) -> None:
         if provider is None and registry is None:
             raise ValueError("either provider or registry must be supplied")
         self._provider = provider
         self._registry = registry
         self._cache = cache
+        self._index = index
+        self._suggester = suggester
+        self._streams = streams
+        self._revalidator = revalidator
+        self._popularity = popularity
         self._settings = get_settings()
+        self._content_version: str | None = None
+
+    @property
+    def accepting_streams(self) -> bool:
+        return self._streams is None or not self._streams.draining
 
     async def generate_recipe(
         self, request: RecipeGenerationRequest
     ) -> RecipeGenerationResponse:
         provider = await self._resolve_provider(request)
-        cache = self._get_cache()
-        cache_key = self._make_cache_key(provider.name, request)
-        cached_payload = await self._fetch_from_cache(cache, cache_key)
-        if cached_payload is None:
+        cached = await self._lookup_cached(self._get_cache(), provider.name, request.dish_name)
+        if cached is None:
             logger.info(
                 "Cache miss for provider '%s' and dish '%s'",
                 provider.name,
                 request.dish_name,
+                extra=HOT_PATH,
             )
             raise RecipeCacheMissError(
                 f"recipe '{request.dish_name}' for provider '{provider.name}' is not cached"
             )
 
+        source, cached_payload = cached
         logger.info(
             "Cache hit for provider '%s' and dish '%s'",
-            provider.name,
+            source,
             request.dish_name,
+            extra=HOT_PATH,
+        )
+        return self._build_response(
+            source, cached_payload, cached=True, requested_provider=provider.name
         )
-        return self._build_response(provider.name, cached_payload, cached=True)
 
-    async def generate_recipe_stream(
+    async def generate_and_store(
         self, request: RecipeGenerationRequest
-    ) -> AsyncIterator[str]:
-        """Generate recipe with streaming output.
+    ) -> RecipeGenerationResponse:
+        """Generate, validate and cache a recipe without a client attached.
 
-        如果命中缓存，则直接下发完整 JSON 响应；否则透传模型原始流式内容，
-        由前端自行清理并在需要时回填缓存。
+        Used by background jobs: a cache hit is returned as-is, otherwise the
+        provider's full (non-streaming) output is parsed the same way as an
+        abandoned stream and stored before returning.
         """
         provider = await self._resolve_provider(request)
+        cache = self._get_cache()
+        cache_key = self._make_cache_key(provider.name, request)
+        cached = await self._lookup_cached(cache, provider.name, request.dish_name)
+        if cached is not None:
+            source, cached_payload = cached
+            return self._build_response(
+                source, cached_payload, cached=True, requested_provider=provider.name
+            )
+
+        await self._check_recent_failure(cache, cache_key, provider.name, request.dish_name)
+        payload = await self._generate_with_failure_tracking(cache, cache_key, provider, request)
+        await self._store_in_cache(
+            cache,
+            cache_key,
+            payload,
+            provider_name=provider.name,
+            dish_name=request.dish_name,
+        )
+        return self._build_response(provider.name, payload, cached=False)
+
+    async def generate_batch(self, request: RecipeBatchRequest) -> list[BatchOutcome]:
+        """Serve several dishes, generating the misses in multi-dish requests."""
+        return await self.run_batch(await self.plan_batch(request))
+
+    async def plan_batch(self, request: RecipeBatchRequest) -> BatchPlan:
+        """Resolve providers and cache hits; nothing is generated yet.
+
+        Split from :meth:`run_batch` so callers can charge budgets for the
+        misses before any upstream call is made.
+        """
+        cache = self._get_cache()
+        plan = BatchPlan(outcomes=[])
+        seen: set[str] = set()
+        for dish_name in request.dish_names:
+            normalized = dish_name.strip().lower()
+            if normalized in seen:
+                continue
+            seen.add(normalized)
+            item = request.item(dish_name)
+            provider = await self._resolve_provider(item)
+            outcome = BatchOutcome(dish_name=dish_name, provider=provider.name)
+            plan.outcomes.append(outcome)
+            cached = await self._lookup_cached(cache, provider.name, dish_name)
+            if cached is not None:
+                source, payload = cached
+                outcome.response = self._build_response(
+                    source, payload, cached=True, requested_provider=provider.name
+                )
+                continue
+            try:
+                await self._check_recent_failure(
+                    cache, self._make_cache_key(provider.name, item), provider.name, dish_name
+                )
+            except RecipeRecentlyFailedError as exc:
+                outcome.error = exc
+                continue
+            plan.misses.append((outcome, provider, item))
+        return plan
+
+    async def run_batch(self, plan: BatchPlan) -> list[BatchOutcome]:
+        """Generate the misses of ``plan``, ``BATCH_GENERATION_SIZE`` dishes per request.
+
+        Recipes are cached as soon as their part of the output is complete.
+        Dishes missing from, or invalid in, the combined output are then
+        regenerated one at a time through the regular single-dish path.
+        """
+        cache = self._get_cache()
+        size = max(self._settings.batch_generation_size, 1)
+        groups: Dict[str, list[tuple[BatchOutcome, RecipeLLMProvider, RecipeGenerationRequest]]] = {}
+        for miss in plan.misses:
+            groups.setdefault(miss[1].name, []).append(miss)
+
+        leftovers = []
+        for group in groups.values():
+            for start in range(0, len(group), size):
+                chunk = group[start : start + size]
+                if len(chunk) == 1:
+                    leftovers.extend(chunk)
+                else:
+                    leftovers.extend(await self._generate_multi(cache, chunk))
+
+        for outcome, provider, item in leftovers:
+            cache_key = self._make_cache_key(provider.name, item)
+            try:
+                payload = await self._generate_with_failure_tracking(
+                    cache, cache_key, provider, item
+                )
+            except RecipeServiceError as exc:
+                outcome.error = exc
+                BATCH_RECIPES.labels(provider=provider.name, result="failed").inc()
+                continue
+            await self._store_in_cache(
+                cache, cache_key, payload, provider_name=provider.name, dish_name=item.dish_name
+            )
+            outcome.response = self._build_response(provider.name, payload, cached=False)
+            BATCH_RECIPES.labels(provider=provider.name, result="regenerated").inc()
+        return plan.outcomes
+
+    async def _generate_multi(
+        self,
+        cache: CacheBackend | None,
+        chunk: Sequence[tuple[BatchOutcome, RecipeLLMProvider, RecipeGenerationRequest]],
+    ) -> list[tuple[BatchOutcome, RecipeLLMProvider, RecipeGenerationRequest]]:
+        """Generate ``chunk`` in one upstream request; return the dishes it did not deliver."""
+        provider = chunk[0][1]
+        pending = {miss[2].dish_name.strip().lower(): miss for miss in chunk}
+        prompt_template = await load_prompt(self._settings.system_prompt_path)
+        prompt = self._build_batch_prompt(prompt_template, [item for _, _, item in chunk])
+        splitter = KeyedObjectSplitter()
+        try:
+            # Not scaled by dish count: the provider's own output limit caps
+            # the request anyway, and dishes cut off by it are retried singly.
+            stream = self._provider_stream(provider, prompt, max_tokens=self.output_token_budget())
+            async with aclosing(stream) as source:  # type: ignore[type-var]
+                async for text in source:
+                    for key, payload in splitter.feed(text):
+                        miss = pending.get(key.strip().lower())
+                        if miss is None or not isinstance(payload, dict):
+                            continue
+                        try:
+                            validate_recipe_output(payload)
+                        except RecipeSchemaError as exc:
+                            logger.warning("批量生成的菜谱 Schema 校验失败 (菜名: %s): %s", key, exc)
+                            continue
+                        outcome, _, item = pending.pop(key.strip().lower())
+                        await self._store_in_cache(
+                            cache,
+                            self._make_cache_key(provider.name, item),
+                            payload,
+                            provider_name=provider.name,
+                            dish_name=item.dish_name,
+                        )
+                        outcome.response = self._build_response(
+                            provider.name, payload, cached=False
+                        )
+                        BATCH_RECIPES.labels(provider=provider.name, result="batched").inc()
+                    if splitter.finished:
+                        break
+        except RecipeProviderError as exc:
+            logger.warning("Batch generation via %s failed: %s", provider.name, exc)
+        if pending:
+            logger.info(
+                "Batch of %d via %s left %d dish(es) to regenerate individually",
+                len(chunk),
+                provider.name,
+                len(pending),
+            )
+        return list(pending.values())
+
+    async def _generate_validated(
+        self, provider: RecipeLLMProvider, request: RecipeGenerationRequest
+    ) -> Dict[str, Any]:
+        """Run one non-streaming generation and return the validated recipe."""
         prompt_template = await load_prompt(self._settings.system_prompt_path)
         prompt = self._build_prompt(prompt_template, request)
-        logger.debug("Generated streaming prompt for %s: %s", request.dish_name, prompt)
+        try:
+            raw = await provider.generate(prompt=prompt, max_tokens=self.output_token_budget())
+        except (httpx.HTTPError, ValueError) as exc:
+            logger.exception("Provider request failed")
+            raise RecipeProviderError(
+                "provider request failed", failure=_provider_failure(exc)
+            ) from exc
+        return self._parse_validated(raw)
 
-        # Check cache first
+    @staticmethod
+    def _parse_validated(raw: str) -> Dict[str, Any]:
+        payload = extract_recipe_json(raw)
+        if payload is None:
+            raise RecipeValidationError(
+                "provider output contained no recipe JSON", failure="invalid_json"
+            )
+        try:
+            validate_recipe_output(payload)
+        except RecipeSchemaError as exc:
+            raise RecipeValidationError(str(exc)) from exc
+        return payload
+
+    async def missing_dishes(self, provider_name: str, dish_names: Sequence[str]) -> list[str]:
+        """Dishes with neither a cached recipe nor a live negative entry for ``provider_name``.
+
+        Reads keys directly in two batches, so offline warm-up does not count
+        as traffic in the lookup metrics or popularity statistics.
+        """
         cache = self._get_cache()
+        unique: Dict[str, str] = {}
+        for dish_name in dish_names:
+            if dish_name.strip():
+                unique.setdefault(dish_name.strip().lower(), dish_name.strip())
+        dishes = list(unique.values())
+        if cache is None or not dishes:
+            return dishes
+        keys = [self._make_cache_key_from_dish(provider_name, dish) for dish in dishes]
+        cached = await cache.mget(keys)
+        negative = await cache.mget([f"negative:{key}" for key in keys])
+        return [
+            dish
+            for dish, hit, failed in zip(dishes, cached, negative)
+            if hit is None and failed is None
+        ]
+
+    def output_token_budget(self) -> int | None:
+        """``max_tokens`` for an upstream generation, or ``None`` for no cap.
+
+        The cap is opt-in: ``MAX_OUTPUT_TOKENS`` sets it, a negative value
+        derives it from the recipe schema, and ``0`` sends none. Providers
+        clamp it to their ``max_output_tokens`` metadata.
+        """
+        budget = self._settings.max_output_tokens
+        if budget == 0:
+            return None
+        if budget < 0:
+            try:
+                budget = recipe_output_token_budget()
+            except (OSError, ValueError):
+                logger.warning("Cannot derive max_tokens from the recipe schema", exc_info=True)
+                return None
+        return budget
+
+    async def build_generation_prompt(self, request: RecipeGenerationRequest) -> str:
+        """The exact prompt a single-dish generation sends upstream."""
+        prompt_template = await load_prompt(self._settings.system_prompt_path)
+        return self._build_prompt(prompt_template, request)
+
+    async def ingest_generation(
+        self, provider_name: str, request: RecipeGenerationRequest, raw: str
+    ) -> RecipeGenerationResponse:
+        """Validate and cache output generated outside the service (e.g. a vendor batch).
+
+        Invalid output is negative-cached like any other failed generation
+        and raised as :class:`RecipeValidationError`.
+        """
+        cache = self._get_cache()
+        cache_key = self._make_cache_key(provider_name, request)
+        try:
+            payload = self._parse_validated(raw)
+        except RecipeValidationError as exc:
+            await self._record_failure(cache, cache_key, exc.failure, str(exc))
+            raise
+        await self._store_in_cache(
+            cache, cache_key, payload, provider_name=provider_name, dish_name=request.dish_name
+        )
+        return self._build_response(provider_name, payload, cached=False)
+
+    async def _generate_with_failure_tracking(
+        self,
+        cache: CacheBackend | None,
+        cache_key: str,
+        provider: RecipeLLMProvider,
+        request: RecipeGenerationRequest,
+    ) -> Dict[str, Any]:
+        try:
+            return await self._generate_validated(provider, request)
+        except (RecipeValidationError, RecipeProviderError) as exc:
+            if exc.failure is not None:
+                await self._record_failure(cache, cache_key, exc.failure, str(exc))
+            raise
+
+    async def _check_recent_failure(
+        self, cache: CacheBackend | None, cache_key: str, provider_name: str, dish_name: str
+    ) -> None:
+        """Raise :class:`RecipeRecentlyFailedError` while a negative entry is live."""
+        if cache is None or self._settings.negative_cache_ttl_seconds <= 0:
+            return
+        raw = await cache.get(f"negative:{cache_key}")
+        if raw is None:
+            return
+        try:
+            entry = json.loads(raw)
+        except json.JSONDecodeError:
+            return
+        CACHE_LOOKUPS.labels(provider=provider_name, result="negative_hit").inc()
+        retry_after = max(math.ceil(float(entry.get("until", 0)) - time.time()), 1)
+        failure = entry.get("failure", "unknown")
+        raise RecipeRecentlyFailedError(
+            f"recipe '{dish_name}' for provider '{provider_name}' failed recently "
+            f"({failure}, {entry.get('failures', 1)} time(s)); retry in {retry_after}s",
+            failure=failure,
+            retry_after=retry_after,
+        )
+
+    async def _record_failure(
+        self, cache: CacheBackend | None, cache_key: str, failure: str, message: str
+    ) -> None:
+        """Store a negative entry whose TTL doubles with each consecutive failure."""
+        base = self._settings.negative_cache_ttl_seconds
+        if cache is None or base <= 0:
+            return
+        ceiling = max(self._settings.negative_cache_max_ttl_seconds, base)
+        try:
+            # The failure count outlives the entries so back-off keeps growing
+            # across retries; a successful store resets it.
+            failures = await cache.incr(f"failures:{cache_key}", ttl=ceiling * 4)
+            ttl = min(base * 2 ** min(failures - 1, 20), ceiling)
+            entry = {
+                "failure": failure,
+                "message": message[:200],
+                "failures": failures,
+                "until": time.time() + ttl,
+            }
+            await cache.set(f"negative:{cache_key}", json.dumps(entry, ensure_ascii=False), ttl=ttl)
+        except Exception:
+            logger.warning("Failed to record negative cache entry for %s", cache_key, exc_info=True)
+            return
+        logger.warning(
+            "Negative-cached %s for %ss after %d failure(s) (%s)", cache_key, ttl, failures, failure
+        )
+
+    async def _revalidate_entry(
+        self, cache_key: str, provider_name: str, dish_name: str
+    ) -> None:
+        """Regenerate a stale entry in the background (see ``CacheRevalidator``)."""
+        cache = self._get_cache()
+        if cache is None:
+            return
+        raw = await cache.get(cache_key)
+        if raw is not None:
+            entry = await self._decode_entry(raw)
+            if entry is not None and not entry.stale:
+                return  # refreshed meanwhile, e.g. by another worker or the frontend
+        if self._registry is not None:
+            provider = self._registry.get(provider_name)
+        elif self._provider is not None and self._provider.name == provider_name:
+            provider = self._provider
+        else:
+            return
+        await self._check_recent_failure(cache, cache_key, provider_name, dish_name)
+        request = RecipeGenerationRequest(dish_name=dish_name, provider=provider_name)
+        payload = await self._generate_with_failure_tracking(cache, cache_key, provider, request)
+        await self._store_in_cache(
+            cache, cache_key, payload, provider_name=provider_name, dish_name=dish_name
+        )
+        logger.info("Revalidated stale recipe '%s' (%s)", dish_name, provider_name)
+
+    async def plan_stream(self, request: RecipeGenerationRequest) -> StreamPlan:
+        """Resolve the provider and look up the cache before streaming.
+
+        Lets callers tell a cache hit from a paid generation (e.g. for rate
+        limits) before any response bytes are sent.
+        """
+        provider = await self._resolve_provider(request)
         cache_key = self._make_cache_key(provider.name, request)
-        cached_payload = await self._fetch_from_cache(cache, cache_key)
+        cache = self._get_cache()
+        cached = await self._lookup_cached(cache, provider.name, request.dish_name)
+        if cached is None:
+            await self._check_recent_failure(cache, cache_key, provider.name, request.dish_name)
+            return StreamPlan(provider=provider, cache_key=cache_key, cached_payload=None)
+        source, cached_payload = cached
+        return StreamPlan(
+            provider=provider,
+            cache_key=cache_key,
+            cached_payload=cached_payload,
+            cached_provider=source,
+        )
+
+    def find_resume_point(
+        self, request: RecipeGenerationRequest, last_event_id: str | None
+    ) -> tuple[ActiveStream, int] | None:
+        """Return the buffered stream a ``Last-Event-ID`` refers to, if still held."""
+        if not last_event_id or self._streams is None:
+            return None
+        resume = self._streams.resume(last_event_id)
+        if resume is None or resume[0].dish_name != request.dish_name:
+            return None
+        return resume
+
+    async def generate_recipe_stream(
+        self, request: RecipeGenerationRequest
+    ) -> AsyncIterator[str]:
+        """Generate recipe with streaming output.
+
+        如果命中缓存，则直接下发完整 JSON 响应；否则透传模型原始流式内容，
+        由前端自行清理并在需要时回填缓存。
+        """
+        async for _, chunk in self.stream_recipe_events(request):
+            yield chunk
+
+    async def stream_recipe_events(
+        self,
+        request: RecipeGenerationRequest,
+        *,
+        resume: tuple[ActiveStream, int] | None = None,
+        plan: StreamPlan | None = None,
+    ) -> AsyncIterator[tuple[str | None, str]]:
+        """Like :meth:`generate_recipe_stream` but yield ``(event_id, chunk)``.
 
-        if cached_payload is not None:
+        Chunks of a buffered generation carry ``<stream_id>-<seq>`` IDs; cache
+        hits and unbuffered streams have none. ``resume`` (from
+        :meth:`find_resume_point`) replays the buffer after the given event;
+        ``plan`` (from :meth:`plan_stream`) skips the provider/cache lookup.
+        """
+        if resume is not None:
+            stream, start = resume
+            logger.info(
+                "Resuming stream %s for dish '%s' after chunk %d",
+                stream.stream_id,
+                stream.dish_name,
+                start,
+            )
+            async for event in self._follow_events(stream, start):
+                yield event
+            return
+
+        if plan is None:
+            plan = await self.plan_stream(request)
+        provider, cache_key = plan.provider, plan.cache_key
+
+        if plan.cached_payload is not None:
             # Cache hit: return complete response as single JSON chunk
+            cached_by = plan.cached_provider or provider.name
             logger.info(
                 "Cache hit for streaming request - provider '%s' and dish '%s'",
-                provider.name,
+                cached_by,
                 request.dish_name,
+                extra=HOT_PATH,
+            )
+            response = self._build_response(
+                cached_by, plan.cached_payload, cached=True, requested_provider=provider.name
             )
-            response = self._build_response(provider.name, cached_payload, cached=True)
             # Yield the complete response as JSON
-            yield json.dumps(response.model_dump(), ensure_ascii=False)
+            yield None, json.dumps(response.model_dump(), ensure_ascii=False)
             return
 
         # Cache miss: stream from provider and let frontend handle post-processing
@@ -126,16 +664,132 @@ class RecipeService:
             provider.name,
             request.dish_name,
         )
+        prompt_template = await load_prompt(self._settings.system_prompt_path)
+        prompt = self._build_prompt(prompt_template, request)
+        logger.debug("Generated streaming prompt for %s: %s", request.dish_name, prompt)
+
+        source = self._provider_stream(provider, prompt, max_tokens=self.output_token_budget())
+        if self._streams is None:
+            async for chunk in source:
+                yield None, chunk
+            return
 
+        # The upstream call runs in its own task so a dropped client or a
+        # shutdown drain never throws away tokens that were already paid for.
+        active = self._streams.start(
+            source,
+            cache_key=cache_key,
+            provider_name=provider.name,
+            dish_name=request.dish_name,
+            finalize=self._finalize_stream,
+        )
+        async for event in self._follow_events(active, 0):
+            yield event
+
+    @staticmethod
+    async def _follow_events(
+        stream: ActiveStream, start: int
+    ) -> AsyncIterator[tuple[str | None, str]]:
+        seq = start
+        async for chunk in stream.follow(start):
+            seq += 1
+            yield f"{stream.stream_id}-{seq}", chunk
+
+    async def _provider_stream(
+        self, provider: RecipeLLMProvider, prompt: str, *, max_tokens: int | None = None
+    ) -> AsyncIterator[str]:
         try:
-            async for chunk in provider.generate_stream(prompt=prompt):
+            async for chunk in provider.generate_stream(prompt=prompt, max_tokens=max_tokens):
                 yield chunk
         except httpx.HTTPError as exc:  # pragma: no cover - defensive
             logger.exception("Provider streaming request failed")
-            raise RecipeProviderError("provider streaming request failed") from exc
+            raise RecipeProviderError(
+                "provider streaming request failed", failure=_provider_failure(exc)
+            ) from exc
+
+    async def _finalize_stream(self, stream: ActiveStream) -> None:
+        """Persist stream output nobody else will persist.
+
+        A client that received the whole stream posts the cleaned recipe back
+        through ``/cache`` itself. If it disconnected, or the server is
+        draining, the backend caches the recipe. A stream cut off at the drain
+        deadline keeps its partial text under ``partial:<cache key>``.
+        """
+        cache = self._get_cache()
+        if cache is None:
+            return
+        draining = self._streams is not None and self._streams.draining
+
+        if stream.status == "completed":
+            # A client that received the text repairs and posts it itself with
+            # a more lenient parser, so its output is never negative-cached.
+            delivered = bool(stream.followers)
+            if delivered and not draining:
+                return
+            payload = extract_recipe_json(stream.text)
+            if payload is None:
+                logger.warning(
+                    "无法从流式输出中解析菜谱 (菜名: %s, 提供商: %s)",
+                    stream.dish_name,
+                    stream.provider_name,
+                )
+                if not delivered:
+                    await self._record_failure(
+                        cache, stream.cache_key, "invalid_json", "no recipe JSON in stream output"
+                    )
+                return
+            try:
+                validate_recipe_output(payload)
+            except RecipeSchemaError as exc:
+                logger.warning(
+                    "流式菜谱 Schema 校验失败 (菜名: %s, 提供商: %s): %s",
+                    stream.dish_name,
+                    stream.provider_name,
+                    exc,
+                )
+                if not delivered:
+                    await self._record_failure(cache, stream.cache_key, "schema", str(exc))
+                return
+            await self._store_in_cache(
+                cache,
+                stream.cache_key,
+                payload,
+                provider_name=stream.provider_name,
+                dish_name=stream.dish_name,
+            )
+        elif stream.status == "failed":
+            error = stream.error
+            if isinstance(error, RecipeProviderError) and error.failure is not None:
+                await self._record_failure(cache, stream.cache_key, error.failure, str(error))
+        elif stream.status == "interrupted" and stream.chunks:
+            partial = {
+                "dish_name": stream.dish_name,
+                "provider": stream.provider_name,
+                "content": stream.text,
+            }
+            await cache.set(
+                f"partial:{stream.cache_key}",
+                json.dumps(partial, ensure_ascii=False),
+                ttl=self._settings.partial_stream_ttl_seconds,
+            )
+            logger.info(
+                "Saved %d chars of interrupted stream for '%s' (%s)",
+                len(partial["content"]),
+                stream.dish_name,
+                stream.provider_name,
+            )
 
     async def _resolve_provider(
         self, request: RecipeGenerationRequest
+    ) -> RecipeLLMProvider:
+        with span("resolve_provider", {"airecipe.requested_provider": request.provider or ""}) as active:
+            provider = await self._resolve_provider_inner(request)
+            if active is not None:
+                active.set_attribute("airecipe.provider", provider.name)
+            return provider
+
+    async def _resolve_provider_inner(
+        self, request: RecipeGenerationRequest
     ) -> RecipeLLMProvider:
         if self._registry is not None:
             strategy = request.routing_strategy or self._registry.default_strategy
@@ -143,6 +797,7 @@ class RecipeService:
                 return await self._registry.resolve(
                     requested=request.provider,
                     strategy=strategy,
+                    dish_name=request.dish_name,
                 )
             except KeyError as exc:
                 raise UnknownProviderError(str(exc)) from exc
@@ -173,20 +828,48 @@ class RecipeService:
             f"{template.strip()}\n\n---\n请根据以下用户需求生成符合 Schema 的菜谱：\n{user_context}"
         )
 
+    def _build_batch_prompt(
+        self, template: str, requests: Sequence[RecipeGenerationRequest]
+    ) -> str:
+        first = requests[0]
+        payload = {
+            "dish_names": [request.dish_name for request in requests],
+            "servings": first.servings,
+            "dietary_preferences": first.dietary_preferences,
+            "ingredients": first.ingredients,
+            "language": first.language,
+            "extra_instructions": first.extra_instructions,
+        }
+        user_context = json.dumps(payload, ensure_ascii=False, indent=2)
+        return (
+            f"{template.strip()}\n\n---\n请为 dish_names 中的每道菜分别生成一份符合 Schema 的完整菜谱。"
+            "只输出一个 JSON 对象：键为原样的菜名，值为该菜的菜谱对象，不要输出其他内容。\n"
+            f"{user_context}"
+        )
+
     def _build_response(
-        self, provider_name: str, recipe_payload: Dict[str, Any], *, cached: bool
+        self,
+        provider_name: str,
+        recipe_payload: Dict[str, Any],
+        *,
+        cached: bool,
+        requested_provider: str | None = None,
     ) -> RecipeGenerationResponse:
         response = RecipeGenerationResponse(
             request_id=str(uuid4()),
             provider=provider_name,
             recipe=recipe_payload,
             cached=cached,
+            fallback_from=(
+                requested_provider if requested_provider not in (None, provider_name) else None
+            ),
         )
         logger.info(
             "Generated recipe for '%s' with provider '%s' (cached=%s)",
             recipe_payload.get("菜名", "unknown"),
             provider_name,
             cached,
+            extra=HOT_PATH if cached else None,
         )
         return response
 
@@ -206,7 +889,7 @@ class RecipeService:
         """
         try:
             validate_recipe_output(recipe_payload)
-        except SchemaValidationError as exc:
+        except RecipeSchemaError as exc:
             logger.warning(
                 "前端回传的菜谱 Schema 校验失败 (菜名: %s, 提供商: %s): %s",
                 dish_name,
@@ -217,9 +900,39 @@ class RecipeService:
 
         cache = self._get_cache()
         cache_key = self._make_cache_key_from_dish(provider_name, dish_name)
-        await self._store_in_cache(cache, cache_key, recipe_payload)
+        await self._store_in_cache(
+            cache,
+            cache_key,
+            recipe_payload,
+            provider_name=provider_name,
+            dish_name=dish_name,
+        )
         return self._build_response(provider_name, recipe_payload, cached=False)
 
+    async def search_cached_recipes(
+        self,
+        *,
+        prefix: str | None = None,
+        tag: str | None = None,
+        provider: str | None = None,
+        offset: int = 0,
+        limit: int = 20,
+    ) -> RecipeIndexPage:
+        """Browse cached recipes through the secondary index.
+
+        Never touches the LLM path; returns an empty page when no index is
+        configured for this deployment.
+        """
+        if self._index is None:
+            return RecipeIndexPage(total=0, offset=offset, limit=limit)
+        return await self._index.search(
+            prefix=prefix,
+            tag=tag,
+            provider=provider,
+            offset=offset,
+            limit=limit,
+        )
+
     async def get_recipe_from_cache(
         self,
         dish_name: str,
@@ -249,31 +962,36 @@ class RecipeService:
         cache = self._get_cache()
         cache_key = self._make_cache_key_from_dish(provider_name, dish_name)
 
-        logger.info(
+        logger.debug(
             "正在查询缓存 - 菜名: '%s', 提供商: '%s', 缓存键: %s",
             dish_name,
             provider_name,
             cache_key
         )
 
-        cached_payload = await self._fetch_from_cache(cache, cache_key)
+        cached = await self._lookup_cached(cache, provider_name, dish_name)
 
-        if cached_payload is None:
+        if cached is None:
             logger.info(
                 "缓存未命中 - 菜名: '%s', 提供商: '%s'",
                 dish_name,
                 provider_name,
+                extra=HOT_PATH,
             )
             raise RecipeCacheMissError(
                 f"菜谱 '{dish_name}' (提供商: '{provider_name}') 尚未生成"
             )
 
+        source, cached_payload = cached
         logger.info(
             "缓存命中 - 菜名: '%s', 提供商: '%s'",
             dish_name,
-            provider_name,
+            source,
+            extra=HOT_PATH,
+        )
+        return self._build_response(
+            source, cached_payload, cached=True, requested_provider=provider_name
         )
-        return self._build_response(provider_name, cached_payload, cached=True)
 
     def _make_cache_key(
         self, provider_name: str, request: RecipeGenerationRequest
@@ -290,37 +1008,248 @@ class RecipeService:
         return f"recipe:{digest}"
 
     async def _fetch_from_cache(
-        self, cache: CacheBackend | None, key: str
+        self,
+        cache: CacheBackend | None,
+        key: str,
+        provider_name: str,
+        *,
+        dish_name: str | None = None,
     ) -> Dict[str, Any] | None:
+        """Return the cached recipe under ``key``.
+
+        Entries from an older prompt/schema version are still returned; when
+        ``dish_name`` is known they are also queued for regeneration.
+        """
         if cache is None:
             return None
-        cached = await cache.get(key)
-        if cached is None:
-            return None
+        with span("cache.fetch", {"airecipe.provider": provider_name}) as active:
+            try:
+                cached = await cache.get(key)
+            except Exception:
+                CACHE_LOOKUPS.labels(provider=provider_name, result="error").inc()
+                raise
+            if cached is None:
+                CACHE_LOOKUPS.labels(provider=provider_name, result="miss").inc()
+                if active is not None:
+                    active.set_attribute("airecipe.cache_result", "miss")
+                return None
+            entry = await self._decode_entry(cached)
+            if entry is None:
+                CACHE_LOOKUPS.labels(provider=provider_name, result="error").inc()
+                await cache.delete(key)
+                if self._index is not None:
+                    await self._index.remove(key)
+                return None
+            payload = entry.recipe
+            result = "stale_hit" if entry.stale else "hit"
+            CACHE_LOOKUPS.labels(provider=provider_name, result=result).inc()
+            if active is not None:
+                active.set_attribute("airecipe.cache_result", result)
+            if dish_name is not None:
+                if entry.legacy:
+                    await self._adopt_legacy_entry(cache, key, payload, provider_name, dish_name)
+                elif entry.stale:
+                    self._schedule_revalidation(key, provider_name, dish_name)
+            return payload
+
+    async def content_version(self) -> str:
+        """Short hash of the system prompt and recipe schema cached entries depend on."""
+        if self._content_version is None:
+            try:
+                prompt = await load_prompt(self._settings.system_prompt_path)
+            except FileNotFoundError:
+                prompt = ""
+            try:
+                schema = json.dumps(_load_recipe_schema(), sort_keys=True, ensure_ascii=False)
+            except (OSError, ValueError):
+                schema = ""
+            digest = hashlib.sha256(f"{prompt}\0{schema}".encode("utf-8")).hexdigest()
+            self._content_version = digest[:12]
+        return self._content_version
+
+    async def _encode_entry(
+        self, payload: Dict[str, Any], *, provider_name: str, dish_name: str
+    ) -> str:
+        envelope = {
+            "version": await self.content_version(),
+            "provider": provider_name,
+            "dish_name": dish_name,
+            "created_at": time.time(),
+            "recipe": payload,
+        }
+        return json.dumps(envelope, ensure_ascii=False)
+
+    async def _decode_entry(self, raw: str) -> _CacheEntry | None:
+        """Decode a stored entry, or return None if it is unreadable.
+
+        Bare recipes written before entries were versioned are flagged as
+        ``legacy`` but not stale: nothing records which prompt produced them,
+        so they are kept rather than all queued for regeneration at once.
+        """
         try:
-            return json.loads(cached)
+            data = json.loads(raw)
         except json.JSONDecodeError:
-            await cache.delete(key)
             return None
+        if not isinstance(data, dict):
+            return None
+        recipe = data.get("recipe")
+        if "version" in data and isinstance(recipe, dict):
+            return _CacheEntry(recipe, data["version"] != await self.content_version(), False)
+        return _CacheEntry(data, False, True)
+
+    async def _adopt_legacy_entry(
+        self,
+        cache: CacheBackend,
+        key: str,
+        payload: Dict[str, Any],
+        provider_name: str,
+        dish_name: str,
+    ) -> None:
+        """Rewrite a bare legacy recipe in the versioned envelope, as fresh."""
+        try:
+            entry = await self._encode_entry(
+                payload, provider_name=provider_name, dish_name=dish_name
+            )
+            await cache.set(key, entry)
+            if self._index is not None:
+                await self._index.record(
+                    cache_key=key,
+                    dish_name=dish_name,
+                    provider_name=provider_name,
+                    payload=payload,
+                )
+        except Exception:
+            logger.warning("Failed to rewrite legacy cache entry %s", key, exc_info=True)
+            return
+        logger.info("Adopted legacy cache entry %s for '%s'", key, dish_name)
+
+    def _schedule_revalidation(self, cache_key: str, provider_name: str, dish_name: str) -> None:
+        if self._revalidator is None:
+            return
+        weight = 1.0
+        if self._popularity is not None:
+            # Dishes that were hot before the entry went stale go first.
+            weight += math.log2(
+                1 + self._popularity.estimate(provider_name, dish_name.strip().lower())
+            )
+        self._revalidator.submit(
+            cache_key,
+            lambda: self._revalidate_entry(cache_key, provider_name, dish_name),
+            weight=weight,
+        )
+
+    async def _lookup_cached(
+        self, cache: CacheBackend | None, provider_name: str, dish_name: str
+    ) -> tuple[str, Dict[str, Any]] | None:
+        """Return ``(source provider, recipe)`` for a dish, or None on a miss.
+
+        The resolved provider's key is tried first. With
+        ``CACHE_PROVIDER_FALLBACK`` enabled, the other enabled providers' keys
+        are then read in one batched ``mget``, in configuration order.
+        """
+        if self._popularity is not None:
+            # Normalised like the cache key so spelling variants count as one dish.
+            self._popularity.record(provider_name, dish_name.strip().lower())
+        key = self._make_cache_key_from_dish(provider_name, dish_name)
+        payload = await self._fetch_from_cache(cache, key, provider_name, dish_name=dish_name)
+        if payload is not None:
+            return provider_name, payload
+        if cache is None or not self._settings.cache_provider_fallback:
+            return None
+
+        candidates = self._fallback_providers(provider_name)
+        if not candidates:
+            return None
+        keys = [self._make_cache_key_from_dish(name, dish_name) for name in candidates]
+        with span("cache.fetch_fallback", {"airecipe.provider": provider_name}) as active:
+            try:
+                values = await cache.mget(keys)
+            except Exception:
+                logger.warning("Cross-provider cache lookup failed", exc_info=True)
+                return None
+            for name, key, raw in zip(candidates, keys, values):
+                entry = await self._decode_entry(raw) if raw is not None else None
+                if entry is None:
+                    continue
+                payload = entry.recipe
+                if entry.legacy:
+                    await self._adopt_legacy_entry(cache, key, payload, name, dish_name)
+                elif entry.stale:
+                    self._schedule_revalidation(key, name, dish_name)
+                CACHE_LOOKUPS.labels(provider=name, result="fallback_hit").inc()
+                if active is not None:
+                    active.set_attribute("airecipe.cache_source", name)
+                return name, payload
+        return None
+
+    def _fallback_providers(self, exclude: str) -> list[str]:
+        if self._registry is None:
+            return []
+        return [
+            name
+            for name, config in self._registry.config.providers.items()
+            if config.switch and name != exclude
+        ]
+
+    async def suggest_dishes(self, prefix: str, *, limit: int = 10) -> list[DishSuggestion]:
+        """Suggest already-cached dishes for a partially typed name.
+
+        Steering users towards existing entries turns would-be generations
+        into cache hits.
+        """
+        if self._suggester is None:
+            return []
+        if self._index is not None:
+            await self._index.refresh()
+        return self._suggester.suggest(prefix, limit=limit)
+
+    async def popular_dishes(
+        self, *, limit: int = 20, provider: str | None = None
+    ) -> list[PopularDish]:
+        """Most requested dishes over the popularity window (approximate)."""
+        if self._popularity is None:
+            return []
+        return await self._popularity.top(limit, provider=provider)
 
     async def _store_in_cache(
-        self, cache: CacheBackend | None, key: str, payload: Dict[str, Any]
+        self,
+        cache: CacheBackend | None,
+        key: str,
+        payload: Dict[str, Any],
+        *,
+        provider_name: str,
+        dish_name: str,
     ) -> None:
         if cache is None:
             return
 
-        dish_name = payload.get("菜名", "未知菜名")
+        recipe_name = payload.get("菜名", "未知菜名")
         logger.info(
             "准备缓存菜谱 - 菜名: '%s', 缓存键: %s",
-            dish_name,
+            recipe_name,
             key
         )
 
-        await cache.set(key, json.dumps(payload, ensure_ascii=False))
+        with span("cache.store", {"airecipe.provider": provider_name}):
+            entry = await self._encode_entry(
+                payload, provider_name=provider_name, dish_name=dish_name
+            )
+            await cache.set(key, entry)
+            if self._settings.negative_cache_ttl_seconds > 0:
+                await cache.delete(f"negative:{key}")
+                await cache.delete(f"failures:{key}")
+
+            if self._index is not None:
+                await self._index.record(
+                    cache_key=key,
+                    dish_name=dish_name,
+                    provider_name=provider_name,
+                    payload=payload,
+                )
 
         logger.info(
             "成功缓存菜谱 - 菜名: '%s', 缓存键: %s",
-            dish_name,
+            recipe_name,
             key
         )
 
@@ -0,0 +1,126 @@
+"""Background regeneration of cache entries written under an older prompt/schema.
+
+Outdated entries keep being served; every stale hit calls
+:meth:`CacheRevalidator.submit`, which queues the key or raises its priority.
+One background loop regenerates the most requested key first, at most
+``per_minute`` keys per minute, so a prompt change never turns into a
+thundering herd of paid generations. A short ``revalidate:<key>`` lock taken
+through ``CacheBackend.set_if_absent`` keeps workers sharing a cache from
+regenerating the same entry twice.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from typing import Awaitable, Callable, Dict
+
+from app.core.cache import CacheBackend
+from app.core.metrics import QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+Regenerate = Callable[[], Awaitable[None]]
+
+
+class CacheRevalidator:
+    """Rate-limited, popularity-ordered queue of stale cache keys."""
+
+    def __init__(
+        self,
+        cache: CacheBackend,
+        *,
+        per_minute: float = 30.0,
+        lock_ttl: int = 600,
+        max_pending: int = 10000,
+    ) -> None:
+        self._cache = cache
+        self._per_minute = per_minute
+        self._lock_ttl = lock_ttl
+        self._max_pending = max_pending
+        # key -> [priority, regenerate]; the heap holds (-priority, seq, key)
+        # snapshots and outdated ones are skipped when popped. Each priority
+        # bump adds a snapshot, so the heap is rebuilt from ``_pending`` once
+        # it holds more than twice as many entries.
+        self._pending: Dict[str, list] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._per_minute > 0
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def submit(self, cache_key: str, regenerate: Regenerate, *, weight: float = 1.0) -> None:
+        """Queue ``cache_key`` for regeneration, or raise its priority by ``weight``."""
+        if not self.enabled:
+            return
+        entry = self._pending.get(cache_key)
+        if entry is None:
+            if len(self._pending) >= self._max_pending:
+                return
+            entry = self._pending[cache_key] = [0.0, regenerate]
+        entry[0] += weight
+        if len(self._heap) >= 2 * len(self._pending):
+            # Insertion order keeps first-queued keys first among equals.
+            self._heap = [
+                (-priority, next(self._seq), key) for key, (priority, _) in self._pending.items()
+            ]
+            heapq.heapify(self._heap)
+        else:
+            heapq.heappush(self._heap, (-entry[0], next(self._seq), cache_key))
+        QUEUE_DEPTH.labels(queue="revalidate").set(len(self._pending))
+        self._wake.set()
+
+    def start(self) -> None:
+        if self._task is None and self.enabled:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def _pop(self) -> tuple[str, Regenerate] | None:
+        while self._heap:
+            negative, _, cache_key = heapq.heappop(self._heap)
+            entry = self._pending.get(cache_key)
+            if entry is None or -negative != entry[0]:
+                continue
+            del self._pending[cache_key]
+            QUEUE_DEPTH.labels(queue="revalidate").set(len(self._pending))
+            return cache_key, entry[1]
+        return None
+
+    async def _run(self) -> None:
+        interval = 60.0 / self._per_minute
+        while True:
+            item = self._pop()
+            if item is None:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+            cache_key, regenerate = item
+            try:
+                owned = await self._cache.set_if_absent(
+                    f"revalidate:{cache_key}", "1", ttl=self._lock_ttl
+                )
+            except Exception:
+                logger.warning("Failed to take revalidation lock for %s", cache_key, exc_info=True)
+                owned = False
+            if not owned:
+                continue
+            try:
+                await regenerate()
+            except Exception as exc:
+                logger.warning("Revalidation of %s failed: %s", cache_key, exc)
+            await asyncio.sleep(interval)
@@ -0,0 +1,224 @@
+"""Upstream generations that run independently of the client connection.
+
+A cache-miss stream is produced by a background task that appends chunks to
+an :class:`ActiveStream` buffer; the HTTP response merely follows the buffer.
+A client disconnect therefore never wastes the upstream call, and on shutdown
+:meth:`StreamManager.drain` can let running generations finish (or record
+their partial output) before provider clients and the cache are closed.
+
+Every chunk is addressable as ``<stream_id>-<seq>`` (``seq`` counts from 1),
+which the router sends as the SSE event ID. Buffers stay around for
+``resume_window`` seconds after the stream ends so a client that reconnects
+with ``Last-Event-ID`` resumes where it left off instead of regenerating.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Dict, Literal
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+StreamStatus = Literal["running", "completed", "failed", "interrupted"]
+
+
+class StreamsDrainingError(RuntimeError):
+    """Raised when a new stream is requested while the server is draining."""
+
+
+class StreamInterruptedError(RuntimeError):
+    """Raised to followers of a stream cut off at the drain deadline."""
+
+
+@dataclass(eq=False)
+class ActiveStream:
+    """Buffered output of one upstream generation."""
+
+    stream_id: str
+    cache_key: str
+    provider_name: str
+    dish_name: str
+    chunks: list[str] = field(default_factory=list)
+    status: StreamStatus = "running"
+    error: BaseException | None = None
+    followers: int = 0
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status != "running"
+
+    @property
+    def text(self) -> str:
+        return "".join(self.chunks)
+
+    def _notify(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def append(self, chunk: str) -> None:
+        self.chunks.append(chunk)
+        self._notify()
+
+    def finish(self, status: StreamStatus, error: BaseException | None = None) -> None:
+        self.status = status
+        self.error = error
+        self._notify()
+
+    async def follow(self, start: int = 0) -> AsyncIterator[str]:
+        """Yield buffered chunks from ``start`` and then live ones until done."""
+        self.followers += 1
+        try:
+            index = start
+            while True:
+                waiter = self._changed
+                while index < len(self.chunks):
+                    yield self.chunks[index]
+                    index += 1
+                if self.done:
+                    break
+                await waiter.wait()
+        finally:
+            self.followers -= 1
+        if self.status == "failed" and self.error is not None:
+            raise self.error
+        if self.status == "interrupted":
+            raise StreamInterruptedError("stream interrupted by server shutdown")
+
+
+Finalizer = Callable[[ActiveStream], Awaitable[None]]
+
+
+class StreamManager:
+    """Own the producer tasks of every running stream in this process."""
+
+    def __init__(self, *, resume_window: float = 120.0) -> None:
+        self._streams: Dict[str, ActiveStream] = {}
+        self._tasks: Dict[str, asyncio.Task[None]] = {}
+        self._draining = False
+        self._drain_started = 0.0
+        self._drain_task: asyncio.Task[None] | None = None
+        self._resume_window = resume_window
+
+    @property
+    def draining(self) -> bool:
+        return self._draining
+
+    @property
+    def active_count(self) -> int:
+        return len(self._tasks)
+
+    def start(
+        self,
+        source: AsyncIterator[str],
+        *,
+        cache_key: str,
+        provider_name: str,
+        dish_name: str,
+        finalize: Finalizer | None = None,
+    ) -> ActiveStream:
+        """Run ``source`` in the background and return its buffer.
+
+        ``finalize`` is awaited once the stream ends, whatever the outcome,
+        e.g. to cache the output when no follower was left to receive it.
+        """
+        if self._draining:
+            raise StreamsDrainingError("server is draining; not accepting new streams")
+        stream = ActiveStream(
+            stream_id=uuid4().hex,
+            cache_key=cache_key,
+            provider_name=provider_name,
+            dish_name=dish_name,
+        )
+        self._streams[stream.stream_id] = stream
+        self._tasks[stream.stream_id] = asyncio.create_task(
+            self._produce(stream, source, finalize)
+        )
+        return stream
+
+    async def _produce(
+        self, stream: ActiveStream, source: AsyncIterator[str], finalize: Finalizer | None
+    ) -> None:
+        try:
+            async with aclosing(source):  # type: ignore[type-var]
+                async for chunk in source:
+                    stream.append(chunk)
+        except asyncio.CancelledError:
+            stream.finish("interrupted")
+            await self._finalize(stream, finalize)
+            raise
+        except Exception as exc:
+            stream.finish("failed", exc)
+        else:
+            stream.finish("completed")
+        await self._finalize(stream, finalize)
+
+    async def _finalize(self, stream: ActiveStream, finalize: Finalizer | None) -> None:
+        try:
+            if finalize is not None:
+                await finalize(stream)
+        except Exception:
+            logger.exception("Failed to finalise stream %s", stream.stream_id)
+        finally:
+            self._tasks.pop(stream.stream_id, None)
+            asyncio.get_running_loop().call_later(
+                self._resume_window, self._streams.pop, stream.stream_id, None
+            )
+
+    def resume(self, event_id: str) -> tuple[ActiveStream, int] | None:
+        """Map a ``Last-Event-ID`` to its stream and the next chunk index."""
+        stream_id, _, seq = event_id.strip().rpartition("-")
+        if not stream_id or not seq.isdigit():
+            return None
+        stream = self._streams.get(stream_id)
+        if stream is None or int(seq) > len(stream.chunks):
+            return None
+        return stream, int(seq)
+
+    def begin_drain(self) -> None:
+        """Refuse new streams from now on; running ones are unaffected."""
+        if not self._draining:
+            logger.info("Stream drain started with %d active stream(s)", self.active_count)
+            self._drain_started = time.monotonic()
+        self._draining = True
+
+    def start_drain(self, timeout: float) -> None:
+        """Begin draining and run :meth:`drain` in the background.
+
+        Called from the shutdown signal handler: the server only reaches the
+        lifespan shutdown once every connection is closed, so streams are cut
+        off here at the deadline and their responses end on their own.
+        """
+        self.begin_drain()
+        if self._drain_task is None:
+            self._drain_task = asyncio.create_task(self.drain(timeout))
+
+    async def drain(self, timeout: float) -> None:
+        """Cut off streams still running ``timeout`` seconds after the drain began.
+
+        The window starts at :meth:`begin_drain` (the shutdown signal or the
+        admin endpoint), so time spent waiting for connections counts too.
+        """
+        self.begin_drain()
+        background = self._drain_task
+        if background is not None and background is not asyncio.current_task():
+            await asyncio.shield(background)
+            return
+        tasks = list(self._tasks.values())
+        if not tasks:
+            return
+        remaining = max(timeout - (time.monotonic() - self._drain_started), 0.0)
+        logger.info("Waiting up to %.0fs for %d stream(s) to finish", remaining, len(tasks))
+        _, pending = await asyncio.wait(tasks, timeout=remaining)
+        if not pending:
+            logger.info("All streams finished before shutdown")
+            return
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        logger.warning("Interrupted %d stream(s) at the drain deadline", len(pending))
@@ -0,0 +1,47 @@
+"""Command-line cache snapshot export and import.
+
+``python main.py --export-cache PATH`` writes every cached recipe of the
+configured backend to a gzip NDJSON snapshot; ``--import-cache PATH``
+restores one, e.g. to move a cache between Redis instances. See
+:mod:`app.services.cache_snapshot` for the format.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Literal
+
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+
+async def _run(action: Literal["export", "import"], path: Path) -> None:
+    from app.core.cache import InMemoryCacheBackend, init_cache_backend
+    from app.core.config import get_settings
+    from app.core.logging_config import configure_logging, shutdown_logging
+    from app.services.cache_snapshot import (
+        export_snapshot_to_file,
+        import_snapshot_from_file,
+    )
+
+    settings = get_settings()
+    configure_logging(settings)
+    cache_backend = await init_cache_backend(settings)
+    if isinstance(cache_backend, InMemoryCacheBackend):
+        logger.warning("In-memory cache: this process cannot see the server's cache")
+    try:
+        if action == "export":
+            await export_snapshot_to_file(cache_backend, path)
+        else:
+            await import_snapshot_from_file(cache_backend, path)
+    finally:
+        await cache_backend.close()
+        shutdown_logging()
+
+
+def run_snapshot(action: Literal["export", "import"], path: Path) -> None:
+    load_dotenv()
+    asyncio.run(_run(action, path))
@@ -0,0 +1,72 @@
+"""Command-line cache warm-up through a vendor batch API.
+
+``python main.py --batch-warmup FILE [--provider NAME]`` reads one dish name
+per line (blank lines and ``#`` comments are ignored), submits the uncached
+ones as asynchronous batches and caches the validated results. Interrupting
+the command is safe: the next run resumes the batches already submitted.
+See :mod:`app.services.batch_warmup`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+
+def read_dish_file(path: Path) -> list[str]:
+    dishes = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            dishes.append(line)
+    return dishes
+
+
+async def _run(path: Path, provider_name: str | None) -> None:
+    from app.core.cache import init_cache_backend
+    from app.core.config import get_llm_providers, get_settings
+    from app.core.logging_config import configure_logging, shutdown_logging
+    from app.llm.registry import ProviderRegistry
+    from app.services import BatchWarmup, BatchWarmupError, RecipeIndex, RecipeService
+
+    settings = get_settings()
+    configure_logging(settings)
+    if settings.cache_backend == "memory":
+        logger.warning("In-memory cache: warmed recipes are lost when this command exits")
+    cache_backend = await init_cache_backend(settings)
+    registry = ProviderRegistry(
+        get_llm_providers(), drain_timeout=settings.provider_drain_seconds
+    )
+    await registry.startup()
+    service = RecipeService(
+        registry=registry, cache=cache_backend, index=RecipeIndex(cache_backend)
+    )
+    try:
+        report = await BatchWarmup(service, registry, cache_backend).run(
+            read_dish_file(path), provider_name
+        )
+        logger.info(
+            "Warm-up finished: %d submitted, %d cached, %d invalid, %d failed (%d batch(es))",
+            report.submitted,
+            report.cached,
+            report.invalid,
+            report.failed,
+            len(report.batches),
+        )
+    except BatchWarmupError as exc:
+        logger.error("Warm-up aborted: %s", exc)
+        raise SystemExit(1) from exc
+    finally:
+        await registry.shutdown()
+        await cache_backend.close()
+        shutdown_logging()
+
+
+def run_batch_warmup(path: Path, provider_name: str | None = None) -> None:
+    load_dotenv()
+    asyncio.run(_run(path, provider_name))
@@ -0,0 +1,74 @@
+"""Dedicated job worker process.
+
+Runs :class:`JobWorkerPool` without an HTTP server so long generations never
+occupy web workers. Requires a cache backend shared with the web processes
+(``CACHE_BACKEND=redis`` or ``shared``); set ``JOB_WORKER_CONCURRENCY=0`` on
+the web side to leave all jobs to these processes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import signal
+
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+
+async def _serve(concurrency: int) -> None:
+    from app.core.cache import init_cache_backend
+    from app.core.config import get_llm_providers, get_settings
+    from app.core.logging_config import configure_logging, shutdown_logging
+    from app.llm.registry import ProviderRegistry
+    from app.services import JobQueue, JobWorkerPool, RecipeIndex, RecipeService
+
+    settings = get_settings()
+    configure_logging(settings)
+    if settings.cache_backend == "memory":
+        logger.warning("In-memory cache: this worker cannot see jobs queued by web workers")
+    cache_backend = await init_cache_backend(settings)
+    registry = ProviderRegistry(
+        get_llm_providers(), drain_timeout=settings.provider_drain_seconds
+    )
+    await registry.startup()
+    queue = JobQueue(
+        cache_backend,
+        ttl=settings.job_ttl_seconds,
+        webhook_allowed_hosts=settings.job_webhook_allowed_hosts,
+    )
+    pool = JobWorkerPool(
+        queue,
+        RecipeService(
+            registry=registry, cache=cache_backend, index=RecipeIndex(cache_backend)
+        ),
+        concurrency=concurrency,
+        job_timeout=settings.job_timeout_seconds,
+        max_attempts=settings.job_max_attempts,
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    pool.start()
+    logger.info("Job worker process %d running", os.getpid())
+    try:
+        await stop.wait()
+    finally:
+        logger.info("Job worker process %d stopping", os.getpid())
+        await pool.stop()
+        await registry.shutdown()
+        await cache_backend.close()
+        shutdown_logging()
+
+
+def run_job_worker(concurrency: int | None = None) -> None:
+    load_dotenv()
+    from app.core.config import get_settings
+
+    concurrency = concurrency or max(get_settings().job_worker_concurrency, 1)
+    asyncio.run(_serve(concurrency))
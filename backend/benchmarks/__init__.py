@@ -0,0 +1,4 @@
+"""Benchmarks for AIRecipe backend hot paths.
+
+Run from the ``backend`` directory, e.g. ``python -m benchmarks.validation``.
+"""
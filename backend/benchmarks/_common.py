@@ -0,0 +1,108 @@
+"""Shared timing helpers for the benchmark scripts."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Iterable
+
+BACKEND_ROOT = Path(__file__).resolve().parent.parent
+
+
+def ensure_backend_on_path() -> None:
+    """Make ``app`` importable and resolve relative config paths from backend/."""
+    root = str(BACKEND_ROOT)
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    os.chdir(BACKEND_ROOT)
+
+
+@dataclass(frozen=True)
+class Timing:
+    """Per-call timings (microseconds) over several repeats."""
+
+    name: str
+    number: int
+    best_us: float
+    median_us: float
+
+    def describe(self) -> str:
+        return f"{self.name:<40} best {self.best_us:>10.2f} us   median {self.median_us:>10.2f} us"
+
+
+def measure(name: str, func: Callable[[], object], *, number: int = 1000, repeat: int = 5) -> Timing:
+    """Time ``func`` ``number`` times per repeat and report per-call figures."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    return Timing(
+        name=name,
+        number=number,
+        best_us=min(samples),
+        median_us=statistics.median(samples),
+    )
+
+
+async def measure_async(
+    name: str,
+    func: Callable[[], Awaitable[object]],
+    *,
+    number: int = 1000,
+    repeat: int = 5,
+) -> Timing:
+    """Async counterpart of :func:`measure`; call from a running event loop."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            await func()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    return Timing(
+        name=name,
+        number=number,
+        best_us=min(samples),
+        median_us=statistics.median(samples),
+    )
+
+
+def run_async(coro: Awaitable[object]) -> object:
+    return asyncio.run(coro)  # type: ignore[arg-type]
+
+
+def write_results(path: Path, timings: Iterable[Timing]) -> None:
+    """Persist timings as JSON so later runs can be compared."""
+    payload = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": time.time(),
+        "results": {timing.name: asdict(timing) for timing in timings},
+    }
+    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def compare_results(timings: Iterable[Timing], baseline_path: Path, tolerance: float) -> bool:
+    """Print per-benchmark deltas; return False if any median regressed beyond ``tolerance``."""
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))["results"]
+    ok = True
+    print(f"\ncomparison against {baseline_path}:")
+    for timing in timings:
+        before = baseline.get(timing.name)
+        if before is None:
+            print(f"  {timing.name:<40} (new)")
+            continue
+        change = (timing.median_us - before["median_us"]) / before["median_us"]
+        regressed = change > tolerance
+        ok &= not regressed
+        marker = "REGRESSION" if regressed else ""
+        print(f"  {timing.name:<40} {before['median_us']:>10.2f} -> {timing.median_us:>10.2f} us ({change:+.1%}) {marker}")
+    return ok
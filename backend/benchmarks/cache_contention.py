@@ -0,0 +1,91 @@
+"""Throughput of ``InMemoryCacheBackend`` with thousands of concurrent tasks.
+
+Compares the current lock-free backend with the previous design, which took
+one global ``asyncio.Lock`` around every operation, under a read-heavy mix.
+
+Usage::
+
+    python -m benchmarks.cache_contention --tasks 1000 5000 10000 --ops 50 --write-ratio 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+
+from benchmarks._common import ensure_backend_on_path
+
+ensure_backend_on_path()
+
+from app.core.cache import InMemoryCacheBackend  # noqa: E402
+
+
+class GlobalLockCacheBackend(InMemoryCacheBackend):
+    """The previous implementation: every call serialised behind one lock."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = asyncio.Lock()
+
+    async def get(self, key: str) -> str | None:
+        async with self._lock:
+            return await super().get(key)
+
+    async def set(self, key: str, value: str, ttl: int | None = None) -> None:
+        async with self._lock:
+            await super().set(key, value, ttl)
+
+    async def incr(self, key: str, ttl: int | None = None, amount: int = 1) -> int:
+        async with self._lock:
+            return await super().incr(key, ttl, amount)
+
+
+async def _run(backend: InMemoryCacheBackend, tasks: int, ops: int, write_ratio: float, keys: int) -> float:
+    value = "x" * 2048
+    names = [f"recipe:{index}" for index in range(keys)]
+    for name in names:
+        await backend.set(name, value)
+    plans = [
+        [(random.random() < write_ratio, random.choice(names)) for _ in range(ops)]
+        for _ in range(tasks)
+    ]
+    start = asyncio.Event()
+
+    async def worker(plan: list[tuple[bool, str]]) -> None:
+        await start.wait()
+        for is_write, key in plan:
+            if is_write:
+                await backend.set(key, value)
+            else:
+                await backend.get(key)
+            # Yield like a real request handler would between cache calls.
+            await asyncio.sleep(0)
+
+    runners = [asyncio.create_task(worker(plan)) for plan in plans]
+    await asyncio.sleep(0)
+    began = time.perf_counter()
+    start.set()
+    await asyncio.gather(*runners)
+    elapsed = time.perf_counter() - began
+    return tasks * ops / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1000, 5000, 10000])
+    parser.add_argument("--ops", type=int, default=50, help="cache operations per task")
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    parser.add_argument("--keys", type=int, default=1024)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} {'global lock':>16} {'lock-free':>16} {'speedup':>8}")
+    for tasks in args.tasks:
+        locked = asyncio.run(_run(GlobalLockCacheBackend(), tasks, args.ops, args.write_ratio, args.keys))
+        free = asyncio.run(_run(InMemoryCacheBackend(), tasks, args.ops, args.write_ratio, args.keys))
+        print(f"{tasks:>8} {locked:>12,.0f} op/s {free:>12,.0f} op/s {free / locked:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""Standalone fake OpenAI-compatible chat-completions server.
+
+Unlike ``MockLLMProvider`` this listens on a real socket and streams SSE with
+configurable pacing, so load tests exercise the real ``OpenAILikeLLMProvider``
+connection pool, parser and backpressure.
+
+Usage::
+
+    python -m benchmarks.fake_llm_server --port 9100 --ttft 0.8 --tps 40 \\
+        --error-rate 0.01 --jitter 0.2
+
+Then point a provider at it (``type: openai-like``,
+``api_base: http://127.0.0.1:9100/v1``).
+
+It also stands in for the OpenAI Batch API (``/v1/files`` and
+``/v1/batches``) used by ``python main.py --batch-warmup``: a batch reports
+``in_progress`` for ``--batch-delay`` seconds and then completes with one
+chat completion per request line, each carrying the configured reply.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import email
+import email.policy
+import json
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from email.message import EmailMessage
+from typing import AsyncIterator, cast
+
+from benchmarks._common import ensure_backend_on_path
+
+ensure_backend_on_path()
+
+from fastapi import FastAPI, HTTPException, Request  # noqa: E402
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse  # noqa: E402
+
+from app.llm.mock import _default_recipe  # noqa: E402
+
+
+@dataclass(frozen=True)
+class FakeLLMConfig:
+    """Pacing and failure behaviour of the fake upstream."""
+
+    ttft: float = 0.5
+    tokens_per_second: float = 50.0
+    chars_per_token: int = 2
+    error_rate: float = 0.0
+    jitter: float = 0.0
+    content: str = ""
+    batch_delay: float = 2.0
+
+
+def _jittered(value: float, jitter: float) -> float:
+    if jitter <= 0:
+        return value
+    return max(value * random.uniform(1 - jitter, 1 + jitter), 0.0)
+
+
+def _tokens(config: FakeLLMConfig) -> list[str]:
+    size = max(config.chars_per_token, 1)
+    return [config.content[i : i + size] for i in range(0, len(config.content), size)]
+
+
+def _chunk(completion_id: str, model: str, content: str | None, finish: str | None = None) -> str:
+    delta = {"content": content} if content is not None else {}
+    payload = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+    }
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def create_fake_llm_app(config: FakeLLMConfig) -> FastAPI:
+    app = FastAPI(title="Fake LLM")
+    app.state.config = config
+    app.state.stats = {"requests": 0, "errors": 0}
+    tokens = _tokens(config)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "fake-model")
+        completion_id = f"chatcmpl-{random.getrandbits(48):x}"
+        app.state.stats["requests"] += 1
+
+        if config.error_rate > 0 and random.random() < config.error_rate:
+            app.state.stats["errors"] += 1
+            await asyncio.sleep(_jittered(config.ttft, config.jitter) / 4)
+            return JSONResponse(
+                status_code=random.choice((429, 500, 503)),
+                content={"error": {"message": "injected failure", "type": "fake_error"}},
+            )
+
+        if not body.get("stream"):
+            generation = config.ttft + len(tokens) / max(config.tokens_per_second, 1e-6)
+            await asyncio.sleep(_jittered(generation, config.jitter))
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": config.content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {"completion_tokens": len(tokens)},
+            }
+
+        async def events() -> AsyncIterator[str]:
+            await asyncio.sleep(_jittered(config.ttft, config.jitter))
+            interval = 1.0 / max(config.tokens_per_second, 1e-6)
+            deadline = time.perf_counter()
+            for token in tokens:
+                yield _chunk(completion_id, model, token)
+                # Pace against an absolute schedule so per-token overhead
+                # doesn't accumulate into a slower stream than configured.
+                deadline += _jittered(interval, config.jitter)
+                delay = deadline - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            yield _chunk(completion_id, model, None, finish="stop")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    files: dict[str, str] = {}
+    batches: dict[str, dict] = {}
+
+    def _completion(model: str) -> dict:
+        return {
+            "id": f"chatcmpl-{random.getrandbits(48):x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": config.content},
+                    "finish_reason": "stop",
+                }
+            ],
+        }
+
+    @app.post("/v1/files")
+    async def upload_file(request: Request):
+        # Parsed with the stdlib so the server needs no python-multipart.
+        header = f"Content-Type: {request.headers.get('content-type', '')}\r\n\r\n".encode()
+        message = cast(
+            EmailMessage,
+            email.message_from_bytes(header + await request.body(), policy=email.policy.default),
+        )
+        upload = next(
+            (part for part in message.iter_parts() if part.get_param("name", header="content-disposition") == "file"),
+            None,
+        )
+        if upload is None:
+            raise HTTPException(status_code=400, detail="missing file part")
+        file_id = f"file-{random.getrandbits(48):x}"
+        files[file_id] = upload.get_payload(decode=True).decode("utf-8")
+        return {"id": file_id, "object": "file", "purpose": "batch"}
+
+    @app.get("/v1/files/{file_id}/content")
+    async def file_content(file_id: str):
+        if file_id not in files:
+            raise HTTPException(status_code=404, detail="no such file")
+        return PlainTextResponse(files[file_id], media_type="application/jsonl")
+
+    @app.post("/v1/batches")
+    async def create_batch(request: Request):
+        body = await request.json()
+        source = files.get(body.get("input_file_id", ""))
+        if source is None:
+            raise HTTPException(status_code=400, detail="unknown input_file_id")
+        batch_id = f"batch_{random.getrandbits(48):x}"
+        batches[batch_id] = {
+            "id": batch_id,
+            "object": "batch",
+            "endpoint": body.get("endpoint"),
+            "input_file_id": body["input_file_id"],
+            "completion_window": body.get("completion_window", "24h"),
+            "created_at": time.time(),
+            "requests": [json.loads(line) for line in source.splitlines() if line.strip()],
+        }
+        return _batch_view(batches[batch_id])
+
+    def _batch_view(batch: dict) -> dict:
+        total = len(batch["requests"])
+        done = time.time() - batch["created_at"] >= config.batch_delay
+        if done and "output_file_id" not in batch:
+            output_id = f"file-{random.getrandbits(48):x}"
+            files[output_id] = "\n".join(
+                json.dumps(
+                    {
+                        "id": f"batch_req_{index}",
+                        "custom_id": line["custom_id"],
+                        "response": {
+                            "status_code": 200,
+                            "body": _completion(line.get("body", {}).get("model", "fake-model")),
+                        },
+                        "error": None,
+                    },
+                    ensure_ascii=False,
+                )
+                for index, line in enumerate(batch["requests"])
+            )
+            batch["output_file_id"] = output_id
+        view = {key: value for key, value in batch.items() if key != "requests"}
+        view["status"] = "completed" if done else "in_progress"
+        view["request_counts"] = {"total": total, "completed": total if done else 0, "failed": 0}
+        return view
+
+    @app.get("/v1/batches/{batch_id}")
+    async def get_batch(batch_id: str):
+        if batch_id not in batches:
+            raise HTTPException(status_code=404, detail="no such batch")
+        return _batch_view(batches[batch_id])
+
+    @app.get("/stats")
+    async def stats() -> dict[str, int]:
+        return dict(app.state.stats)
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--ttft", type=float, default=0.5, help="seconds before the first token")
+    parser.add_argument("--tps", type=float, default=50.0, help="tokens per second after the first")
+    parser.add_argument("--chars-per-token", type=int, default=2)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests failing with 429/5xx")
+    parser.add_argument("--jitter", type=float, default=0.0, help="relative +/- jitter applied to every delay")
+    parser.add_argument("--content-file", type=Path, help="reply body; defaults to the mock recipe JSON")
+    parser.add_argument("--batch-delay", type=float, default=2.0, help="seconds until a submitted batch completes")
+    args = parser.parse_args()
+
+    content = (
+        args.content_file.read_text(encoding="utf-8")
+        if args.content_file
+        else json.dumps(_default_recipe(), ensure_ascii=False)
+    )
+    config = FakeLLMConfig(
+        ttft=args.ttft,
+        tokens_per_second=args.tps,
+        chars_per_token=args.chars_per_token,
+        error_rate=args.error_rate,
+        jitter=args.jitter,
+        content=content,
+        batch_delay=args.batch_delay,
+    )
+
+    import uvicorn
+
+    uvicorn.run(create_fake_llm_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""Closed-loop load generator for the recipe API.
+
+Drives ``/generate/stream``, ``/generate`` or ``GET /{dish_name}`` with a
+fixed number of concurrent clients and reports throughput, latency
+percentiles, time to first byte and server CPU per request. Results can be
+saved as JSON and compared against a previous run.
+
+Usage::
+
+    python -m benchmarks.loadtest --base-url http://127.0.0.1:8000 \\
+        --endpoint get --concurrency 64 --duration 30 --warm \\
+        --server-pid $(pgrep -f 'uvicorn app.main') --output run.json \\
+        --baseline baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Sequence
+from urllib.parse import quote
+
+import httpx
+
+from benchmarks._common import ensure_backend_on_path
+
+ensure_backend_on_path()
+
+from app.llm.mock import _default_recipe  # noqa: E402
+
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+@dataclass
+class Sample:
+    latency: float
+    ttfb: float
+    status: int
+    ok: bool
+
+
+@dataclass
+class LoadReport:
+    endpoint: str
+    concurrency: int
+    requests: int
+    errors: int
+    duration_s: float
+    rps: float
+    latency_ms: Dict[str, float]
+    ttfb_ms: Dict[str, float]
+    status_counts: Dict[str, int]
+    server_cpu_ms_per_request: float | None
+    client_cpu_ms_per_request: float
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+def _percentiles(values: Sequence[float]) -> Dict[str, float]:
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0, "max": 0.0}
+    ordered = sorted(values)
+
+    def pick(fraction: float) -> float:
+        index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+        return ordered[index] * 1000
+
+    return {
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "mean": statistics.fmean(ordered) * 1000,
+        "max": ordered[-1] * 1000,
+    }
+
+
+def _process_cpu_seconds(pids: Sequence[int]) -> float | None:
+    """Sum user+system CPU of the given processes (Linux /proc only)."""
+    if not pids:
+        return None
+    total = 0
+    for pid in pids:
+        try:
+            fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            return None
+        # utime, stime, cutime, cstime are fields 14-17 (1-based) of /proc/<pid>/stat.
+        total += sum(int(value) for value in fields[11:15])
+    return total / _CLK_TCK
+
+
+def _client_cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _request_spec(endpoint: str, dish: str, provider: str | None) -> tuple[str, str, Dict[str, Any] | None]:
+    body: Dict[str, Any] = {"dish_name": dish}
+    if provider:
+        body["provider"] = provider
+    if endpoint == "stream":
+        return "POST", "/api/v1/recipes/generate/stream", body
+    if endpoint == "generate":
+        return "POST", "/api/v1/recipes/generate", body
+    path = f"/api/v1/recipes/{quote(dish)}"
+    if provider:
+        path += f"?provider={quote(provider)}"
+    return "GET", path, None
+
+
+async def _one_request(client: httpx.AsyncClient, method: str, path: str, body: Dict[str, Any] | None) -> Sample:
+    start = time.perf_counter()
+    ttfb = 0.0
+    try:
+        async with client.stream(method, path, json=body) as response:
+            async for _ in response.aiter_raw():
+                if not ttfb:
+                    ttfb = time.perf_counter() - start
+            status = response.status_code
+    except httpx.HTTPError:
+        elapsed = time.perf_counter() - start
+        return Sample(latency=elapsed, ttfb=ttfb or elapsed, status=0, ok=False)
+    elapsed = time.perf_counter() - start
+    return Sample(latency=elapsed, ttfb=ttfb or elapsed, status=status, ok=status < 500 and status != 0)
+
+
+async def _warm(client: httpx.AsyncClient, dishes: Sequence[str], provider: str) -> None:
+    recipe = _default_recipe()
+    for dish in dishes:
+        response = await client.post(
+            "/api/v1/recipes/cache",
+            json={"dish_name": dish, "provider": provider, "recipe": recipe},
+        )
+        response.raise_for_status()
+
+
+async def run_load(args: argparse.Namespace) -> LoadReport:
+    headers = {"X-API-Key": args.api_key} if args.api_key else {}
+    dishes = [f"{args.dish_prefix}{index}" for index in range(args.dishes)]
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, headers=headers, timeout=args.timeout, limits=limits, trust_env=False
+    ) as client:
+        if args.warm:
+            await _warm(client, dishes, args.provider or "mock")
+
+        samples: list[Sample] = []
+        issued = 0
+        deadline = time.perf_counter() + args.duration if args.duration else None
+
+        async def worker() -> None:
+            nonlocal issued
+            while True:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return
+                if deadline is None and issued >= args.requests:
+                    return
+                dish = dishes[issued % len(dishes)]
+                issued += 1
+                method, path, body = _request_spec(args.endpoint, dish, args.provider)
+                samples.append(await _one_request(client, method, path, body))
+
+        cpu_before = _process_cpu_seconds(args.server_pid)
+        client_cpu_before = _client_cpu_seconds()
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+        cpu_after = _process_cpu_seconds(args.server_pid)
+        client_cpu = _client_cpu_seconds() - client_cpu_before
+
+    completed = len(samples) or 1
+    server_cpu = (
+        (cpu_after - cpu_before) / completed * 1000
+        if cpu_before is not None and cpu_after is not None
+        else None
+    )
+    return LoadReport(
+        endpoint=args.endpoint,
+        concurrency=args.concurrency,
+        requests=len(samples),
+        errors=sum(1 for sample in samples if not sample.ok),
+        duration_s=elapsed,
+        rps=len(samples) / elapsed if elapsed else 0.0,
+        latency_ms=_percentiles([sample.latency for sample in samples]),
+        ttfb_ms=_percentiles([sample.ttfb for sample in samples]),
+        status_counts={str(code): count for code, count in Counter(s.status for s in samples).items()},
+        server_cpu_ms_per_request=server_cpu,
+        client_cpu_ms_per_request=client_cpu / completed * 1000,
+        meta={
+            "base_url": args.base_url,
+            "dishes": args.dishes,
+            "python": platform.python_version(),
+            "timestamp": time.time(),
+        },
+    )
+
+
+def _print_report(report: LoadReport) -> None:
+    print(f"endpoint={report.endpoint} concurrency={report.concurrency} requests={report.requests} errors={report.errors}")
+    print(f"throughput       {report.rps:10.1f} req/s over {report.duration_s:.1f}s")
+    for label, values in (("latency", report.latency_ms), ("ttfb", report.ttfb_ms)):
+        print(
+            f"{label:<16} p50 {values['p50']:8.2f} ms  p95 {values['p95']:8.2f} ms  "
+            f"p99 {values['p99']:8.2f} ms  max {values['max']:8.2f} ms"
+        )
+    if report.server_cpu_ms_per_request is not None:
+        print(f"server cpu       {report.server_cpu_ms_per_request:10.3f} ms/request")
+    print(f"client cpu       {report.client_cpu_ms_per_request:10.3f} ms/request")
+    print(f"status codes     {report.status_counts}")
+
+
+def compare_reports(current: LoadReport, baseline: Dict[str, Any], tolerance: float) -> bool:
+    """Print deltas against a baseline; return False on a regression beyond ``tolerance``."""
+    checks = [
+        ("rps", current.rps, baseline["rps"], True),
+        ("latency p50", current.latency_ms["p50"], baseline["latency_ms"]["p50"], False),
+        ("latency p95", current.latency_ms["p95"], baseline["latency_ms"]["p95"], False),
+        ("latency p99", current.latency_ms["p99"], baseline["latency_ms"]["p99"], False),
+        ("ttfb p50", current.ttfb_ms["p50"], baseline["ttfb_ms"]["p50"], False),
+    ]
+    if current.server_cpu_ms_per_request is not None and baseline.get("server_cpu_ms_per_request"):
+        checks.append(
+            ("server cpu/req", current.server_cpu_ms_per_request, baseline["server_cpu_ms_per_request"], False)
+        )
+
+    ok = True
+    print("\ncomparison against baseline:")
+    for name, now, before, higher_is_better in checks:
+        if not before:
+            continue
+        change = (now - before) / before
+        regressed = change < -tolerance if higher_is_better else change > tolerance
+        ok &= not regressed
+        marker = "REGRESSION" if regressed else ""
+        print(f"  {name:<16} {before:10.2f} -> {now:10.2f} ({change:+.1%}) {marker}")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", choices=("stream", "generate", "get"), default="get")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000, help="total requests when --duration is 0")
+    parser.add_argument("--duration", type=float, default=0.0, help="run for N seconds instead of a request count")
+    parser.add_argument("--dishes", type=int, default=100, help="number of distinct dish names to cycle through")
+    parser.add_argument("--dish-prefix", default="压测菜")
+    parser.add_argument("--provider", help="provider name sent with each request")
+    parser.add_argument("--api-key", default=os.getenv("AIRECIPE_API_KEY"))
+    parser.add_argument("--warm", action="store_true", help="seed the cache via POST /cache first")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--server-pid", type=int, action="append", default=[], help="server process(es) for CPU accounting")
+    parser.add_argument("--output", type=Path, help="write the report as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare against a previous JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative regression")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args))
+    _print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(asdict(report), indent=2), encoding="utf-8")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if not compare_reports(report, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Per-request logging overhead: synchronous basicConfig vs the queue pipeline.
+
+Replays the log calls a cache-hit request makes (service lines plus the
+access log) and measures the time spent on the calling thread, which is what
+blocks the event loop.
+
+Usage: ``python -m benchmarks.logging_overhead [--number N]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import tempfile
+from dataclasses import replace
+
+from benchmarks._common import ensure_backend_on_path, measure
+
+ensure_backend_on_path()
+
+from app.core.config import get_settings  # noqa: E402
+from app.core.logging_config import (  # noqa: E402
+    HOT_PATH,
+    configure_logging,
+    shutdown_logging,
+)
+
+service_logger = logging.getLogger("app.services.recipe_service")
+request_logger = logging.getLogger("app.request")
+
+
+def _legacy_cache_hit() -> None:
+    """Log calls made by a cache hit before the pipeline was introduced."""
+    service_logger.info("API Key 验证已禁用（REQUIRE_API_KEY=false）")
+    service_logger.info("正在查询缓存 - 菜名: '%s', 提供商: '%s', 缓存键: %s", "番茄炒蛋", "openai", "recipe:abc")
+    service_logger.info("缓存命中 - 菜名: '%s', 提供商: '%s'", "番茄炒蛋", "openai")
+    service_logger.info("Generated recipe for '%s' with provider '%s' (cached=%s)", "番茄炒蛋", "openai", True)
+    request_logger.info(
+        "request completed",
+        extra={"method": "GET", "path": "/api/v1/recipes/x", "duration_ms": 1.2, "status_code": 200},
+    )
+
+
+def _current_cache_hit() -> None:
+    """Log calls made by a cache hit with the hot-path markers."""
+    service_logger.debug("API Key 验证已禁用（REQUIRE_API_KEY=false）")
+    service_logger.debug("正在查询缓存 - 菜名: '%s', 提供商: '%s', 缓存键: %s", "番茄炒蛋", "openai", "recipe:abc")
+    service_logger.info("缓存命中 - 菜名: '%s', 提供商: '%s'", "番茄炒蛋", "openai", extra=HOT_PATH)
+    service_logger.info(
+        "Generated recipe for '%s' with provider '%s' (cached=%s)", "番茄炒蛋", "openai", True, extra=HOT_PATH
+    )
+    request_logger.info(
+        "request completed",
+        extra={"method": "GET", "path": "/api/v1/recipes/x", "duration_ms": 1.2, "status_code": 200, "hot_path": True},
+    )
+
+
+def _reset_root() -> logging.Logger:
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    return root
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=5000, help="simulated requests per repeat")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sink = os.path.join(tmp, "bench.log")
+
+        _reset_root()
+        logging.basicConfig(level="INFO", filename=sink)
+        legacy = measure("basicConfig, synchronous file handler", _legacy_cache_hit, number=args.number)
+        print(legacy.describe())
+
+        settings = get_settings()
+        for rate in (1.0, settings.log_hot_path_sample_rate):
+            _reset_root()
+            # Send the listener's stderr output to the sink as well.
+            with open(sink, "a", encoding="utf-8") as stream:
+                os.dup2(stream.fileno(), 2)
+            configure_logging(replace(settings, log_level="INFO", log_hot_path_sample_rate=rate))
+            timing = measure(
+                f"queue pipeline, json, sample={rate:g}", _current_cache_hit, number=args.number
+            )
+            shutdown_logging()
+            print(timing.describe())
+            print(f"{'':<40} {legacy.best_us / timing.best_us:.1f}x less time on the event loop")
+
+
+if __name__ == "__main__":
+    main()
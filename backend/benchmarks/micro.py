@@ -0,0 +1,179 @@
+"""Micro-benchmarks for the request hot paths.
+
+Covers cache-key hashing, cache reads with JSON decode, schema validation,
+response model construction/serialisation, SSE parsing in
+``OpenAILikeLLMProvider`` and ``InMemoryCacheBackend`` under contention.
+
+Usage::
+
+    python -m benchmarks.micro --output benchmarks/results/micro.json
+    python -m benchmarks.micro --baseline benchmarks/results/micro.json --tolerance 0.15
+
+``--baseline`` exits non-zero when any median regressed beyond the tolerance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from uuid import uuid4
+
+from benchmarks._common import (
+    Timing,
+    compare_results,
+    ensure_backend_on_path,
+    measure,
+    measure_async,
+    write_results,
+)
+
+ensure_backend_on_path()
+
+import httpx  # noqa: E402
+
+from app.core.cache import InMemoryCacheBackend  # noqa: E402
+from app.llm.mock import MockLLMProvider, _default_recipe  # noqa: E402
+from app.llm.providers.base import ProviderSettings  # noqa: E402
+from app.llm.providers.openai_like import OpenAILikeLLMProvider  # noqa: E402
+from app.schemas.recipe import RecipeGenerationResponse, validate_recipe_output  # noqa: E402
+from app.services.recipe_service import RecipeService  # noqa: E402
+
+RECIPE = _default_recipe()
+RECIPE_JSON = json.dumps(RECIPE, ensure_ascii=False)
+
+
+def _sse_body(content: str, chunk_chars: int = 2) -> bytes:
+    lines = [
+        "data: "
+        + json.dumps({"choices": [{"delta": {"content": content[i : i + chunk_chars]}}]}, ensure_ascii=False)
+        + "\n\n"
+        for i in range(0, len(content), chunk_chars)
+    ]
+    lines.append("data: [DONE]\n\n")
+    return "".join(lines).encode("utf-8")
+
+
+def _service(cache: InMemoryCacheBackend) -> RecipeService:
+    return RecipeService(provider=MockLLMProvider(), cache=cache)
+
+
+def sync_benchmarks(number: int) -> list[Timing]:
+    service = _service(InMemoryCacheBackend())
+    response = RecipeGenerationResponse(request_id=str(uuid4()), provider="bench", recipe=RECIPE, cached=True)
+    return [
+        measure(
+            "cache_key.make_from_dish",
+            lambda: service._make_cache_key_from_dish("bench", "  番茄炒蛋  "),
+            number=number * 10,
+        ),
+        measure("schema.validate_recipe_output", lambda: validate_recipe_output(RECIPE), number=number),
+        measure(
+            "response.construct",
+            lambda: RecipeGenerationResponse(request_id=str(uuid4()), provider="bench", recipe=RECIPE, cached=True),
+            number=number,
+        ),
+        measure("response.model_dump", response.model_dump, number=number),
+        measure(
+            "response.model_dump+json.dumps",
+            lambda: json.dumps(response.model_dump(), ensure_ascii=False),
+            number=number,
+        ),
+    ]
+
+
+async def async_benchmarks(number: int, tasks: int) -> list[Timing]:
+    results: list[Timing] = []
+
+    cache = InMemoryCacheBackend()
+    service = _service(cache)
+    key = service._make_cache_key_from_dish("bench", "番茄炒蛋")
+    await cache.set(key, await service._encode_entry(RECIPE, provider_name="bench", dish_name="番茄炒蛋"))
+    results.append(
+        await measure_async(
+            "cache.fetch_and_decode",
+            lambda: service._fetch_from_cache(cache, key, "bench"),
+            number=number,
+        )
+    )
+
+    body = _sse_body(RECIPE_JSON)
+    provider = OpenAILikeLLMProvider(
+        ProviderSettings(name="bench", type="openai-like", model="m", api_base="http://bench/v1", api_key="k")
+    )
+    await provider.aclose()
+    provider._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda _: httpx.Response(200, content=body)),
+        base_url="http://bench/v1",
+    )
+
+    async def parse_stream() -> None:
+        async for _ in provider.generate_stream(prompt="bench"):
+            pass
+
+    results.append(
+        await measure_async(
+            f"provider.sse_parse ({body.count(b'data:')} events)",
+            parse_stream,
+            number=max(number // 20, 5),
+        )
+    )
+    await provider.aclose()
+
+    contended = InMemoryCacheBackend()
+    keys = [f"recipe:{index}" for index in range(256)]
+    for item in keys:
+        await contended.set(item, RECIPE_JSON)
+
+    async def reader(offset: int) -> None:
+        for index in range(number // 10):
+            await contended.get(keys[(offset + index) % len(keys)])
+
+    async def writer(offset: int) -> None:
+        for index in range(number // 10):
+            await contended.set(keys[(offset + index) % len(keys)], RECIPE_JSON)
+
+    async def mixed() -> None:
+        # 9 readers per writer, roughly a cache-hit dominated workload.
+        await asyncio.gather(
+            *(writer(i) if i % 10 == 0 else reader(i) for i in range(tasks))
+        )
+
+    operations = tasks * (number // 10)
+    timing = await measure_async(f"inmemory_cache.mixed_{tasks}_tasks", mixed, number=1, repeat=5)
+    results.append(
+        Timing(
+            name=f"inmemory_cache.mixed_{tasks}_tasks (per op)",
+            number=operations,
+            best_us=timing.best_us / operations,
+            median_us=timing.median_us / operations,
+        )
+    )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=2000, help="iterations per repeat")
+    parser.add_argument("--tasks", type=int, default=1000, help="concurrent tasks for the contention case")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare against a previous JSON result")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    timings = sync_benchmarks(args.number)
+    timings += asyncio.run(async_benchmarks(args.number, args.tasks))
+    for timing in timings:
+        print(timing.describe())
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        write_results(args.output, timings)
+    if args.baseline and not compare_results(timings, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
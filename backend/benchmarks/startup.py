@@ -0,0 +1,121 @@
+"""Cold-start breakdown: import cost per package and time until ready.
+
+Runs ``python -X importtime -c "import app.main"`` in a fresh interpreter,
+groups the self time of every imported module by top-level package (``app``
+modules by their own module) and then times import, the FastAPI startup
+hook and the background warm-up separately.
+
+Usage::
+
+    python -m benchmarks.startup --top 15 --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from benchmarks._common import BACKEND_ROOT, ensure_backend_on_path
+
+ensure_backend_on_path()
+
+_READY_SNIPPET = """
+import asyncio, json, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def main():
+    await app.router.startup()
+    ready = time.perf_counter()
+    await app.state.warmup_task
+    warm = time.perf_counter()
+    await app.router.shutdown()
+    return ready, warm
+
+ready, warm = asyncio.run(main())
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready - imported) * 1000,
+    "warmup_ms": (warm - ready) * 1000,
+}))
+"""
+
+
+def _group(module: str) -> str:
+    parts = module.split(".")
+    if parts[0] == "app":
+        return ".".join(parts[:3])
+    return parts[0]
+
+
+def import_breakdown(env: dict[str, str]) -> tuple[dict[str, int], int]:
+    """Return self time (µs) per package and the total for ``import app.main``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    totals: dict[str, int] = defaultdict(int)
+    overall = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        module = name.strip()
+        totals[_group(module)] += int(self_us)
+        if module == "app.main":
+            overall = int(cumulative_us)
+    return dict(totals), overall
+
+
+def time_to_ready(env: dict[str, str], runs: int) -> dict[str, float]:
+    samples: dict[str, list[float]] = defaultdict(list)
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", _READY_SNIPPET],
+            cwd=BACKEND_ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for key, value in json.loads(result.stdout.strip().splitlines()[-1]).items():
+            samples[key].append(value)
+    return {key: statistics.median(values) for key, values in samples.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=15, help="packages to list")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters for the readiness timing")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("LOG_LEVEL", "WARNING")
+    env.setdefault("CACHE_BACKEND", "memory")
+
+    totals, overall = import_breakdown(env)
+    print(f"import app.main: {overall / 1000:.1f} ms (single -X importtime run)\n")
+    print(f"{'package':<36} {'self ms':>9} {'share':>7}")
+    for package, micros in sorted(totals.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+        print(f"{package:<36} {micros / 1000:>9.1f} {micros / max(overall, 1):>7.1%}")
+
+    timings = time_to_ready(env, args.runs)
+    print(f"\nmedian of {args.runs} fresh interpreters:")
+    print(f"  import         {timings['import_ms']:8.1f} ms")
+    print(f"  startup hook   {timings['startup_ms']:8.1f} ms")
+    print(f"  ready total    {timings['import_ms'] + timings['startup_ms']:8.1f} ms")
+    print(f"  warm-up (bg)   {timings['warmup_ms']:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
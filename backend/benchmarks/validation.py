@@ -0,0 +1,72 @@
+"""Compare the precompiled recipe validator against jsonschema.
+
+Usage: ``python -m benchmarks.validation [--number N]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+from typing import Any, Callable, Dict
+
+from benchmarks._common import ensure_backend_on_path, measure
+
+ensure_backend_on_path()
+
+
+from app.llm.mock import _default_recipe  # noqa: E402
+from app.schemas.recipe import (  # noqa: E402
+    RecipeSchemaError,
+    validate_recipe_output,
+    validate_recipe_output_reference,
+)
+
+
+def _cases() -> Dict[str, Dict[str, Any]]:
+    valid: Dict[str, Any] = _default_recipe()
+    missing_root = copy.deepcopy(valid)
+    del missing_root["菜名"]
+    deep_error = copy.deepcopy(valid)
+    deep_error["烹饪流程"]["步骤顺序数组"][-1]["操作"] = ""
+    many_errors = copy.deepcopy(valid)
+    many_errors["标签"] = []
+    many_errors["难度"] = "简单"
+    many_errors["用料"]["主料"] = {"鸡蛋": 4}
+    return {
+        "valid": valid,
+        "missing required (root)": missing_root,
+        "deep step error": deep_error,
+        "several errors": many_errors,
+    }
+
+
+def _runner(validate: Callable[[Dict[str, Any]], None], payload: Dict[str, Any]) -> Callable[[], str | None]:
+    def run() -> str | None:
+        try:
+            validate(payload)
+        except RecipeSchemaError as exc:
+            return str(exc)
+        return None
+
+    return run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000, help="calls per repeat")
+    args = parser.parse_args()
+
+    for label, payload in _cases().items():
+        compiled = _runner(validate_recipe_output, payload)
+        reference = _runner(validate_recipe_output_reference, payload)
+        if compiled() != reference():
+            raise SystemExit(f"validators disagree on '{label}': {compiled()!r} != {reference()!r}")
+        fast = measure(f"compiled   [{label}]", compiled, number=args.number)
+        slow = measure(f"jsonschema [{label}]", reference, number=args.number)
+        print(fast.describe())
+        print(slow.describe())
+        print(f"{'':<40} speed-up x{slow.best_us / fast.best_us:.1f}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ from __future__ import annotations
 import os
 from pathlib import Path
 import sys
+from typing import Literal
 
 
 def _ensure_project_root_on_path() -> None:
@@ -18,10 +19,54 @@ def _ensure_project_root_on_path() -> None:
 def main() -> None:
     _ensure_project_root_on_path()
 
-    import uvicorn
-
     host = os.getenv("AIRECIPE_HOST", "0.0.0.0")
     port = int(os.getenv("AIRECIPE_PORT", "8000"))
+
+    for flag in ("--export-cache", "--import-cache"):
+        if flag in sys.argv[1:]:
+            from app.snapshot import run_snapshot
+
+            index = sys.argv.index(flag)
+            if index + 1 >= len(sys.argv):
+                sys.exit(f"usage: python main.py {flag} PATH")
+            action: Literal["export", "import"] = (
+                "export" if flag == "--export-cache" else "import"
+            )
+            run_snapshot(action, Path(sys.argv[index + 1]))
+            return
+
+    if "--batch-warmup" in sys.argv[1:]:
+        from app.warmup import run_batch_warmup
+
+        index = sys.argv.index("--batch-warmup")
+        if index + 1 >= len(sys.argv):
+            sys.exit("usage: python main.py --batch-warmup FILE [--provider NAME]")
+        provider = None
+        if "--provider" in sys.argv[1:]:
+            provider_index = sys.argv.index("--provider")
+            if provider_index + 1 >= len(sys.argv):
+                sys.exit("usage: python main.py --batch-warmup FILE [--provider NAME]")
+            provider = sys.argv[provider_index + 1]
+        run_batch_warmup(Path(sys.argv[index + 1]), provider)
+        return
+
+    if "--jobs-worker" in sys.argv[1:]:
+        from app.worker import run_job_worker
+
+        run_job_worker()
+        return
+
+    production = "--production" in sys.argv[1:] or (
+        os.getenv("AIRECIPE_MODE", "development").lower() == "production"
+    )
+    if production:
+        from app.server import run_production
+
+        run_production(host, port)
+        return
+
+    import uvicorn
+
     reload = os.getenv("AIRECIPE_RELOAD", "true").lower() == "true"
 
     uvicorn.run(
@@ -14,7 +14,7 @@ export interface GenerateRecipePayload {
   language?: string;
   extraInstructions?: string | null;
   provider?: string | null;
-  routingStrategy?: "default" | "weighted" | null;
+  routingStrategy?: "default" | "weighted" | "consistent_hash" | null;
 }
 
 interface RecipeGenerationApiResponse {